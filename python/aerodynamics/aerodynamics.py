@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
+from python.aerodynamics import atmosphere
+
 class Aerodynamics:
     def __init__(self, noses_input, fins_input, gridfins_input, parachutes_input):
         #Input variables are 2D matrices with all variables in columns so rows = number of structures
@@ -20,22 +22,8 @@ class Aerodynamics:
             
         
     def pressure(self,h):
-        #Taken from https://www.grc.nasa.gov/www/k-12/airplane/atmosmet.html
-        
-        if h < 11000:
-            T = 15.04 - 0.00649 * h
-            p = 101.29 * ((T+273.1)/288.08)**5.256
-        
-        if h > 25000:
-            T = -131.21 + 0.00299 * h
-            p = 2.488 * ((T+273.1)/216.6)**(-11.388)
-            
-        else:
-            T = -56.46
-            p = 22.65 * np.exp(1.73 - 0.000157 * h)
-            
-        rho = p / (0.2869 * (T + 273.1))
-        return rho
+        #Returns the air density at altitude h, from the standard atmosphere shared with the trajectory simulator
+        return atmosphere.density(h)
     
     def drag(self, h,v, descent = True):
         rho = self.pressure(h)
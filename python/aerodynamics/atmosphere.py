@@ -0,0 +1,112 @@
+import numpy as np
+
+# Standard atmosphere shared by the trajectory simulator and the aerodynamics model.
+# Taken from https://www.grc.nasa.gov/www/k-12/airplane/atmosmet.html (three band model: troposphere, lower
+# stratosphere, upper stratosphere and above).
+# The model is evaluated once on a fine altitude grid when this module is imported. Lookups interpolate linearly in the
+# tables, so the simulation loops do not evaluate the branches, exponentials and powers of the model at every step.
+# Outside the tabulated range the model is evaluated directly.
+
+ALTITUDE_MIN = -5_000 # [m]
+ALTITUDE_MAX = 1_000_000 # [m]
+ALTITUDE_STEP = 25 # [m] (band edges at 11 km and 25 km fall on grid points)
+
+gamma_air = 1.4 # [-] ratio of specific heats
+R_air = 286.9 # [J / (kg K)] specific gas constant used by the model
+
+
+def model(h):
+    """Evaluates the atmosphere model directly (no tables).
+
+    Args:
+    h: Altitude in meters (scalar or numpy array).
+
+    Returns:
+    Temperature (K), pressure (Pa), density (kg/m^3) and speed of sound (m/s).
+    """
+    h = np.asarray(h, dtype=float)
+    # Temperature in Celsius and pressure in kPa, as in the reference
+    T = np.where(h < 11_000, 15.04 - 0.00649 * h, np.where(h < 25_000, -56.46, -131.21 + 0.00299 * h))
+    with np.errstate(over='ignore'):
+        p = np.where(h < 11_000, 101.29 * ((T + 273.1) / 288.08) ** 5.256,
+                     np.where(h < 25_000, 22.65 * np.exp(1.73 - 0.000157 * h), 2.488 * ((T + 273.1) / 216.6) ** -11.388))
+    T = T + 273.1
+    rho = p / (0.2869 * T)
+    return T, p * 1000, rho, np.sqrt(gamma_air * R_air * T)
+
+
+# Tables, built once
+altitudes = np.arange(ALTITUDE_MIN, ALTITUDE_MAX + ALTITUDE_STEP, ALTITUDE_STEP, dtype=float)
+temperatures, pressures, densities, speeds_of_sound = model(altitudes)
+
+_arrays = {
+    'temperature': temperatures,
+    'pressure': pressures,
+    'density': densities,
+    'speed_of_sound': speeds_of_sound,
+}
+_columns = {'temperature': 0, 'pressure': 1, 'density': 2, 'speed_of_sound': 3}
+
+# Python lists for the scalar fast path (indexing a list is much cheaper than indexing a numpy array)
+_tables = {name: values.tolist() for name, values in _arrays.items()}
+_last_index = altitudes.size - 1
+
+
+def _lookup(name, h):
+    # Scalar linear interpolation in the table, or the model itself outside the tabulated range
+    x = (h - ALTITUDE_MIN) / ALTITUDE_STEP
+    if 0 <= x < _last_index:
+        i = int(x)
+        table = _tables[name]
+        return table[i] + (x - i) * (table[i + 1] - table[i])
+    return float(model(h)[_columns[name]])
+
+
+def _lookup_array(name, h):
+    # Vectorized linear interpolation in the table, or the model itself outside the tabulated range
+    h = np.asarray(h, dtype=float)
+    values = np.interp(h, altitudes, _arrays[name])
+    outside = (h < ALTITUDE_MIN) | (h > ALTITUDE_MAX)
+    if np.any(outside):
+        values = np.where(outside, model(h)[_columns[name]], values)
+    return values
+
+
+def temperature(h):
+    """Returns the temperature (K) at a single altitude h (m)."""
+    return _lookup('temperature', h)
+
+
+def pressure(h):
+    """Returns the pressure (Pa) at a single altitude h (m)."""
+    return _lookup('pressure', h)
+
+
+def density(h):
+    """Returns the density (kg/m^3) at a single altitude h (m)."""
+    return _lookup('density', h)
+
+
+def speed_of_sound(h):
+    """Returns the speed of sound (m/s) at a single altitude h (m)."""
+    return _lookup('speed_of_sound', h)
+
+
+def temperature_array(h):
+    """Returns the temperatures (K) at an array of altitudes h (m)."""
+    return _lookup_array('temperature', h)
+
+
+def pressure_array(h):
+    """Returns the pressures (Pa) at an array of altitudes h (m)."""
+    return _lookup_array('pressure', h)
+
+
+def density_array(h):
+    """Returns the densities (kg/m^3) at an array of altitudes h (m)."""
+    return _lookup_array('density', h)
+
+
+def speed_of_sound_array(h):
+    """Returns the speeds of sound (m/s) at an array of altitudes h (m)."""
+    return _lookup_array('speed_of_sound', h)
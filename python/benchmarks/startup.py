@@ -0,0 +1,137 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Startup benchmark of the IDM. Every measurement runs in a fresh interpreter, so nothing is already imported:
+#   - import time per module (python -X importtime) of the entry points, with the slowest modules listed
+#   - time to the first headless result: a complete evaluation of a preset, including the interpreter start, with an
+#     empty trajectory cache
+# Heavy modules that should only be loaded on first use (GUI, plotting, pandas, scipy) are flagged when an entry point
+# imports them.
+#
+# Example (from the repository root):
+#   python -m python.benchmarks.startup --budget 2
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Entry points and the module they import
+TARGETS = {
+    'rocket': 'python.core.rocket',
+    'batch': 'python.core.batch',
+    'ui': 'python.ui.setup',
+}
+
+# Modules that are deferred to first use, and the entry points that are allowed to import them up front
+DEFERRED = {
+    'tkinter': ('ui',),
+    'matplotlib': (),
+    'pandas': (),
+    'scipy': (),
+}
+
+FIRST_RESULT = """
+import time
+start = time.perf_counter()
+from python.core.sweep import evaluate
+row = evaluate('{preset}', {{}})
+assert row['error'] is None, row['error']
+print(time.perf_counter() - start)
+"""
+
+
+def _run(arguments, cache):
+    environment = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''),
+                       IDM_TRAJECTORY_CACHE=cache)
+    return subprocess.run([sys.executable] + arguments, cwd=ROOT, env=environment, capture_output=True, text=True)
+
+
+def import_times(module, cache):
+    """
+    Measures the import of a module in a fresh interpreter.
+
+    Args:
+        module: Name of the module to import.
+        cache: Trajectory cache folder of the interpreter.
+
+    Returns:
+        Dictionary with the wall time of the interpreter (s), and the self and cumulative import time (s) per module.
+    """
+
+    start = time.perf_counter()
+    process = _run(["-X", "importtime", "-c", f"import {module}"], cache)
+    wall_time = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6)
+    return {'wall_time': wall_time, 'modules': modules}
+
+
+def first_result(preset, cache):
+    """
+    Measures the time to the first headless result of a preset in a fresh interpreter.
+
+    Returns:
+        Wall time of the interpreter and the time from the first import to the result (s).
+    """
+
+    start = time.perf_counter()
+    process = _run(["-c", FIRST_RESULT.format(preset=preset)], cache)
+    wall_time = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    return wall_time, float(process.stdout.strip().splitlines()[-1])
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Startup benchmark of the IDM.")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma separated entry points to measure.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules listed per entry point.")
+    parser.add_argument("--preset", default="elysium_1", help="Preset of the first headless result.")
+    parser.add_argument("--budget", type=float, help="Time budget (s) for every measurement, exceeding it fails.")
+    arguments = parser.parse_args(arguments)
+
+    over_budget = []
+    with tempfile.TemporaryDirectory() as cache:
+        for target in arguments.targets.split(","):
+            try:
+                measurement = import_times(TARGETS[target], cache)
+            except RuntimeError as error:
+                print(f"{target}: import failed ({error})\n")
+                continue
+
+            modules = measurement['modules']
+            total = modules[TARGETS[target]][1]
+            print(f"{target} ({TARGETS[target]}): import {total:.3f} s, interpreter {measurement['wall_time']:.3f} s")
+            for name, (own, cumulative) in sorted(modules.items(), key=lambda item: -item[1][0])[:arguments.top]:
+                print(f"    {own:8.4f} s self {cumulative:8.4f} s cumulative  {name}")
+            for prefix, allowed in DEFERRED.items():
+                if target not in allowed and any(name == prefix or name.startswith(prefix + ".") for name in modules):
+                    print(f"    imports {prefix} up front")
+            print()
+            if arguments.budget is not None and measurement['wall_time'] > arguments.budget:
+                over_budget.append(target)
+
+        wall_time, result_time = first_result(arguments.preset, cache)
+        print(f"First headless result ({arguments.preset}): {result_time:.3f} s after start of the imports, "
+              f"interpreter {wall_time:.3f} s")
+        if arguments.budget is not None and wall_time > arguments.budget:
+            over_budget.append("first result")
+
+    if over_budget:
+        print(f"Over the budget of {arguments.budget} s: {over_budget}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
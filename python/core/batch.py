@@ -0,0 +1,133 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from python.core.memo import subsystem_cache
+from python.core.serialization import to_json
+from python.core.sweep import PRESETS, RESULTS, evaluate
+
+# Headless entry point: reads design specs, runs the Rocket pipeline for every design and writes the results. Nothing
+# here (or in the models it runs) imports tkinter or matplotlib, so it starts fast on servers and in containers without a
+# display, and can be called many times from batch jobs.
+#
+# A spec is a JSON or TOML file with a base preset, Rocket inputs that differ from it, and optionally a list of designs
+# (each with its own inputs on top of those, and an optional name):
+#
+#   {"preset": "elysium_1", "inputs": {"diameter": 5.5}, "designs": [{"name": "shared"}, {"name": "separate", "bulkhead": 1}]}
+#
+# Example (from the repository root):
+#   python -m python.core.batch design.json --output results.csv --archive archives
+
+FORMATS = (".json", ".toml")
+
+
+def load_spec(path):
+    """
+    Reads a design spec.
+
+    Args:
+        path: JSON or TOML file.
+
+    Returns:
+        List of (name, preset, overrides) tuples, one per design.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        import tomllib
+        with open(path, 'rb') as file:
+            spec = tomllib.load(file)
+    elif extension == ".json":
+        with open(path) as file:
+            spec = json.load(file)
+    else:
+        raise ValueError(f"Unknown spec format {extension}, choose from {FORMATS}")
+
+    preset = spec.get('preset', 'elysium_1')
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown preset {preset} in {path}, choose from {list(PRESETS)}")
+    inputs = spec.get('inputs', {})
+    base = os.path.splitext(os.path.basename(path))[0]
+
+    designs = []
+    for i, design in enumerate(spec.get('designs', [{}])):
+        design = dict(design)
+        name = str(design.pop('name', base if 'designs' not in spec else f"{base}_{i}"))
+        designs.append((name, preset, {**inputs, **design}))
+    return designs
+
+
+def write_results(rows, path):
+    """
+    Writes the results of the designs to a JSON file (list of rows) or a CSV file (one line per design).
+    """
+
+    rows = [{name: to_json(value) for name, value in row.items()} for row in rows]
+    if path.lower().endswith(".csv"):
+        columns = list(dict.fromkeys(name for row in rows for name in row))
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as file:
+            json.dump(rows, file, indent=4)
+
+
+def run(designs, archive=None, quiet=True):
+    """
+    Runs the Rocket pipeline for every design.
+
+    Args:
+        designs: List of (name, preset, overrides) tuples (see load_spec).
+        archive: Optional folder; the trajectory of every design is archived to a subfolder named after the design.
+        quiet: Whether to suppress the printed output of the models.
+
+    Returns:
+        List of result dictionaries (see sweep.evaluate), with the name and preset of the design.
+    """
+
+    rows = []
+    for name, preset, overrides in designs:
+        row = {'name': name, 'preset': preset}
+        row.update(evaluate(preset, overrides, quiet, os.path.join(archive, name) if archive else None))
+        rows.append(row)
+    return rows
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Headless batch runner for Rocket designs.")
+    parser.add_argument("specs", nargs="+", help="Design spec files (JSON or TOML).")
+    parser.add_argument("--output", help="JSON or CSV file to write the results to (JSON on stdout if omitted).")
+    parser.add_argument("--archive", help="Folder to archive the trajectory of every design to.")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the models.")
+    arguments = parser.parse_args(arguments)
+
+    start = time.perf_counter()
+    designs = [design for path in arguments.specs for design in load_spec(path)]
+    names = [name for name, _, _ in designs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        parser.error(f"Design names must be unique, found {duplicates}")
+
+    rows = run(designs, arguments.archive, quiet=not arguments.verbose)
+    failed = [row['name'] for row in rows if row['error'] is not None]
+    print(f"Evaluated {len(rows)} designs in {time.perf_counter() - start:.1f} s"
+          + (f", {len(failed)} failed: {failed}" if failed else "."), file=sys.stderr)
+    if arguments.verbose:
+        print("Subsystem cache (hits/misses):", subsystem_cache.stats(), file=sys.stderr)
+
+    if arguments.output:
+        write_results(rows, arguments.output)
+    else:
+        json.dump([{name: to_json(row[name]) for name in ['name', 'preset', *RESULTS, 'exit_reason', 'feasible', 'error']}
+                   for row in rows], sys.stdout, indent=4)
+        print()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import time
+
+import numpy as np
+
+# Fixed-point solver for the mass convergence loop of Rocket.iterate. Every evaluation of the fixed-point map resizes the
+# whole rocket (propulsion, every structural component and optionally the trajectory), so the accelerated methods aim to
+# reach the tolerance with fewer evaluations than plain successive substitution (picard). Rocket.iterate only uses them
+# with trajectory coupling, without it the map does not depend on its argument (see there).
+#   picard:   x_{k+1} = g(x_k)
+#   aitken:   Aitken dynamic relaxation (Irons-Tuck), x_{k+1} = x_k + w_k (g(x_k) - x_k) with an adaptive w_k
+#   secant:   secant method on the residual g(x) - x (component wise for vectors)
+#   anderson: Anderson acceleration (type II) over the last `depth` iterates
+
+METHODS = ("picard", "aitken", "secant", "anderson")
+
+
+class ConvergenceSolver():
+    def __init__(self, method="picard", tolerance=10000, max_iterations=100, depth=3, divergence_factor=10,
+                 divergence_patience=3):
+        """
+        This function initializes the solver.
+
+        Args:
+            method: Fixed-point method, one of METHODS.
+            tolerance: The solver stops once the error returned by the step function is at most this value.
+            max_iterations: Maximum number of evaluations of the step function.
+            depth: Number of previous iterates used by the anderson method.
+            divergence_factor: An error this many times larger than the smallest error so far counts as diverging.
+            divergence_patience: Number of consecutive diverging iterations after which the solver gives up.
+        """
+
+        assert method in METHODS, f"Unknown convergence method {method}, choose from {METHODS}"
+        self.method = method
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.depth = depth
+        self.divergence_factor = divergence_factor
+        self.divergence_patience = divergence_patience
+
+    def solve(self, step, x0, monitor=None):
+        """
+        This function iterates the fixed-point map until the error is within the tolerance.
+
+        Args:
+            step: Function evaluating the fixed-point map. Takes x (float or numpy array) and returns (g(x), error).
+            x0: Initial guess.
+            monitor: Optional function returning a dictionary of extra quantities recorded in the history after each
+                evaluation (e.g. the rocket mass).
+
+        Returns:
+            Last evaluated g(x). The convergence status is stored in converged, diverged and history.
+        """
+
+        self.history = []
+        self.converged = False
+        self.diverged = False
+
+        # Previous iterates and residuals (g(x) - x)
+        xs = []
+        residuals = []
+        gx_previous = None
+        relaxation = 1.0
+        best_error = np.inf
+        diverging = 0
+        start = time.perf_counter()
+
+        x = np.asarray(x0, dtype=float)
+        gx = x
+        for iteration in range(1, self.max_iterations + 1):
+            t0 = time.perf_counter()
+            gx, error = step(x.item() if x.ndim == 0 else x)
+            gx = np.asarray(gx, dtype=float)
+            residual = gx - x
+
+            entry = {
+                'iteration': iteration,
+                'x': x.copy(),
+                'gx': gx.copy(),
+                'error': float(error),
+                'wall_time': time.perf_counter() - t0,
+                'total_time': time.perf_counter() - start,
+            }
+            if monitor is not None:
+                entry.update(monitor())
+            self.history.append(entry)
+
+            if error <= self.tolerance:
+                self.converged = True
+                break
+
+            # Divergence detection: the error keeps growing well beyond the best error so far (or is not a number)
+            best_error = min(best_error, error)
+            diverging = diverging + 1 if not np.isfinite(error) or error > self.divergence_factor * best_error else 0
+            if diverging >= self.divergence_patience or not np.all(np.isfinite(gx)):
+                self.diverged = True
+                break
+
+            # Next iterate
+            if self.method == "picard" or not residuals:
+                x_next = gx
+            elif self.method == "aitken":
+                delta = residual - residuals[-1]
+                denominator = np.sum(delta ** 2)
+                if denominator > 0:
+                    relaxation = -relaxation * np.sum(residuals[-1] * delta) / denominator
+                x_next = x + relaxation * residual
+            elif self.method == "secant":
+                delta = residual - residuals[-1]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    x_next = np.where(delta != 0, x - residual * (x - xs[-1]) / delta, gx)
+            else:
+                # Anderson: combine the last iterates so that the linearised residual is minimal
+                dF = np.array([residual - r for r in residuals[-self.depth:]]).reshape(-1, residual.size).T
+                dG = np.array([gx - g for g in gx_previous[-self.depth:]]).reshape(-1, gx.size).T
+                gamma = np.linalg.lstsq(dF, residual.reshape(-1), rcond=None)[0]
+                x_next = (gx.reshape(-1) - dG @ gamma).reshape(gx.shape)
+
+            xs.append(x)
+            residuals.append(residual)
+            gx_previous = (gx_previous or []) + [gx]
+            x = np.asarray(x_next, dtype=float)
+
+        return gx.item() if gx.ndim == 0 else gx
+
+    def summary(self):
+        """Returns a short text summary of the last solve."""
+        status = "converged" if self.converged else "diverged" if self.diverged else "not converged"
+        total_time = self.history[-1]['total_time'] if self.history else 0
+        return f"{self.method}: {status} after {len(self.history)} evaluations ({total_time:.2f} s)"
@@ -0,0 +1,63 @@
+import copy
+
+# Memoization of the subsystem objects Rocket.update_values builds (engine, Propulsion, Structure). Objects are keyed on
+# the inputs they are built from, so a UI submission or sweep point that only changes e.g. the payload or cost inputs
+# reuses them. Propulsion and Structure store their sizing results on themselves, so every Rocket gets a shallow copy of
+# the cached (never sized) object rather than the object itself; engines hold no results and are shared.
+
+
+class SubsystemCache():
+    def __init__(self, max_size=128):
+        """
+        This function initializes the cache.
+
+        Args:
+            max_size: Maximum number of cached objects per kind of subsystem, the least recently used is dropped first.
+        """
+
+        self.max_size = max_size
+        self.objects = {}
+        self.hits = {}
+        self.misses = {}
+
+    def get(self, kind, key, build, shared=False):
+        """
+        Returns the subsystem object for the given inputs, built only if it is not cached yet.
+
+        Args:
+            kind: Kind of subsystem (e.g. "propulsion").
+            key: Hashable tuple of the inputs the object is built from.
+            build: Function without arguments that builds the object.
+            shared: Whether the cached object itself is returned (for objects that hold no results), rather than a
+                shallow copy.
+
+        Returns:
+            The subsystem object.
+        """
+
+        objects = self.objects.setdefault(kind, {})
+        if key in objects:
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+            # Most recently used last
+            objects[key] = objects.pop(key)
+        else:
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+            objects[key] = build()
+            if len(objects) > self.max_size:
+                del objects[next(iter(objects))]
+        return objects[key] if shared else copy.copy(objects[key])
+
+    def stats(self):
+        """Returns the number of hits and misses per kind of subsystem."""
+        return {kind: {'hits': self.hits.get(kind, 0), 'misses': self.misses.get(kind, 0)}
+                for kind in dict.fromkeys(list(self.misses) + list(self.hits))}
+
+    def clear(self):
+        """Drops all cached objects and resets the counters."""
+        self.objects.clear()
+        self.hits.clear()
+        self.misses.clear()
+
+
+# Cache shared by all Rocket objects of the process
+subsystem_cache = SubsystemCache()
@@ -0,0 +1,335 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from python.core.sweep import PRESETS
+from python.cost.model import CostModel, MassCalculator
+from python.structure.materials import materials
+from python.structure.structure import InfeasibleDesign
+
+# Monte Carlo uncertainty propagation for the outputs the user interface labels "Margin 40%". Uncertain inputs are
+# sampled as factors on their nominal values, and the rocket is sized for every sample as in Rocket.iterate (with the
+# trajectory run once, so a single sizing pass is converged). The cheap stages (mass estimate, propellant mass and
+# volume, cost) are evaluated for all samples at once with numpy; only the trajectory setup/simulation and the
+# structural sizing are evaluated per sample, in a pool of worker processes. The result is one row per sample, and
+# percentile bands of the masses and costs over the samples.
+#
+# Example (from the repository root):
+#   python -m python.core.monte_carlo --preset elysium_1 --samples 2000 --seed 1
+
+# Uncertain inputs: distribution of the factor on the nominal value and its relative spread (standard deviation for
+# "normal", half width for "uniform")
+UNCERTAINTIES = {
+    'isp_1': ('normal', 0.02), # first stage specific impulse
+    'isp_2': ('normal', 0.02), # second stage specific impulse
+    'inert_fraction_1': ('normal', 0.10), # first stage inert mass fraction of the delta-V mass estimate
+    'inert_fraction_2': ('normal', 0.10), # second stage inert mass fraction
+    'cd': ('uniform', 0.25), # ascent drag coefficient (only affects the simulated trajectory)
+    'yield_stress': ('normal', 0.05), # yield stress of the structural materials
+    'cost_development': ('normal', 0.20), # development cost estimating relationship
+    'cost_production': ('normal', 0.20), # production cost estimating relationship
+    'cost_operational': ('normal', 0.20), # operational cost estimating relationship
+}
+
+# Sample outputs summarized in the percentile bands
+OUTPUTS = (
+    'mass',
+    'mass_p',
+    'mass_s',
+    'mass2',
+    'mass_total',
+    'burntime',
+    'development_cost',
+    'production_cost',
+    'operational_cost',
+    'per_launch_cost',
+    'total_lifetime_cost',
+)
+
+PERCENTILES = (5, 50, 95)
+
+
+def sample(n, uncertainties=None, seed=None):
+    """
+    Samples the factors on the nominal values of the uncertain inputs.
+
+    Args:
+        n: Number of samples.
+        uncertainties: Dictionary of uncertain inputs and their (distribution, spread) (default: UNCERTAINTIES).
+        seed: Random seed.
+
+    Returns:
+        pandas DataFrame with one column of factors per uncertain input.
+    """
+
+    uncertainties = UNCERTAINTIES if uncertainties is None else uncertainties
+    rng = np.random.default_rng(seed)
+    factors = {}
+    for name, (distribution, spread) in uncertainties.items():
+        assert name in UNCERTAINTIES, f"Unknown uncertain input {name}, choose from {list(UNCERTAINTIES)}"
+        if distribution == "normal":
+            values = rng.normal(1, spread, n)
+        elif distribution == "uniform":
+            values = rng.uniform(1 - spread, 1 + spread, n)
+        else:
+            raise ValueError(f"Unknown distribution {distribution}, choose from ('normal', 'uniform')")
+        # Physical inputs cannot change sign
+        factors[name] = np.clip(values, 0.01, None)
+    for name in UNCERTAINTIES:
+        factors.setdefault(name, np.ones(n))
+    return pd.DataFrame(factors)
+
+
+def _rocket(preset, overrides):
+    rocket = PRESETS[preset]()
+    rocket.update_values(**overrides)
+    # Every sample has different trajectory inputs, so cached results would never be reused
+    rocket.trajectory_cache = None
+    return rocket
+
+
+@contextlib.contextmanager
+def _yield_stress(names, factor):
+    # Scales the yield stress of materials in the shared database and restores it afterwards
+    nominal = {name: materials[name]['yield_stress'] for name in set(names)}
+    try:
+        for name, value in nominal.items():
+            materials[name]['yield_stress'] = value * factor
+        yield
+    finally:
+        for name, value in nominal.items():
+            materials[name]['yield_stress'] = value
+
+
+def _trajectories(arguments):
+    # Worker task: trajectory setup (burntime) and optionally the simulation of a chunk of samples
+    preset, overrides, samples, simulate = arguments
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        rocket = _rocket(preset, overrides)
+        isp_1 = rocket.propulsion.Isp
+        for mass, struct_frac_1, prop_mass_2, isp_factor_1, isp_2, cd in samples:
+            try:
+                rocket.trajectory = type(rocket.trajectory)()
+                rocket.mass = mass
+                rocket.struct_frac_1 = struct_frac_1
+                rocket.prop_masses = np.array([prop_mass_2, 0])
+                rocket.propulsion.Isp = isp_1 * isp_factor_1
+                rocket.isp2 = isp_2
+                rocket.cd = cd
+                if simulate:
+                    rocket.run_trajectory(rocket.trajectory_timestep)
+                else:
+                    rocket.setup_trajectory(rocket.trajectory_timestep)
+                results.append((rocket.trajectory.burntime, rocket.trajectory.exit_reason if simulate else None,
+                                None))
+            except Exception as error:
+                results.append((np.nan, None, f"{type(error).__name__}: {error}"))
+    return results
+
+
+def _structures(arguments):
+    # Worker task: structural sizing of a chunk of samples
+    preset, overrides, samples = arguments
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        rocket = _rocket(preset, overrides)
+        names = [rocket.material_options[rocket.material_tank], rocket.material_options[rocket.material_misc]]
+        for volume_ox, mass_ox, volume_fuel, mass_fuel, thrust, mass_e, yield_stress in samples:
+            try:
+                with _yield_stress(names, yield_stress):
+                    rocket.structure.calc(rocket.bulkhead_options[rocket.bulkhead], volume_ox, mass_ox, volume_fuel,
+                                          mass_fuel, thrust, mass_e)
+                    if not rocket.structure.feasible:
+                        raise InfeasibleDesign()
+                    mass_s = (mass_e + rocket.structure.mass_engine_structure + rocket.structure.mass_landing_gear +
+                              rocket.structure.mass_total)
+                results.append((mass_s, None))
+            except Exception as error:
+                results.append((np.nan, f"{type(error).__name__}: {error}"))
+    return results
+
+
+def _map(executor, function, arguments):
+    if executor is None:
+        return [result for chunk in map(function, arguments) for result in chunk]
+    return [result for chunk in executor.map(function, arguments) for result in chunk]
+
+
+def _chunks(preset, overrides, rows, chunk, *extra):
+    return [(preset, overrides, rows[i:i + chunk]) + extra for i in range(0, len(rows), chunk)]
+
+
+def monte_carlo(preset="elysium_1", samples=1000, overrides=None, uncertainties=None, seed=None, simulate=False,
+                workers=None, chunk=64):
+    """
+    Propagates the input uncertainties through the sizing of the rocket.
+
+    Args:
+        preset: Name of the base preset (see sweep.PRESETS).
+        samples: Number of samples, or a DataFrame of factors (see sample) to evaluate.
+        overrides: Dictionary of Rocket inputs that differ from the preset.
+        uncertainties: Dictionary of uncertain inputs and their (distribution, spread) (default: UNCERTAINTIES).
+        seed: Random seed.
+        simulate: Whether to simulate the trajectory of every sample (for the exit reason and the effect of cd). The
+            mass and cost only depend on the burntime, which the trajectory setup gives without simulating.
+        workers: Number of worker processes (default: number of CPUs). 1 evaluates the samples in this process.
+        chunk: Number of samples per worker task.
+
+    Returns:
+        pandas DataFrame with the factors and outputs (see OUTPUTS) of every sample, the trajectory exit reason and
+        the error message if the sample could not be sized.
+    """
+
+    assert preset in PRESETS, f"Unknown preset {preset}, choose from {list(PRESETS)}"
+    overrides = dict(overrides or {})
+    table = samples.copy() if isinstance(samples, pd.DataFrame) else sample(samples, uncertainties, seed)
+    n = len(table)
+    with contextlib.redirect_stdout(io.StringIO()):
+        rocket = _rocket(preset, overrides)
+    error = np.full(n, None, dtype=object)
+
+    # Delta-V mass estimate of all samples (Rocket.mass_estimation)
+    inert_mass_fractions = np.array([rocket.mf2 * table['inert_fraction_2'].to_numpy(),
+                                     rocket.mf2 * table['inert_fraction_1'].to_numpy()])
+    isps = np.array([rocket.isp2 * table['isp_2'].to_numpy(), rocket.propulsion.Isp * table['isp_1'].to_numpy()])
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        wet_masses = MassCalculator.get_wet_masses(rocket.dv_1, rocket.dv_2, inert_mass_fractions, isps,
+                                                   rocket.payload, rocket.reflights)
+    prop_masses = MassCalculator.get_propellant_masses(wet_masses, inert_mass_fractions)
+    dry_masses = MassCalculator.get_dry_masses(wet_masses, inert_mass_fractions)
+    mass2, mass = wet_masses
+    # Inert mass fractions too large for the stage delta-V give negative (or infinite) masses
+    staged = np.all(np.isfinite(wet_masses) & (wet_masses > 0), axis=0)
+    error[~staged] = "Infeasible staging: inert mass fraction too large for the stage delta-V"
+
+    executor = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        # Trajectory of every sample (burntime)
+        rows = [tuple(values) for values in zip(mass, inert_mass_fractions[1], prop_masses[0], table['isp_1'],
+                                                isps[0], rocket.cd * table['cd'])]
+        staged_rows = [row for row, ok in zip(rows, staged) if ok]
+        results = iter(_map(executor, _trajectories, _chunks(preset, overrides, staged_rows, chunk, simulate)))
+        burntime = np.full(n, np.nan)
+        exit_reason = np.full(n, None, dtype=object)
+        for i in np.flatnonzero(staged):
+            burntime[i], exit_reason[i], error[i] = next(results)
+
+        # Propellant mass and volume of all samples (Propulsion.mass_volume), the propellant mass flow scales with
+        # 1 / Isp
+        thrust = rocket.number_of_engines_ascent * rocket.engine.Thrust
+        mass_e, mass_fuel, mass_ox, volume_fuel, volume_ox, engine_number = rocket.propulsion.mass_volume(
+            thrust, burntime / table['isp_1'].to_numpy(), rocket.temperature_fuel, rocket.temperature_ox,
+            rocket.pressure_ox, rocket.pressure_fuel)
+        mass_p = mass_ox + mass_fuel
+
+        # Structural sizing of every sample
+        sized = np.isfinite(burntime)
+        rows = [tuple(values) for values in zip(volume_ox, mass_ox, volume_fuel, mass_fuel, np.full(n, thrust),
+                                                np.full(n, mass_e), table['yield_stress'])]
+        results = iter(_map(executor, _structures,
+                            _chunks(preset, overrides, [row for row, ok in zip(rows, sized) if ok], chunk)))
+        mass_s = np.full(n, np.nan)
+        for i in np.flatnonzero(sized):
+            mass_s[i], error[i] = next(results)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Cost of all samples (Rocket.cost_estimator), with the factors on the cost estimating relationships
+    mass = mass_p + mass_s
+    cm = CostModel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cm.calculate(np.array([dry_masses[0], mass_s]) / 1000, np.array([prop_masses[0], mass_p / 1000]),
+                     rocket.reflights, rocket.engine.cost, engine_number, launches_per_year=rocket.launches_per_year,
+                     lifetime=rocket.lifetime)
+    production_cost = cm.cost.production_euro * table['cost_production'].to_numpy()
+    operational_cost = cm.cost.operational_euro * table['cost_operational'].to_numpy()
+    total_lifetime = (cm.production.cost.total * table['cost_production'].to_numpy() +
+                      cm.operational.cost.total * table['cost_operational'].to_numpy())
+
+    table['mass'] = mass
+    table['mass_p'] = mass_p
+    table['mass_s'] = mass_s
+    table['mass2'] = mass2
+    table['mass_total'] = mass + mass2 + rocket.payload
+    table['burntime'] = burntime
+    table['development_cost'] = cm.cost.development_cost_euros * table['cost_development'].to_numpy()
+    table['production_cost'] = production_cost
+    table['operational_cost'] = operational_cost
+    table['per_launch_cost'] = production_cost + operational_cost
+    table['total_lifetime_cost'] = cm.man_years_to_million_euro_2022(total_lifetime)
+    table['exit_reason'] = exit_reason
+    table['error'] = error
+    # Samples that could not be sized have no outputs
+    table.loc[table['error'].notna(), list(OUTPUTS)] = np.nan
+    return table
+
+
+def bands(results, percentiles=PERCENTILES, outputs=OUTPUTS):
+    """
+    Summarizes the outputs of the Monte Carlo samples that could be sized.
+
+    Args:
+        results: DataFrame returned by monte_carlo.
+        percentiles: Percentiles of the bands.
+        outputs: Output columns to summarize.
+
+    Returns:
+        pandas DataFrame with one row per output: the percentiles, the mean, the standard deviation and the relative
+        half width of the outer band ("margin", compare to the 40% margin of the user interface).
+    """
+
+    valid = results[results['error'].isna()]
+    rows = {}
+    for name in outputs:
+        values = valid[name].to_numpy(dtype=float)
+        if not len(values):
+            rows[name] = {}
+            continue
+        band = np.percentile(values, percentiles)
+        row = {f"p{p:g}": value for p, value in zip(percentiles, band)}
+        row['mean'] = values.mean()
+        row['std'] = values.std()
+        row['margin'] = (band.max() - band.min()) / 2 / np.median(values)
+        rows[name] = row
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo uncertainty propagation for the rocket.")
+    parser.add_argument("--preset", default="elysium_1", choices=list(PRESETS), help="Base design.")
+    parser.add_argument("--samples", type=int, default=1000, help="Number of samples.")
+    parser.add_argument("--seed", type=int, help="Random seed.")
+    parser.add_argument("--simulate", action="store_true", help="Simulate the trajectory of every sample.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes.")
+    parser.add_argument("--percentiles", default=",".join(f"{p:g}" for p in PERCENTILES),
+                        help="Comma separated percentiles of the bands.")
+    parser.add_argument("--output", help="CSV file to write the samples to.")
+    arguments = parser.parse_args(arguments)
+
+    start = time.perf_counter()
+    results = monte_carlo(arguments.preset, arguments.samples, seed=arguments.seed, simulate=arguments.simulate,
+                          workers=arguments.workers)
+    failed = int(results['error'].notna().sum())
+    print(f"Evaluated {len(results)} samples ({failed} could not be sized) in {time.perf_counter() - start:.1f} s "
+          f"with {arguments.workers} workers.")
+    if arguments.simulate:
+        print("Trajectory exit reasons:", results['exit_reason'].value_counts().to_dict())
+
+    if arguments.output:
+        results.to_csv(arguments.output, index=False)
+    percentiles = [float(value) for value in arguments.percentiles.split(",")]
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(bands(results, percentiles))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from python.core.serialization import to_json
+from python.core.sweep import PRESETS, evaluate_arguments
+from python.structure.materials import materials
+
+# Design optimizer minimizing the cost of the rocket (per launch or over its lifetime) over continuous and categorical
+# inputs, subject to a successful trajectory. It uses differential evolution (DE/rand/1/bin) on the unit hypercube:
+# continuous inputs are scaled to their bounds and snapped to a fine grid, categorical inputs are the index of the
+# interval a coordinate falls in. Snapping makes nearby candidates identical designs, so repeated designs are looked
+# up in the memo instead of being evaluated again. Candidates of a generation are evaluated in parallel (see sweep.py),
+# and the complete optimizer state is saved to a JSON file after every generation so a run can be resumed.
+#
+# Example (from the repository root):
+#   python -m python.core.optimize --preset elysium_1 --generations 20 --population 16 --state optimize.json
+
+OBJECTIVES = ("per_launch_cost", "total_lifetime_cost")
+
+# Default design space: continuous inputs with their bounds, and categorical inputs with their options
+CONTINUOUS = {
+    'diameter': (3.0, 7.0), # m
+    'of_ratio': (2.0, 4.0),
+    'dv_split': (0.30, 0.50),
+    'pressure_ox': (2.0, 8.0), # bar
+    'pressure_fuel': (2.0, 8.0), # bar
+}
+CATEGORICAL = {
+    'material_tank': list(range(len(materials))),
+    'bulkhead': [0, 1],
+    'engine_index': [0, 1],
+}
+
+# Number of grid steps per continuous range (resolution of the memo)
+RESOLUTION = 1000
+
+
+class DesignOptimizer():
+    def __init__(self, preset="elysium_1", objective="per_launch_cost", continuous=None, categorical=None,
+                 population=16, mutation=0.7, crossover=0.9, feasible_exit_reasons=("landed",), seed=None,
+                 state=None):
+        """
+        This function initializes the optimizer.
+
+        Args:
+            preset: Name of the base preset (see sweep.PRESETS), all inputs that are not optimized are taken from it.
+            objective: Rocket attribute to minimize, one of OBJECTIVES.
+            continuous: Dictionary of continuous inputs and their (lower, upper) bounds (default: CONTINUOUS).
+            categorical: Dictionary of categorical inputs and their options (default: CATEGORICAL).
+            population: Number of candidate designs per generation.
+            mutation: Differential weight of the mutation.
+            crossover: Crossover probability.
+            feasible_exit_reasons: Trajectory exit reasons that count as a successful trajectory.
+            seed: Random seed.
+            state: Optional path of the JSON state file (saved after every generation).
+        """
+
+        assert preset in PRESETS, f"Unknown preset {preset}, choose from {list(PRESETS)}"
+        assert objective in OBJECTIVES, f"Unknown objective {objective}, choose from {OBJECTIVES}"
+        self.preset = preset
+        self.objective = objective
+        self.continuous = dict(CONTINUOUS if continuous is None else continuous)
+        self.categorical = dict(CATEGORICAL if categorical is None else categorical)
+        self.names = list(self.continuous) + list(self.categorical)
+        self.population_size = max(population, 4)
+        self.mutation = mutation
+        self.crossover = crossover
+        self.feasible_exit_reasons = tuple(feasible_exit_reasons)
+        self.state = state
+
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
+        self.population = self.rng.random((self.population_size, len(self.names)))
+        self.fitness = None
+        self.memo = {}
+        self.evaluations = 0
+        self.history = []
+
+    def decode(self, u):
+        """
+        Returns the design (dictionary of Rocket inputs) of a point of the unit hypercube.
+        """
+
+        design = {}
+        for name, value in zip(self.names, u):
+            if name in self.continuous:
+                lower, upper = self.continuous[name]
+                design[name] = round(float(lower + np.round(value * RESOLUTION) / RESOLUTION * (upper - lower)), 10)
+            else:
+                options = self.categorical[name]
+                design[name] = options[min(int(value * len(options)), len(options) - 1)]
+        return design
+
+    def key(self, design):
+        return json.dumps(design, sort_keys=True)
+
+    def score(self, result):
+        """
+        Returns the fitness of an evaluated design: its cost if the design is feasible (evaluated without errors, mass
+        loop converged and trajectory successful), infinity otherwise.
+        """
+
+        feasible = (result['error'] is None and result['converged'] and
+                    result['exit_reason'] in self.feasible_exit_reasons)
+        return float(result[self.objective]) if feasible else np.inf
+
+    def evaluate(self, points, workers=None):
+        """
+        Evaluates the fitness of points of the unit hypercube, looking up designs that were evaluated before.
+
+        Args:
+            points: 2D array with one point per row.
+            workers: Number of worker processes (default: number of CPUs). 1 evaluates the designs in this process.
+
+        Returns:
+            Array of fitness values.
+        """
+
+        designs = [self.decode(u) for u in points]
+        keys = [self.key(design) for design in designs]
+
+        # Unique designs that are not in the memo yet
+        pending = {}
+        for key, design in zip(keys, designs):
+            if key not in self.memo:
+                pending[key] = design
+
+        arguments = [(self.preset, design, True) for design in pending.values()]
+        if workers == 1 or len(arguments) <= 1:
+            results = [evaluate_arguments(argument) for argument in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(evaluate_arguments, arguments, chunksize=1))
+
+        for key, result in zip(pending, results):
+            self.memo[key] = {name: to_json(value) for name, value in result.items()}
+        self.evaluations += len(results)
+        return np.array([self.score(self.memo[key]) for key in keys])
+
+    def step(self, workers=None):
+        """
+        This function runs one generation of differential evolution.
+        """
+
+        if self.fitness is None:
+            self.fitness = self.evaluate(self.population, workers)
+
+        # Mutation (DE/rand/1) and binomial crossover
+        size, dimensions = self.population.shape
+        trials = np.empty_like(self.population)
+        for i in range(size):
+            a, b, c = self.rng.choice([j for j in range(size) if j != i], 3, replace=False)
+            mutant = self.population[a] + self.mutation * (self.population[b] - self.population[c])
+            # Reflect back into the unit hypercube
+            mutant = np.abs(mutant)
+            mutant = np.where(mutant > 1, 2 - mutant, mutant).clip(0, 1)
+            cross = self.rng.random(dimensions) < self.crossover
+            cross[self.rng.integers(dimensions)] = True
+            trials[i] = np.where(cross, mutant, self.population[i])
+
+        # Selection (ties go to the trial, so the population keeps moving on plateaus)
+        trial_fitness = self.evaluate(trials, workers)
+        improved = trial_fitness <= self.fitness
+        self.population[improved] = trials[improved]
+        self.fitness[improved] = trial_fitness[improved]
+
+        self.generation += 1
+        best = int(np.argmin(self.fitness))
+        self.history.append({'generation': self.generation, 'best': float(self.fitness[best]),
+                             'evaluations': self.evaluations, 'memo_size': len(self.memo)})
+
+    def run(self, generations, workers=None):
+        """
+        This function runs the optimizer for a number of (additional) generations, saving the state after each one.
+
+        Returns:
+            Best design found and its evaluation result.
+        """
+
+        for _ in range(generations):
+            start = time.perf_counter()
+            self.step(workers)
+            if self.state:
+                self.save(self.state)
+            best, result = self.best()
+            print(f"Generation {self.generation}: best {self.objective} = {self.history[-1]['best']:.3f}, "
+                  f"{self.evaluations} evaluations ({len(self.memo)} unique designs), "
+                  f"{time.perf_counter() - start:.1f} s")
+        return self.best()
+
+    def best(self):
+        """Returns the best design of the population and its evaluation result."""
+        if self.fitness is None:
+            return None, None
+        design = self.decode(self.population[int(np.argmin(self.fitness))])
+        return design, self.memo[self.key(design)]
+
+    def save(self, path):
+        """Saves the complete optimizer state (population, memo, random generator) to a JSON file."""
+        state = {
+            'preset': self.preset,
+            'objective': self.objective,
+            'continuous': self.continuous,
+            'categorical': self.categorical,
+            'population_size': self.population_size,
+            'mutation': self.mutation,
+            'crossover': self.crossover,
+            'feasible_exit_reasons': self.feasible_exit_reasons,
+            'generation': self.generation,
+            'population': self.population.tolist(),
+            'fitness': None if self.fitness is None else [to_json(value) for value in self.fitness],
+            'memo': self.memo,
+            'evaluations': self.evaluations,
+            'history': self.history,
+            'rng': self.rng.bit_generator.state,
+        }
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as file:
+            json.dump(state, file)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Restores an optimizer from a JSON state file (saved by save), to continue the run."""
+        with open(path) as file:
+            state = json.load(file)
+
+        optimizer = cls(state['preset'], state['objective'], state['continuous'], state['categorical'],
+                        state['population_size'], state['mutation'], state['crossover'],
+                        state['feasible_exit_reasons'], state=path)
+        optimizer.continuous = {name: tuple(bounds) for name, bounds in state['continuous'].items()}
+        optimizer.generation = state['generation']
+        optimizer.population = np.array(state['population'])
+        optimizer.fitness = None if state['fitness'] is None else np.array(
+            [np.inf if value is None else value for value in state['fitness']], dtype=float)
+        optimizer.memo = state['memo']
+        optimizer.evaluations = state['evaluations']
+        optimizer.history = state['history']
+        optimizer.rng.bit_generator.state = state['rng']
+        return optimizer
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Cost-driven design optimizer for the rocket.")
+    parser.add_argument("--preset", default="elysium_1", choices=list(PRESETS), help="Base design.")
+    parser.add_argument("--objective", default="per_launch_cost", choices=OBJECTIVES, help="Cost to minimize.")
+    parser.add_argument("--generations", type=int, default=20, help="Number of (additional) generations.")
+    parser.add_argument("--population", type=int, default=16, help="Number of candidate designs per generation.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes.")
+    parser.add_argument("--seed", type=int, help="Random seed.")
+    parser.add_argument("--state", help="JSON state file, resumed from if it exists.")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.state and os.path.exists(arguments.state):
+        optimizer = DesignOptimizer.load(arguments.state)
+        print(f"Resuming from generation {optimizer.generation} ({len(optimizer.memo)} designs evaluated).")
+    else:
+        optimizer = DesignOptimizer(arguments.preset, arguments.objective, population=arguments.population,
+                                    seed=arguments.seed, state=arguments.state)
+
+    design, result = optimizer.run(arguments.generations, workers=arguments.workers)
+    print("Best design:", design)
+    if result is not None:
+        print(f"{optimizer.objective}: {result[optimizer.objective]}")
+    return optimizer
+
+
+if __name__ == "__main__":
+    main()
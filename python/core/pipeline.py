@@ -0,0 +1,170 @@
+import copy
+import hashlib
+import operator
+import pickle
+
+from python.trajectory.trajectory import Trajectory
+
+# The Rocket pipeline as a dataflow graph with content-hashed memoization:
+#   mass_estimation -> trajectory -> propulsion -> structure -> cost
+# Every stage declares the Rocket attributes it reads (dotted names read attributes of subsystem objects) and the ones it
+# writes. Before a stage runs, the content of its inputs is hashed; if the stage ran before with the same inputs its
+# outputs are restored from the memo instead. A changed input therefore only reruns the stages that (directly or through
+# changed outputs of other stages) depend on it, e.g. changing launches_per_year or reflights only reruns the cost model.
+#
+# The stages are those of one pass of Rocket.iterate without trajectory coupling (which is converged after the first
+# sizing). The coupled mode feeds the sizing back into the trajectory, which is a loop rather than a graph, so it is not
+# supported here.
+#
+# Example:
+#   pipeline = Pipeline(get_elysium_1_preset())
+#   pipeline.run()
+#   pipeline.update(launches_per_year=12)  # returns ['cost']
+
+
+class Stage():
+    def __init__(self, name, inputs, outputs, run):
+        """
+        A stage of the pipeline.
+
+        Args:
+            name: Name of the stage.
+            inputs: Names of the Rocket attributes the stage reads.
+            outputs: Names of the Rocket attributes the stage writes.
+            run: Function running the stage on a Rocket.
+        """
+
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.run = run
+        self.get_inputs = operator.attrgetter(*self.inputs)
+
+
+def _run_trajectory(rocket):
+    # A new Trajectory object, the memo keeps the previous ones
+    rocket.trajectory = Trajectory()
+    rocket.run_trajectory(rocket.trajectory_timestep)
+
+
+def _size_propulsion(rocket):
+    # Propulsion and Structure store their results on themselves, so they are sized on a copy the memo can keep
+    rocket.propulsion = copy.copy(rocket.propulsion)
+    rocket.size_propulsion()
+
+
+def _size_structure(rocket):
+    rocket.structure = copy.copy(rocket.structure)
+    rocket.size_structure()
+
+
+STAGES = (
+    Stage('mass_estimation',
+          inputs=('dv_1', 'dv_2', 'mf2', 'isp2', 'propulsion.Isp', 'payload', 'reflights'),
+          outputs=('inert_mass_fractions', 'ISPs', 'wet_masses', 'prop_masses', 'dry_masses', 'mass2', 'mass',
+                   'mass_prev', 'mass_total', 'struct_frac_1'),
+          run=lambda rocket: rocket.mass_estimation()),
+    Stage('trajectory',
+          inputs=('mass', 'struct_frac_1', 'prop_masses', 'payload', 'isp2', 'propulsion.Isp', 'engine.Thrust',
+                  'number_of_engines_ascent', 'number_of_engines_landing', 'number_of_engines_reentry', 'kick_angle',
+                  'kick_time', 'delta_V_landing', 'delta_V_reentry', 'cd', 'diameter', 'reentry_burn_alt',
+                  'gravity_turn_alt', 'landing_type', 'trajectory_integrator', 'trajectory_timestep',
+                  'trajectory_max_time'),
+          outputs=('trajectory', 'trajectory_timestep_used'),
+          run=_run_trajectory),
+    Stage('propulsion',
+          inputs=('trajectory.number_of_engines_ascent', 'trajectory.thrust', 'trajectory.burntime',
+                  'propulsion.engine.name', 'propulsion.of_ratio', 'temperature_fuel', 'temperature_ox', 'pressure_ox',
+                  'pressure_fuel'),
+          outputs=('propulsion', 'thrust', 'burntime', 'mass_e', 'mass_fuel', 'mass_ox', 'volume_fuel', 'volume_ox',
+                   'engine_number', 'mass_p'),
+          run=_size_propulsion),
+    Stage('structure',
+          inputs=('structure.outer_radius', 'structure.material', 'structure.material3', 'structure.pressure1',
+                  'structure.pressure2', 'bulkhead_options', 'bulkhead', 'volume_ox', 'mass_ox', 'volume_fuel',
+                  'mass_fuel', 'thrust', 'mass_e', 'mass_p', 'mass2', 'payload'),
+          outputs=('structure', 'mass_t', 'mass_es', 'mass_lg', 'mass_s', 'mass', 'struct_frac_1', 'mass_total'),
+          run=_size_structure),
+    Stage('cost',
+          inputs=('prop_masses', 'dry_masses', 'mass_p', 'mass_s', 'reflights', 'engine.cost', 'engine_number',
+                  'launches_per_year', 'lifetime'),
+          outputs=('cost_prop_masses', 'cost_dry_masses', 'total_lifetime_cost', 'per_launch_cost', 'development_cost',
+                   'operational_cost', 'production_cost'),
+          run=lambda rocket: rocket.cost_estimator()),
+)
+
+
+def content_hash(values):
+    """
+    Returns a hash of the content of values (numbers, strings, numpy arrays and containers of them).
+    """
+
+    return hashlib.sha256(pickle.dumps(values, protocol=4)).hexdigest()
+
+
+class Pipeline():
+    def __init__(self, rocket, stages=STAGES, max_entries=64):
+        """
+        This function initializes the pipeline of a Rocket.
+
+        Args:
+            rocket: Rocket object the stages run on.
+            stages: Stages in execution order (every stage only reads outputs of the stages before it).
+            max_entries: Maximum number of memoized results per stage, the least recently used is dropped first.
+        """
+
+        assert not rocket.trajectory_coupling, "The coupled mode is a loop, use Rocket.iterate"
+        self.rocket = rocket
+        self.stages = tuple(stages)
+        self.max_entries = max_entries
+        self.memo = {stage.name: {} for stage in self.stages}
+        self.hits = dict.fromkeys(self.memo, 0)
+        self.misses = dict.fromkeys(self.memo, 0)
+        self.executed = []
+
+    def run(self):
+        """
+        This function brings the outputs of all stages up to date with the current inputs of the rocket.
+
+        Returns:
+            Names of the stages that were executed (the others were restored from the memo).
+        """
+
+        self.executed = []
+        for stage in self.stages:
+            key = content_hash(stage.get_inputs(self.rocket))
+            memo = self.memo[stage.name]
+            if key in memo:
+                self.hits[stage.name] += 1
+                # Most recently used last
+                memo[key] = memo.pop(key)
+                self.rocket.__dict__.update(memo[key])
+                continue
+
+            self.misses[stage.name] += 1
+            stage.run(self.rocket)
+            memo[key] = {name: getattr(self.rocket, name) for name in stage.outputs}
+            if len(memo) > self.max_entries:
+                del memo[next(iter(memo))]
+            self.executed.append(stage.name)
+        return self.executed
+
+    def update(self, **inputs):
+        """
+        This function changes inputs of the rocket (see Rocket.update_values) and reruns the affected stages.
+
+        Returns:
+            Names of the stages that were executed.
+        """
+
+        self.rocket.update_values(**inputs)
+        return self.run()
+
+    def stats(self):
+        """Returns the number of memo hits and misses (executions) per stage."""
+        return {name: {'hits': self.hits[name], 'misses': self.misses[name]} for name in self.memo}
+
+    def clear(self):
+        """Drops all memoized results, so the next run executes every stage."""
+        for memo in self.memo.values():
+            memo.clear()
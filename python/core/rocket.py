@@ -1,11 +1,16 @@
 
+import warnings
+
 import numpy as np
 
 from python.propulsion.propulsion import Propulsion
-from python.structure.structure import Structure
+from python.structure.structure import InfeasibleDesign, Structure
 from python.trajectory.trajectory import Trajectory
+from python.trajectory.cache import TrajectoryCache
 from python.cost.model import MassCalculator
 from python.cost.model import CostModel
+from python.core.convergence import ConvergenceSolver
+from python.core.memo import subsystem_cache
 from python.structure.materials import materials as materials
 
 
@@ -15,6 +20,12 @@ from python.structure.materials import materials as materials
 class Rocket():
     def __init__(self, **kwargs):
         self.landing_type = None
+        # Results of previous trajectory simulations are reused when the trajectory inputs did not change.
+        # Set to None to always simulate.
+        self.trajectory_cache = TrajectoryCache()
+        # Engine, propulsion and structure objects are reused when the inputs they are built from did not change (see
+        # core/memo.py). Set to None to always rebuild them.
+        self.subsystem_cache = subsystem_cache
         self.update_values(**kwargs)
 
     def update_values(self, **kwargs):
@@ -25,21 +36,28 @@ class Rocket():
         if self.reflights > 0:
             landingdv = 1000
         self.dv_1 = self.dv - self.dv_2 + landingdv
-        if self.engine_options[self.engine_index] == "Prometheus":
-            from python.propulsion.inputs import Prometheus
-            self.engine = Prometheus()
-        elif self.engine_options[self.engine_index] == "Merlin1D":
-            from python.propulsion.inputs import Merlin1D
-            self.engine = Merlin1D()
-
-        self.propulsion = Propulsion(self.engine, self.of_ratio, self.pressure_ox*10**5,
-                                     self.pressure_fuel*10**5)
-        self.structure = Structure(self.diameter / 2, self.material_options[self.material_tank], self.pressure_ox,
-                                   self.pressure_fuel, self.material_options[self.material_misc])
+        engine_name = self.engine_options[self.engine_index]
+        self.engine = self.get_subsystem('engine', (engine_name,), lambda: get_engine(engine_name), shared=True)
+
+        self.propulsion = self.get_subsystem(
+            'propulsion', (engine_name, self.of_ratio, self.pressure_ox, self.pressure_fuel),
+            lambda: Propulsion(self.engine, self.of_ratio, self.pressure_ox*10**5, self.pressure_fuel*10**5))
+        self.structure = self.get_subsystem(
+            'structure', (self.diameter, self.material_options[self.material_tank], self.pressure_ox, self.pressure_fuel,
+                          self.material_options[self.material_misc]),
+            lambda: Structure(self.diameter / 2, self.material_options[self.material_tank], self.pressure_ox,
+                              self.pressure_fuel, self.material_options[self.material_misc]))
         self.trajectory = Trajectory()
 
-    def mass_estimation(self):
-        self.inert_mass_fractions = np.array([self.mf2, self.mf2])
+    def get_subsystem(self, kind, key, build, shared=False):
+        # Memoized subsystem object (see core/memo.py), or a new one if memoization is disabled
+        if self.subsystem_cache is None:
+            return build()
+        return self.subsystem_cache.get(kind, key, build, shared)
+
+    def mass_estimation(self, struct_frac_1=None):
+        # struct_frac_1 optionally replaces the first stage inert mass fraction (used by the coupled mode of iterate)
+        self.inert_mass_fractions = np.array([self.mf2, self.mf2 if struct_frac_1 is None else struct_frac_1])
         self.ISPs = np.array([self.isp2, self.propulsion.Isp])
 
 
@@ -53,81 +71,188 @@ class Rocket():
         self.struct_frac_1 = self.inert_mass_fractions[1]
     def cost_estimator(self):
         cm = CostModel()
-        self.prop_masses = np.array([self.prop_masses[0], self.mass_p / 1000])
-        self.dry_masses = np.array([self.dry_masses[0], self.mass_s]) / 1000
-        cm.calculate(self.dry_masses,self.prop_masses , self.reflights, self.engine.cost, self.engine_number)
+        # Stage masses of the cost model (the mass estimate in prop_masses and dry_masses is left as is, so the cost
+        # can be estimated again without rerunning the mass estimation)
+        self.cost_prop_masses = np.array([self.prop_masses[0], self.mass_p / 1000])
+        self.cost_dry_masses = np.array([self.dry_masses[0], self.mass_s]) / 1000
+        cm.calculate(self.cost_dry_masses, self.cost_prop_masses, self.reflights, self.engine.cost, self.engine_number,
+                     launches_per_year=self.launches_per_year, lifetime=self.lifetime)
         self.total_lifetime_cost = cm.cost.total_lifetime_euros
         self.per_launch_cost = cm.cost.per_launch_euros
         self.development_cost = cm.cost.development_cost_euros
         self.operational_cost = cm.cost.operational_euro
         self.production_cost = cm.cost.production_euro
     
-    def iterate(self):
-        e = 10e9
-        i = 0
+    def setup_trajectory(self, timestep):
+        """
+        Sets up the trajectory simulation for the current first stage mass estimate (this also gives the burntime).
+
+        Args:
+            timestep: Simulation timestep (seconds).
+        """
 
         # Propellant margins can be changed here. Seems too minor to include in the user interface (too much clutter). 
         first_stage_ascent_prop_margin = 1.02
         first_stage_landing_prop_margin = 1.1
         first_stage_reentry_prop_margin = 1.05
 
-        max_converge = 100
+        # Warm start: the previous run tells how long the flight takes, so only that much history is preallocated
+        previous_event_times = getattr(self.trajectory, 'event_times', None)
+        self.trajectory.expected_time = previous_event_times['end'] if previous_event_times else None
+
+        self.trajectory.setup(
+            simulation_timestep = timestep, # seconds
+            simulation_time = self.trajectory_max_time, # seconds
+            number_of_engines_ascent=self.number_of_engines_ascent,
+            number_of_engines_landing=self.number_of_engines_landing,
+            number_of_engines_reentry=self.number_of_engines_reentry,
+            thrust=self.engine.Thrust, # newtons
+            I_sp_1=self.propulsion.Isp, # seconds
+            I_sp_2=self.isp2, # seconds 
+            kick_angle=np.radians(self.kick_angle), # degrees -> radians
+            gamma_change_time=self.kick_time, # seconds
+            m_first_stage_total=self.mass * first_stage_ascent_prop_margin,
+            m_first_stage_structural_frac=self.struct_frac_1,
+            m_second_stage_propellant=self.prop_masses[0], # kg
+            m_second_stage_payload=self.payload, # kg
+            delta_V_landing=self.delta_V_landing * first_stage_landing_prop_margin, # m / s
+            delta_V_reentry=self.delta_V_reentry * first_stage_reentry_prop_margin, # m / s
+            Cd_ascent=self.cd,
+            Cd_descent=1.0, # assumed constant
+            diameter=self.diameter, # meters
+            reentry_burn_alt=self.reentry_burn_alt, # meters
+            gravity_turn_alt=self.gravity_turn_alt, # meters
+            landing_type = self.landing_type,
+            integrator = self.trajectory_integrator
+        )
+
+    def run_trajectory(self, timestep):
+        """
+        Sets up and runs the trajectory simulation for the current first stage mass estimate.
+
+        Args:
+            timestep: Simulation timestep (seconds).
+        """
+
+        self.setup_trajectory(timestep)
+        self.trajectory.run(cache=self.trajectory_cache)
+        self.trajectory_timestep_used = timestep
+
+    def size(self):
+        """
+        Sizes the propulsion and structure of the first stage for the current trajectory burntime.
+        """
+
+        self.size_propulsion()
+        self.size_structure()
+
+    def size_propulsion(self):
+        """
+        Sizes the engines and propellant of the first stage for the current trajectory burntime.
+        """
+
+        self.thrust = self.trajectory.number_of_engines_ascent * self.trajectory.thrust
+        self.burntime = self.trajectory.burntime
+        self.mass_e, self.mass_fuel, self.mass_ox, self.volume_fuel, self.volume_ox, self.engine_number = (
+            self.propulsion.mass_volume(self.thrust, self.burntime, self.temperature_fuel, self.temperature_ox,
+                                        self.pressure_ox, self.pressure_fuel))
+        self.mass_p = self.mass_ox + self.mass_fuel
 
-        while e > 10000:
-            # Trajectory simulation is very slow so only run it for the first iteration.
-            # This could be fixed in the future by writing the code in a faster language such as C++ or using scipy.odeint instead of our Python euler integrator.
+    def size_structure(self):
+        """
+        Sizes the structure of the first stage for the current propellant masses and volumes. Raises InfeasibleDesign if
+        the structure cannot carry the loads.
+        """
+
+        self.structure.calc(self.bulkhead_options[self.bulkhead], self.volume_ox, self.mass_ox, self.volume_fuel,
+                            self.mass_fuel, self.thrust, self.mass_e)
+        if not self.structure.feasible:
+            raise InfeasibleDesign()
+        self.mass_t = self.structure.mass_total #Returns mass of the tank/s ITS/s and engine bay
+        self.mass_es = self.structure.mass_engine_structure
+        self.mass_lg = self.structure.mass_landing_gear
+        self.mass_s = self.mass_e + self.mass_es + self.mass_lg + self.mass_t
+        self.mass = self.mass_p + self.mass_s
+        self.struct_frac_1 = self.mass_s / self.mass
+        self.mass_total = self.mass + self.mass2 + self.payload
+
+    def iterate(self):
+        tolerance = 10000
+
+        # In the coupled mode the burntime has to settle as well (the structural mass fraction it depends on can change
+        # a lot while the total mass barely does). A burntime change of burntime_tolerance counts as an error of tolerance.
+        burntime_tolerance = 0.1 # seconds
+
+        # Errors of the previous iteration
+        errors = {'mass': 10e9, 'iterations': 0}
+
+        def step(struct_frac_1):
+            # One iteration of the mass convergence loop, as a fixed-point map of the first stage structural mass
+            # fraction. Returns the sized structural mass fraction and the error.
+            i = errors['iterations']
+
+            # Trajectory simulation is very slow so by default only run it for the first iteration.
+            # The adaptive integrators (trajectory_integrator = "RK45" or "DOP853") are much faster than our Python euler integrator.
             # Still, the mass optimization should not change it massively so this should be a good first approximation of the trajectories.
-            if i == 0:
-                self.trajectory.setup(
-                    simulation_timestep = self.trajectory_timestep, # seconds
-                    simulation_time = self.trajectory_max_time, # seconds
-                    number_of_engines_ascent=self.number_of_engines_ascent,
-                    number_of_engines_landing=self.number_of_engines_landing,
-                    number_of_engines_reentry=self.number_of_engines_reentry,
-                    thrust=self.engine.Thrust, # newtons
-                    I_sp_1=self.propulsion.Isp, # seconds
-                    I_sp_2=self.isp2, # seconds 
-                    kick_angle=np.radians(self.kick_angle), # degrees -> radians
-                    gamma_change_time=self.kick_time, # seconds
-                    m_first_stage_total=self.mass * first_stage_ascent_prop_margin,
-                    m_first_stage_structural_frac=self.struct_frac_1,
-                    m_second_stage_propellant=self.prop_masses[0], # kg
-                    m_second_stage_payload=self.payload, # kg
-                    delta_V_landing=self.delta_V_landing * first_stage_landing_prop_margin, # m / s
-                    delta_V_reentry=self.delta_V_reentry * first_stage_reentry_prop_margin, # m / s
-                    Cd_ascent=self.cd,
-                    Cd_descent=1.0, # assumed constant
-                    diameter=self.diameter, # meters
-                    reentry_burn_alt=self.reentry_burn_alt, # meters
-                    gravity_turn_alt=self.gravity_turn_alt, # meters
-                    landing_type = self.landing_type
-                )
-                self.trajectory.run()
-
-            self.thrust = self.trajectory.number_of_engines_ascent * self.trajectory.thrust
-            self.burntime = self.trajectory.burntime
-            self.mass_e, self.mass_fuel, self.mass_ox, self.volume_fuel, self.volume_ox, self.engine_number = (
-                self.propulsion.mass_volume(self.thrust, self.burntime, self.temperature_fuel, self.temperature_ox,
-                                            self.pressure_ox, self.pressure_fuel))
-            self.mass_p = self.mass_ox + self.mass_fuel
-            self.structure.calc(self.bulkhead_options[self.bulkhead], self.volume_ox, self.mass_ox, self.volume_fuel,
-                                self.mass_fuel, self.thrust, self.mass_e)
-            self.mass_t = self.structure.mass_total #Returns mass of the tank/s ITS/s and engine bay
-            self.mass_es = self.structure.mass_engine_structure
-            self.mass_lg = self.structure.mass_landing_gear
-            self.mass_s = self.mass_e + self.mass_es + self.mass_lg + self.mass_t
-            self.mass = self.mass_p + self.mass_s
-            self.struct_frac_1 = self.mass_s / self.mass
-            self.mass_total = self.mass + self.mass2 + self.payload
+            # In the coupled mode (trajectory_coupling = True) the trajectory is set up again for every mass estimate, so
+            # the converged mass feeds back into the burntime. The burntime (and everything else the sizing reads from
+            # the trajectory) only depends on the setup, so the trajectory is only simulated once after convergence.
+            if i == 0 and not self.trajectory_coupling:
+                self.run_trajectory(self.trajectory_timestep)
+            elif self.trajectory_coupling:
+                if i > 0:
+                    # Feed the structural mass fraction back into the delta-V based mass estimate, so the trajectory
+                    # (and its burntime) is set up for a first stage that is consistent with the sizing.
+                    # The error is then the change of the sized mass between iterations.
+                    mass_sized = self.mass
+                    self.mass_estimation(struct_frac_1)
+                    self.mass_prev = mass_sized
+                self.setup_trajectory(self.trajectory_timestep)
+
+            burntime_prev = getattr(self, 'burntime', np.inf)
+            self.size()
+
             e = np.abs(self.mass - self.mass_prev)
-            i += 1
+            error = e
+            if self.trajectory_coupling:
+                error = max(e, np.abs(self.burntime - burntime_prev) * tolerance / burntime_tolerance)
+            errors['mass'] = e
+            errors['iterations'] += 1
             self.mass_prev = self.mass
-            print(f"Iterated! Mass = {self.mass:.0f} kg, e = {e:.0f}")
-            if i >= max_converge:
-                print(f"Non convergence!")
-                break
+            print(f"Iterated! Mass = {self.mass:.0f} kg, e = {e:.0f}" +
+                  (f", burntime = {self.burntime:.2f} s" if self.trajectory_coupling else ""))
+            return self.struct_frac_1, error
+
+        # Fixed-point solver (convergence_method = "picard" is plain successive substitution). Without trajectory coupling
+        # the sizing does not depend on the structural mass fraction (the trajectory is only run once), so the map is
+        # constant and converges in two iterations, which the accelerated methods cannot shorten.
+        method = self.convergence_method
+        if not self.trajectory_coupling and method != "picard":
+            warnings.warn(f"convergence_method {method} only applies with trajectory_coupling, using picard")
+            method = "picard"
+        self.convergence = ConvergenceSolver(method, tolerance=tolerance, max_iterations=100)
+        self.convergence.solve(step, self.struct_frac_1,
+                               monitor=lambda: {'mass': self.mass, 'mass_error': errors['mass'], 'burntime': self.burntime})
+        if self.convergence.diverged:
+            print("Divergence detected!")
+        elif not self.convergence.converged:
+            print(f"Non convergence!")
+
+        # Simulate the converged trajectory for the results and plots (it does not change the converged mass)
+        if self.trajectory_coupling:
+            self.run_trajectory(self.trajectory_timestep)
         self.cost_estimator()
 
+def get_engine(name):
+    """Returns a new engine object of the given name (see Rocket.engine_options)."""
+    if name == "Prometheus":
+        from python.propulsion.inputs import Prometheus
+        return Prometheus()
+    elif name == "Merlin1D":
+        from python.propulsion.inputs import Merlin1D
+        return Merlin1D()
+    raise ValueError(f"Unknown engine {name}")
+
 def get_elysium_1_preset():
     elysium_1 = Rocket(
         orbit_options = ['LEO', 'GTO', 'GEO', "LTO"],
@@ -156,6 +281,9 @@ def get_elysium_1_preset():
         of_ratio = 3.5,
         trajectory_timestep = 0.05, # seconds
         trajectory_max_time = 800, # seconds
+        trajectory_integrator = "euler", # "euler" or an adaptive solve_ivp method ("RK45", "DOP853")
+        trajectory_coupling = False, # set up the trajectory again for every mass iteration (see Rocket.iterate)
+        convergence_method = "picard", # "picard", "aitken", "secant" or "anderson" (see core/convergence.py), the accelerated methods need trajectory_coupling
         number_of_engines_ascent = 9,
         number_of_engines_landing = 1,
         number_of_engines_reentry = 3,
@@ -164,7 +292,9 @@ def get_elysium_1_preset():
         delta_V_landing = 909, # m / s
         delta_V_reentry = 1905, # m / s
         reentry_burn_alt = 55_000, # m
-        gravity_turn_alt = 10_000 # m
+        gravity_turn_alt = 10_000, # m
+        launches_per_year = 10,
+        lifetime = 20 # years
     )
     return elysium_1
 
@@ -196,6 +326,9 @@ def get_falcon_9_preset():
         of_ratio = 2.34,
         trajectory_timestep = 0.05,
         trajectory_max_time = 600,
+        trajectory_integrator = "euler",
+        trajectory_coupling = False,
+        convergence_method = "picard",
         number_of_engines_ascent = 9,
         number_of_engines_landing = 1,
         number_of_engines_reentry = 3,
@@ -205,6 +338,8 @@ def get_falcon_9_preset():
         delta_V_reentry = 2_000,
         reentry_burn_alt = 55_000,
         gravity_turn_alt = 1500,
-        landing_type = "Falcon 9"
+        landing_type = "Falcon 9",
+        launches_per_year = 10,
+        lifetime = 20
     )
     return falcon_9
\ No newline at end of file
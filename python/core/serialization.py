@@ -0,0 +1,18 @@
+import numpy as np
+
+# Conversion of the results written to the JSON files of the batch runner, the optimizer state and the trajectory cache
+# and archive. Usable both on single values and as the default hook of json.dump/json.dumps.
+
+# Values JSON represents as they are
+JSON_TYPES = (str, int, float, bool, list, tuple, dict, type(None))
+
+
+def to_json(value):
+    # numpy scalars to Python values, and infinities/NaNs to None (not valid JSON)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if not isinstance(value, JSON_TYPES):
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return value
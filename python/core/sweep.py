@@ -0,0 +1,184 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from python.core.rocket import get_elysium_1_preset, get_falcon_9_preset
+from python.structure.structure import InfeasibleDesign
+from python.trajectory.archive import write_archive
+
+# Parameter sweeps over Rocket designs. Every design point is evaluated on its own Rocket, freshly built from a preset
+# (Rocket.update_values mutates the object it is called on, so points must never share one), in a pool of worker
+# processes. The results are collected into a single pandas table with one row per design point.
+#
+# Example (from the repository root):
+#   python -m python.core.sweep --preset elysium_1 --grid diameter=4,5,6 --grid bulkhead=0,1 --output sweep.csv
+
+PRESETS = {
+    'elysium_1': get_elysium_1_preset,
+    'falcon_9': get_falcon_9_preset,
+}
+
+# Rocket attributes collected for every design point
+RESULTS = (
+    'mass',
+    'mass_p',
+    'mass_s',
+    'mass2',
+    'mass_total',
+    'burntime',
+    'engine_number',
+    'development_cost',
+    'production_cost',
+    'operational_cost',
+    'per_launch_cost',
+    'total_lifetime_cost',
+)
+
+
+def grid(**values):
+    """
+    Returns the design points of a full factorial grid.
+
+    Args:
+        values: Lists of values per Rocket input, e.g. diameter=[4, 5, 6], bulkhead=[0, 1].
+
+    Returns:
+        List of dictionaries of overrides, one per combination of values.
+    """
+
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*(values[name] for name in names))]
+
+
+def evaluate(preset, overrides, quiet=True, archive=None):
+    """
+    Evaluates a single design point on an isolated Rocket.
+
+    Args:
+        preset: Name of the base preset (see PRESETS).
+        overrides: Dictionary of Rocket inputs that differ from the preset.
+        quiet: Whether to suppress the printed output of the models.
+        archive: Optional folder to archive the trajectory of the design to (see trajectory/archive.py).
+
+    Returns:
+        Dictionary with the overrides, the results (see RESULTS), the trajectory exit reason, whether the structure is
+        feasible (None if the design failed otherwise), the wall time and the error message if the design could not be
+        evaluated.
+    """
+
+    row = dict(overrides)
+    start = time.perf_counter()
+    output = io.StringIO() if quiet else None
+    try:
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            rocket = PRESETS[preset]()
+            rocket.update_values(**overrides)
+            rocket.mass_estimation()
+            rocket.iterate()
+            if archive:
+                write_archive(rocket.trajectory, archive)
+        row.update({name: getattr(rocket, name) for name in RESULTS})
+        row['exit_reason'] = rocket.trajectory.exit_reason
+        row['converged'] = rocket.convergence.converged
+        row['feasible'] = True
+        row['error'] = None
+    except Exception as error:
+        # Infeasible designs (e.g. no propellant left for the ascent) are recorded rather than stopping the sweep
+        row.update({name: np.nan for name in RESULTS})
+        row['exit_reason'] = None
+        row['converged'] = False
+        # Designs without a feasible structure stop at their first structural sizing
+        row['feasible'] = False if isinstance(error, InfeasibleDesign) else None
+        row['error'] = f"{type(error).__name__}: {error}"
+    row['wall_time'] = time.perf_counter() - start
+    return row
+
+
+def evaluate_arguments(arguments):
+    # Module level so that it can be sent to worker processes
+    return evaluate(*arguments)
+
+
+def sweep(preset, points, workers=None, quiet=True):
+    """
+    Evaluates many design points in parallel.
+
+    Args:
+        preset: Name of the base preset (see PRESETS).
+        points: List of dictionaries of overrides (e.g. from grid).
+        workers: Number of worker processes (default: number of CPUs). 1 evaluates the points in this process.
+        quiet: Whether to suppress the printed output of the models.
+
+    Returns:
+        pandas DataFrame with one row per design point, in the order of points.
+    """
+
+    # pandas is only needed for the table, not for evaluating single points (see core/batch.py)
+    import pandas as pd
+
+    assert preset in PRESETS, f"Unknown preset {preset}, choose from {list(PRESETS)}"
+    arguments = [(preset, point, quiet) for point in points]
+
+    if workers == 1:
+        rows = [evaluate_arguments(argument) for argument in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # One point per task: points differ a lot in cost (trajectory cache hits, infeasible designs)
+            rows = list(executor.map(evaluate_arguments, arguments, chunksize=1))
+
+    return pd.DataFrame(rows)
+
+
+def _parse_value(text):
+    # Numbers and JSON values as such, anything else as a string (e.g. an integrator name)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def main(arguments=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Parameter sweep over Rocket designs.")
+    parser.add_argument("--preset", default="elysium_1", choices=list(PRESETS), help="Base design.")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="Values of one input for a full factorial grid (repeat for more inputs).")
+    parser.add_argument("--points", help="JSON file with a list of override dictionaries (instead of --grid).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes.")
+    parser.add_argument("--output", help="CSV file to write the results to (printed if omitted).")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the models.")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.points:
+        with open(arguments.points) as file:
+            points = json.load(file)
+    else:
+        values = {}
+        for item in arguments.grid:
+            name, _, text = item.partition("=")
+            values[name] = [_parse_value(value) for value in text.split(",")]
+        points = grid(**values)
+
+    start = time.perf_counter()
+    results = sweep(arguments.preset, points, workers=arguments.workers, quiet=not arguments.verbose)
+    print(f"Evaluated {len(results)} design points in {time.perf_counter() - start:.1f} s "
+          f"with {arguments.workers} workers.")
+
+    if arguments.output:
+        results.to_csv(arguments.output, index=False)
+    else:
+        with pd.option_context('display.max_columns', None, 'display.width', 200):
+            print(results)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -24,15 +24,18 @@ class MassCalculator:
         return future_stages_wet_mass * (R_i - 1) / (1 - R_i * inert_mass_fraction_i)
 
     # Returns wet masses of each stage (starting with first stage) in tonnes.
+    # The inert mass fractions and Isps may also be 2D arrays (stage, sample) to evaluate many samples at once.
     @staticmethod
     def get_wet_masses(dV1, dV2, inert_mass_fractions, Isp, m_payload, reflights):
 
         
         dV_split = np.array([dV2, dV1])
-        assert dV_split.size == inert_mass_fractions.size, "Please provide arrays with equal lengths"
-        assert dV_split.size == Isp.size, "Please provide arrays with equal lengths"
+        assert len(dV_split) == len(inert_mass_fractions), "Please provide arrays with equal lengths"
+        assert len(dV_split) == len(Isp), "Please provide arrays with equal lengths"
 
-        wet_masses = np.array([m_payload,0,0])
+        samples = np.broadcast_shapes(np.shape(inert_mass_fractions), np.shape(Isp))[1:]
+        wet_masses = np.zeros((3,) + samples, dtype=np.asarray(m_payload).dtype)
+        wet_masses[0] = m_payload
         #print(f'Delta V For Stages: {dV_split / 1000} km / s')
         # for i in np.flip(np.array(range(stages))):
             # dV_i = dV_split[i]
@@ -44,8 +47,8 @@ class MassCalculator:
         for i in range(1,len(wet_masses)):
             Vi = Isp[i-1]*9.81
             Ri = np.exp(dV_split[i-1]/Vi)
-            wet_masses[i] = np.sum(wet_masses[0:i]) * (Ri-1) / (1-Ri*inert_mass_fractions[i-1])
-        wet_masses2 = np.array([np.sum(wet_masses[0:2]), wet_masses[2]])
+            wet_masses[i] = np.sum(wet_masses[0:i], axis=0) * (Ri-1) / (1-Ri*inert_mass_fractions[i-1])
+        wet_masses2 = np.array([np.sum(wet_masses[0:2], axis=0), wet_masses[2]])
         return wet_masses2
     @staticmethod
     def get_propellant_masses(wet_masses, inert_mass_fractions):
@@ -75,6 +78,7 @@ class CostModel():
     def euro_to_man_years_2022(self, euro):
         return euro / 1000000 / 0.3397536
 
+    # The masses may also be 2D arrays (stage, sample), the costs are then arrays with one value per sample.
     def calculate(self,
                   dry_masses, # tonnes
                   prop_masses, # tonnes
@@ -168,7 +172,7 @@ class DevelopmentModel():
         self.cost.ballistic_reusable = 4080 * dry_masses[1:dry_masses.size] ** 0.21 * self.f1 * self.f2 * self.f3
 
         # Man-years
-        self.cost.total = self.management_factor * (np.sum(self.cost.cryogenic_expandable) + np.sum(self.cost.ballistic_reusable))
+        self.cost.total = self.management_factor * (self.cost.cryogenic_expandable + np.sum(self.cost.ballistic_reusable, axis=0))
 
 
 class ProductionModel():
@@ -240,7 +244,7 @@ class OperationalModel():
         # Man-years
         self.cost.launch_and_mission_operations = (4 + np.sum(d_values)) * launches_per_year ** -0.15
 
-        total_propellant_mass = np.sum(prop_masses)
+        total_propellant_mass = np.sum(prop_masses, axis=0)
         average_boil_off_rate = 0.2 # LOX and Methane similar: 0.2
 
         # Man-years
@@ -1,5 +1,5 @@
-from python.ui.setup import UI
-
 if __name__ == "__main__":
     print("Starting Elysium IDM.")
+    # Imported here so the message shows before tkinter and the models are loaded
+    from python.ui.setup import UI
     ui = UI()
\ No newline at end of file
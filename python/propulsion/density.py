@@ -1,14 +1,15 @@
+import bisect
+import functools
 import json
 import numpy as np
 import os
 
-from python.propulsion.propellant_properties.NIST_LOX_densities import NIST_LOX_densities
-from python.propulsion.propellant_properties.NIST_methane_densities import NIST_methane_densities
-
 """"
-This file allows you to get the density for 
-methane: 95-111K with steps of 2K and 0.1-1.5MPa with steps of 0.1
+This file allows you to get the density for
+methane: 95-111K and 0.1-1.5MPa with steps of 0.1
 lox: 80-90K with steps of 2K and 0.1-1.5MPa with steps of of 0.1
+The NIST tables are stored as (temperature x pressure) grids in propellant_properties (.npy files described by
+NIST_densities.json), between the grid points the density is interpolated bilinearly.
 """
 
 def read_json_file(input_file_path):
@@ -18,30 +19,130 @@ def read_json_file(input_file_path):
         data = json.load(file)
     return data
 
-def get_keys_from_json(data):
-    if isinstance(data, dict):
-        return list(data.keys())
-    else:
-        return None
-
-def round_to_closest_key(number, keys):
-    closest_key = min(keys, key=lambda x: abs(float(x) - number))
-    return closest_key
-
-def get_density(type, temperature, pressure, molar_mass):
-    if type == "methane":
-        data = NIST_methane_densities
-    elif type == "lox":
-        data = NIST_LOX_densities
-    keys = get_keys_from_json(data)
-    temperature = round_to_closest_key(temperature,keys)
-    pressure = pressure/1e6
-    pressure = round_to_closest_key(pressure,[round(num, 2) for num in list(float(x) / 10 for x in range(1, 16))])
-
-    for entry in data[temperature]:
-        if entry.get('Pressure (MPa)') == pressure:
-            density = entry.get('Density (mol/l)') * molar_mass
-            return density
+# Schema of the NIST property store in propellant_properties: per fluid the .npy file with the grid of a quantity and
+# the values of its axes. More fluids (or wider temperature and pressure ranges) only add entries and files, which are
+# only read when a fluid is first used.
+NIST_STORE = "NIST_densities.json"
+
+# Handling of temperatures and pressures outside the tables: "clip" uses the closest edge of the table (as the closest
+# key lookup this replaces did), "raise" raises a ValueError
+OUT_OF_RANGE = ("clip", "raise")
+
+@functools.lru_cache(maxsize=None)
+def get_schema():
+    return read_json_file(NIST_STORE)
+
+@functools.lru_cache(maxsize=None)
+def load_store(type):
+    """
+    Loads the NIST table of a fluid from the property store (memory mapped, cached per process).
+
+    Args:
+        type: Fluid, one of the entries of the store schema ("lox", "methane").
+
+    Returns:
+        Dictionary of the axis values (numpy arrays, keyed by axis name) and the grid of the quantity (read only numpy
+        array with one dimension per axis, NaN where NIST has no data).
+    """
+
+    schema = get_schema()
+    if type not in schema:
+        raise KeyError(f"No NIST data for {type}, choose from {list(schema)}")
+    entry = schema[type]
+    grid = np.load(os.path.join(os.path.dirname(__file__), "propellant_properties", entry['file']), mmap_mode='r')
+    axes = {axis['name']: np.array(axis['values'], dtype=float) for axis in entry['axes']}
+    assert grid.shape == tuple(len(values) for values in axes.values()), f"Corrupt NIST store for {type}"
+    return {'axes': axes, entry['quantity']: grid}
+
+@functools.lru_cache(maxsize=None)
+def get_grid(type):
+    """
+    Returns the NIST density table of a propellant as a grid.
+
+    Args:
+        type: Propellant, one of the entries of the store schema ("lox", "methane").
+
+    Returns:
+        Temperatures (K), pressures (MPa) and the 2D array of densities (mol/l) with one row per temperature.
+    """
+
+    store = load_store(type)
+    temperatures = store['axes']['temperature']
+    pressures = store['axes']['pressure']
+    densities = np.array(store['density'])
+
+    # Missing cells (methane at 95 K only goes up to 1 MPa) are extrapolated linearly along the pressure, the liquid
+    # density is linear in the pressure over the range of the tables
+    for row in densities:
+        known = np.isfinite(row)
+        if not known.all():
+            slope, intercept = np.polyfit(pressures[known], row[known], 1)
+            row[~known] = slope * pressures[~known] + intercept
+
+    for array in (temperatures, pressures, densities):
+        array.flags.writeable = False
+    return temperatures, pressures, densities
+
+def _interval(grid, values, name, type, out_of_range):
+    # Index of the grid interval of every value and the position in it (0 to 1)
+    if out_of_range == "raise" and (np.any(values < grid[0]) or np.any(values > grid[-1])):
+        raise ValueError(f"{name} outside the NIST table of {type} ({grid[0]:g} to {grid[-1]:g})")
+    values = np.clip(values, grid[0], grid[-1])
+    i = np.clip(np.searchsorted(grid, values, side='right') - 1, 0, len(grid) - 2)
+    return i, (values - grid[i]) / (grid[i + 1] - grid[i])
+
+def get_density_array(type, temperature, pressure, molar_mass, out_of_range="clip"):
+    """
+    Returns the density of a propellant, interpolated bilinearly in the NIST table.
+
+    Args:
+        type: Propellant, one of the entries of the store schema ("lox", "methane").
+        temperature: Temperature (K), float or numpy array.
+        pressure: Pressure (Pa), float or numpy array.
+        molar_mass: Molar mass (g/mol).
+        out_of_range: Handling of values outside the table, one of OUT_OF_RANGE.
+
+    Returns:
+        Density (kg/m3), numpy array of the broadcast shape of temperature and pressure.
+    """
+
+    assert out_of_range in OUT_OF_RANGE, f"Unknown out_of_range {out_of_range}, choose from {OUT_OF_RANGE}"
+    temperatures, pressures, densities = get_grid(type)
+    temperature, pressure = np.broadcast_arrays(np.asarray(temperature, dtype=float),
+                                                np.asarray(pressure, dtype=float) / 1e6)
+    i, u = _interval(temperatures, temperature, "Temperature", type, out_of_range)
+    j, v = _interval(pressures, pressure, "Pressure", type, out_of_range)
+    density = ((1 - u) * (1 - v) * densities[i, j] + u * (1 - v) * densities[i + 1, j] +
+               (1 - u) * v * densities[i, j + 1] + u * v * densities[i + 1, j + 1])
+    return density * molar_mass
+
+@functools.lru_cache(maxsize=None)
+def _get_grid_lists(type):
+    # The grid as Python lists, scalar lookups on them are faster than through numpy
+    return tuple(array.tolist() for array in get_grid(type))
+
+def _scalar_interval(grid, value, name, type, out_of_range):
+    if not grid[0] <= value <= grid[-1]:
+        if out_of_range == "raise":
+            raise ValueError(f"{name} outside the NIST table of {type} ({grid[0]:g} to {grid[-1]:g})")
+        value = min(max(value, grid[0]), grid[-1])
+    i = min(max(bisect.bisect_right(grid, value) - 1, 0), len(grid) - 2)
+    return i, (value - grid[i]) / (grid[i + 1] - grid[i])
+
+def get_density(type, temperature, pressure, molar_mass, out_of_range="clip"):
+    """
+    Returns the density (kg/m3) of a propellant for a temperature (K) and pressure (Pa), see get_density_array.
+    """
+
+    if np.ndim(temperature) or np.ndim(pressure):
+        return get_density_array(type, temperature, pressure, molar_mass, out_of_range)
+    assert out_of_range in OUT_OF_RANGE, f"Unknown out_of_range {out_of_range}, choose from {OUT_OF_RANGE}"
+    temperatures, pressures, densities = _get_grid_lists(type)
+    i, u = _scalar_interval(temperatures, float(temperature), "Temperature", type, out_of_range)
+    j, v = _scalar_interval(pressures, float(pressure) / 1e6, "Pressure", type, out_of_range)
+    density = ((1 - u) * (1 - v) * densities[i][j] + u * (1 - v) * densities[i + 1][j] +
+               (1 - u) * v * densities[i][j + 1] + u * v * densities[i + 1][j + 1])
+    return density * molar_mass
 
 
 
@@ -39,9 +39,9 @@ class Prometheus:
         assume Isp goes down with 10 for every 0.1 OF. chrome-extension://efaidnbmnnnibpcajpcglclefindmkaj/https://www.eucass.eu/doi/EUCASS2017-537.pdf
         """
 
-        self.Isp = 306.266 # calculated using Isp_calculator.py. UPDATE ITERATIVELY (for now)
-        self.Isp = self.Isp - abs(3.5 - of_ratio) * 100
-        return self.Isp
+        Isp = 306.266 # calculated using Isp_calculator.py. UPDATE ITERATIVELY (for now)
+        Isp = Isp - abs(3.5 - of_ratio) * 100 # also works for numpy arrays of O/F ratios
+        return Isp
 
 
 
@@ -70,11 +70,15 @@ class Merlin1D:
         assume Isp goes down with 10 for every 0.1 OF. chrome-extension://efaidnbmnnnibpcajpcglclefindmkaj/https://www.eucass.eu/doi/EUCASS2017-537.pdf
         """
 
-        self.Isp = 282 # calculated using Isp_calculator.py. UPDATE ITERATIVELY (for now)
-        #self.Isp = self.Isp - abs(2.34 - of_ratio) * 100
-        return self.Isp
+        Isp = 282 # calculated using Isp_calculator.py. UPDATE ITERATIVELY (for now)
+        #Isp = Isp - abs(2.34 - of_ratio) * 100
+        return Isp
 
 class Propellant:
+    # Molar mass
+    M_ox = 32.0 / 1000  # kg/mol
+    M_fuel = 16.04 / 1000  # kg/mol
+
     def __init__(self,t_ox,t_fuel,p_ox,p_fuel):
         # FUEL = METHANE
 
@@ -86,10 +90,6 @@ class Propellant:
         self.temperature_ox = t_ox  # K
         self.temperature_fuel = t_fuel  # K
 
-        # Molar mass
-        self.M_ox = 32.0 / 1000  # kg/mol
-        self.M_fuel = 16.04 / 1000  # kg/mol
-
         # density (determined using thermodynamic table, see density.py)
         self.density_ox = get_density("lox", self.temperature_ox, self.pressure_ox,
                                       self.M_ox * 1000)  # kg/m3 liquid oxygen
@@ -1,104 +0,0 @@
-NIST_LOX_densities = {
-    "80.000": [
-      {"Pressure (MPa)": 0.1, "Density (mol/l)": 37.207, "Volume (l/mol)": 0.026877},
-      {"Pressure (MPa)": 0.2, "Density (mol/l)": 37.213, "Volume (l/mol)": 0.026872},
-      {"Pressure (MPa)": 0.3, "Density (mol/l)": 37.218, "Volume (l/mol)": 0.026868},
-      {"Pressure (MPa)": 0.4, "Density (mol/l)": 37.224, "Volume (l/mol)": 0.026864},
-      {"Pressure (MPa)": 0.5, "Density (mol/l)": 37.229, "Volume (l/mol)": 0.026861},
-      {"Pressure (MPa)": 0.6, "Density (mol/l)": 37.235, "Volume (l/mol)": 0.026857},
-      {"Pressure (MPa)": 0.7, "Density (mol/l)": 37.240, "Volume (l/mol)": 0.026853},
-      {"Pressure (MPa)": 0.8, "Density (mol/l)": 37.246, "Volume (l/mol)": 0.026849},
-      {"Pressure (MPa)": 0.9, "Density (mol/l)": 37.251, "Volume (l/mol)": 0.026845},
-      {"Pressure (MPa)": 1, "Density (mol/l)": 37.257, "Volume (l/mol)": 0.026841},
-      {"Pressure (MPa)": 1.1, "Density (mol/l)": 37.262, "Volume (l/mol)": 0.026837},
-      {"Pressure (MPa)": 1.2, "Density (mol/l)": 37.268, "Volume (l/mol)": 0.026833},
-      {"Pressure (MPa)": 1.3, "Density (mol/l)": 37.273, "Volume (l/mol)": 0.026829},
-      {"Pressure (MPa)": 1.4, "Density (mol/l)": 37.279, "Volume (l/mol)": 0.026825},
-      {"Pressure (MPa)": 1.5, "Density (mol/l)": 37.284, "Volume (l/mol)": 0.026821}
-    ],
-    "82.000": [
-      {"Pressure (MPa)": 0.1, "Density (mol/l)": 36.910, "Volume (l/mol)": 0.027093},
-      {"Pressure (MPa)": 0.2, "Density (mol/l)": 36.916, "Volume (l/mol)": 0.027089},
-      {"Pressure (MPa)": 0.3, "Density (mol/l)": 36.922, "Volume (l/mol)": 0.027084},
-      {"Pressure (MPa)": 0.4, "Density (mol/l)": 36.927, "Volume (l/mol)": 0.027080},
-      {"Pressure (MPa)": 0.5, "Density (mol/l)": 36.933, "Volume (l/mol)": 0.027076},
-      {"Pressure (MPa)": 0.6, "Density (mol/l)": 36.939, "Volume (l/mol)": 0.027072},
-      {"Pressure (MPa)": 0.7, "Density (mol/l)": 36.945, "Volume (l/mol)": 0.027067},
-      {"Pressure (MPa)": 0.8, "Density (mol/l)": 36.951, "Volume (l/mol)": 0.027063},
-      {"Pressure (MPa)": 0.9, "Density (mol/l)": 36.956, "Volume (l/mol)": 0.027059},
-      {"Pressure (MPa)": 1, "Density (mol/l)": 36.962, "Volume (l/mol)": 0.027055},
-      {"Pressure (MPa)": 1.1, "Density (mol/l)": 36.968, "Volume (l/mol)": 0.027051},
-      {"Pressure (MPa)": 1.2, "Density (mol/l)": 36.973, "Volume (l/mol)": 0.027046},
-      {"Pressure (MPa)": 1.3, "Density (mol/l)": 36.979, "Volume (l/mol)": 0.027042},
-      {"Pressure (MPa)": 1.4, "Density (mol/l)": 36.985, "Volume (l/mol)": 0.027038},
-      {"Pressure (MPa)": 1.5, "Density (mol/l)": 36.991, "Volume (l/mol)": 0.027034}
-    ],
-    "84.000": [
-      {"Pressure (MPa)": 0.1, "Density (mol/l)": 36.610, "Volume (l/mol)": 0.027315},
-      {"Pressure (MPa)": 0.2, "Density (mol/l)": 36.616, "Volume (l/mol)": 0.027310},
-      {"Pressure (MPa)": 0.3, "Density (mol/l)": 36.622, "Volume (l/mol)": 0.027306},
-      {"Pressure (MPa)": 0.4, "Density (mol/l)": 36.627, "Volume (l/mol)": 0.027301},
-      {"Pressure (MPa)": 0.5, "Density (mol/l)": 36.633, "Volume (l/mol)": 0.027297},
-      {"Pressure (MPa)": 0.6, "Density (mol/l)": 36.639, "Volume (l/mol)": 0.027292},
-      {"Pressure (MPa)": 0.7, "Density (mol/l)": 36.645, "Volume (l/mol)": 0.027288},
-      {"Pressure (MPa)": 0.8, "Density (mol/l)": 36.651, "Volume (l/mol)": 0.027283},
-      {"Pressure (MPa)": 0.9, "Density (mol/l)": 36.657, "Volume (l/mol)": 0.027279},
-      {"Pressure (MPa)": 1, "Density (mol/l)": 36.663, "Volume (l/mol)": 0.027274},
-      {"Pressure (MPa)": 1.1, "Density (mol/l)": 36.669, "Volume (l/mol)": 0.027270},
-      {"Pressure (MPa)": 1.2, "Density (mol/l)": 36.674, "Volume (l/mol)": 0.027265},
-      {"Pressure (MPa)": 1.3, "Density (mol/l)": 36.680, "Volume (l/mol)": 0.027261},
-      {"Pressure (MPa)": 1.4, "Density (mol/l)": 36.686, "Volume (l/mol)": 0.027257},
-      {"Pressure (MPa)": 1.5, "Density (mol/l)": 36.692, "Volume (l/mol)": 0.027252}
-    ],
-    "86.000": [
-      {"Pressure (MPa)": 0.1, "Density (mol/l)": 36.308, "Volume (l/mol)": 0.027542},
-      {"Pressure (MPa)": 0.2, "Density (mol/l)": 36.314, "Volume (l/mol)": 0.027538},
-      {"Pressure (MPa)": 0.3, "Density (mol/l)": 36.320, "Volume (l/mol)": 0.027533},
-      {"Pressure (MPa)": 0.4, "Density (mol/l)": 36.327, "Volume (l/mol)": 0.027528},
-      {"Pressure (MPa)": 0.5, "Density (mol/l)": 36.333, "Volume (l/mol)": 0.027523},
-      {"Pressure (MPa)": 0.6, "Density (mol/l)": 36.339, "Volume (l/mol)": 0.027518},
-      {"Pressure (MPa)": 0.7, "Density (mol/l)": 36.346, "Volume (l/mol)": 0.027514},
-      {"Pressure (MPa)": 0.8, "Density (mol/l)": 36.352, "Volume (l/mol)": 0.027509},
-      {"Pressure (MPa)": 0.9, "Density (mol/l)": 36.358, "Volume (l/mol)": 0.027504},
-      {"Pressure (MPa)": 1, "Density (mol/l)": 36.364, "Volume (l/mol)": 0.027499},
-      {"Pressure (MPa)": 1.1, "Density (mol/l)": 36.371, "Volume (l/mol)": 0.027495},
-      {"Pressure (MPa)": 1.2, "Density (mol/l)": 36.377, "Volume (l/mol)": 0.027490},
-      {"Pressure (MPa)": 1.3, "Density (mol/l)": 36.383, "Volume (l/mol)": 0.027485},
-      {"Pressure (MPa)": 1.4, "Density (mol/l)": 36.389, "Volume (l/mol)": 0.027481},
-      {"Pressure (MPa)": 1.5, "Density (mol/l)": 36.396, "Volume (l/mol)": 0.027476}
-    ],
-    "88.000": [
-      {"Pressure (MPa)": 0.1, "Density (mol/l)": 36.002, "Volume (l/mol)": 0.027776},
-      {"Pressure (MPa)": 0.2, "Density (mol/l)": 36.008, "Volume (l/mol)": 0.027771},
-      {"Pressure (MPa)": 0.3, "Density (mol/l)": 36.014, "Volume (l/mol)": 0.027767},
-      {"Pressure (MPa)": 0.4, "Density (mol/l)": 36.020, "Volume (l/mol)": 0.027762},
-      {"Pressure (MPa)": 0.5, "Density (mol/l)": 36.026, "Volume (l/mol)": 0.027758},
-      {"Pressure (MPa)": 0.6, "Density (mol/l)": 36.031, "Volume (l/mol)": 0.027754},
-      {"Pressure (MPa)": 0.7, "Density (mol/l)": 36.037, "Volume (l/mol)": 0.027749},
-      {"Pressure (MPa)": 0.8, "Density (mol/l)": 36.043, "Volume (l/mol)": 0.027745},
-      {"Pressure (MPa)": 0.9, "Density (mol/l)": 36.049, "Volume (l/mol)": 0.027740},
-      {"Pressure (MPa)": 1, "Density (mol/l)": 36.055, "Volume (l/mol)": 0.027736},
-      {"Pressure (MPa)": 1.1, "Density (mol/l)": 36.061, "Volume (l/mol)": 0.027731},
-      {"Pressure (MPa)": 1.2, "Density (mol/l)": 36.067, "Volume (l/mol)": 0.027727},
-      {"Pressure (MPa)": 1.3, "Density (mol/l)": 36.073, "Volume (l/mol)": 0.027723},
-      {"Pressure (MPa)": 1.4, "Density (mol/l)": 36.079, "Volume (l/mol)": 0.027718},
-      {"Pressure (MPa)": 1.5, "Density (mol/l)": 36.085, "Volume (l/mol)": 0.027714}
-    ],
-    "90.000": [
-      {"Pressure (MPa)": 0.1, "Density (mol/l)": 35.697, "Volume (l/mol)": 0.027968},
-      {"Pressure (MPa)": 0.2, "Density (mol/l)": 35.703, "Volume (l/mol)": 0.027963},
-      {"Pressure (MPa)": 0.3, "Density (mol/l)": 35.708, "Volume (l/mol)": 0.027959},
-      {"Pressure (MPa)": 0.4, "Density (mol/l)": 35.714, "Volume (l/mol)": 0.027955},
-      {"Pressure (MPa)": 0.5, "Density (mol/l)": 35.720, "Volume (l/mol)": 0.027950},
-      {"Pressure (MPa)": 0.6, "Density (mol/l)": 35.726, "Volume (l/mol)": 0.027946},
-      {"Pressure (MPa)": 0.7, "Density (mol/l)": 35.731, "Volume (l/mol)": 0.027942},
-      {"Pressure (MPa)": 0.8, "Density (mol/l)": 35.737, "Volume (l/mol)": 0.027937},
-      {"Pressure (MPa)": 0.9, "Density (mol/l)": 35.743, "Volume (l/mol)": 0.027933},
-      {"Pressure (MPa)": 1, "Density (mol/l)": 35.749, "Volume (l/mol)": 0.027929},
-      {"Pressure (MPa)": 1.1, "Density (mol/l)": 35.755, "Volume (l/mol)": 0.027924},
-      {"Pressure (MPa)": 1.2, "Density (mol/l)": 35.760, "Volume (l/mol)": 0.027920},
-      {"Pressure (MPa)": 1.3, "Density (mol/l)": 35.766, "Volume (l/mol)": 0.027916},
-      {"Pressure (MPa)": 1.4, "Density (mol/l)": 35.772, "Volume (l/mol)": 0.027912},
-      {"Pressure (MPa)": 1.5, "Density (mol/l)": 35.778, "Volume (l/mol)": 0.027907}
-    ]
-  }
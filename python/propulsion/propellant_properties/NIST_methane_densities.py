@@ -1,121 +0,0 @@
-NIST_methane_densities = {
-    "95.00": [
-        {"Pressure (MPa)": 0.10000, "Density (mol/l)": 27.786, "Volume (l/mol)": 0.035990},
-        {"Pressure (MPa)": 0.20000, "Density (mol/l)": 27.790, "Volume (l/mol)": 0.035984},
-        {"Pressure (MPa)": 0.30000, "Density (mol/l)": 27.795, "Volume (l/mol)": 0.035978},
-        {"Pressure (MPa)": 0.40000, "Density (mol/l)": 27.799, "Volume (l/mol)": 0.035973},
-        {"Pressure (MPa)": 0.50000, "Density (mol/l)": 27.803, "Volume (l/mol)": 0.035967},
-        {"Pressure (MPa)": 0.60000, "Density (mol/l)": 27.808, "Volume (l/mol)": 0.035961},
-        {"Pressure (MPa)": 0.70000, "Density (mol/l)": 27.812, "Volume (l/mol)": 0.035956},
-        {"Pressure (MPa)": 0.80000, "Density (mol/l)": 27.816, "Volume (l/mol)": 0.035950},
-        {"Pressure (MPa)": 0.90000, "Density (mol/l)": 27.821, "Volume (l/mol)": 0.035944},
-        {"Pressure (MPa)": 1.0000, "Density (mol/l)": 27.825, "Volume (l/mol)": 0.035939}
-    ],
-
-    "97.00": [
-        {"Pressure (MPa)": 0.10000, "Density (mol/l)": 27.617, "Volume (l/mol)": 0.036210},
-        {"Pressure (MPa)": 0.20000, "Density (mol/l)": 27.621, "Volume (l/mol)": 0.036204},
-        {"Pressure (MPa)": 0.30000, "Density (mol/l)": 27.626, "Volume (l/mol)": 0.036198},
-        {"Pressure (MPa)": 0.40000, "Density (mol/l)": 27.630, "Volume (l/mol)": 0.036192},
-        {"Pressure (MPa)": 0.50000, "Density (mol/l)": 27.635, "Volume (l/mol)": 0.036186},
-        {"Pressure (MPa)": 0.60000, "Density (mol/l)": 27.639, "Volume (l/mol)": 0.036180},
-        {"Pressure (MPa)": 0.70000, "Density (mol/l)": 27.644, "Volume (l/mol)": 0.036175},
-        {"Pressure (MPa)": 0.80000, "Density (mol/l)": 27.648, "Volume (l/mol)": 0.036169},
-        {"Pressure (MPa)": 0.90000, "Density (mol/l)": 27.653, "Volume (l/mol)": 0.036163},
-        {"Pressure (MPa)": 1.0000, "Density (mol/l)": 27.657, "Volume (l/mol)": 0.036157},
-        {"Pressure (MPa)": 1.1000, "Density (mol/l)": 27.662, "Volume (l/mol)": 0.036151},
-        {"Pressure (MPa)": 1.2000, "Density (mol/l)": 27.666, "Volume (l/mol)": 0.036145},
-        {"Pressure (MPa)": 1.3000, "Density (mol/l)": 27.671, "Volume (l/mol)": 0.036139},
-        {"Pressure (MPa)": 1.4000, "Density (mol/l)": 27.675, "Volume (l/mol)": 0.036134},
-        {"Pressure (MPa)": 1.5000, "Density (mol/l)": 27.679, "Volume (l/mol)": 0.036128}
-    ],
-
-    "100.00": [
-        {"Pressure (MPa)": 0.10000, "Density (mol/l)": 27.360, "Volume (l/mol)": 0.036549},
-        {"Pressure (MPa)": 0.20000, "Density (mol/l)": 27.365, "Volume (l/mol)": 0.036543},
-        {"Pressure (MPa)": 0.30000, "Density (mol/l)": 27.370, "Volume (l/mol)": 0.036537},
-        {"Pressure (MPa)": 0.40000, "Density (mol/l)": 27.375, "Volume (l/mol)": 0.036530},
-        {"Pressure (MPa)": 0.50000, "Density (mol/l)": 27.379, "Volume (l/mol)": 0.036524},
-        {"Pressure (MPa)": 0.60000, "Density (mol/l)": 27.384, "Volume (l/mol)": 0.036518},
-        {"Pressure (MPa)": 0.70000, "Density (mol/l)": 27.389, "Volume (l/mol)": 0.036511},
-        {"Pressure (MPa)": 0.80000, "Density (mol/l)": 27.393, "Volume (l/mol)": 0.036505},
-        {"Pressure (MPa)": 0.90000, "Density (mol/l)": 27.398, "Volume (l/mol)": 0.036499},
-        {"Pressure (MPa)": 1.0000, "Density (mol/l)": 27.403, "Volume (l/mol)": 0.036493},
-        {"Pressure (MPa)": 1.1000, "Density (mol/l)": 27.408, "Volume (l/mol)": 0.036486},
-        {"Pressure (MPa)": 1.2000, "Density (mol/l)": 27.412, "Volume (l/mol)": 0.036480},
-        {"Pressure (MPa)": 1.3000, "Density (mol/l)": 27.417, "Volume (l/mol)": 0.036474},
-        {"Pressure (MPa)": 1.4000, "Density (mol/l)": 27.422, "Volume (l/mol)": 0.036468},
-        {"Pressure (MPa)": 1.5000, "Density (mol/l)": 27.426, "Volume (l/mol)": 0.036461}
-    ],
-    "105.00": [
-        {"Pressure (MPa)": 0.1, "Density (mol/l)": 26.925, "Volume (l/mol)": 0.03714},
-        {"Pressure (MPa)": 0.2, "Density (mol/l)": 26.93, "Volume (l/mol)": 0.037133},
-        {"Pressure (MPa)": 0.3, "Density (mol/l)": 26.935, "Volume (l/mol)": 0.037126},
-        {"Pressure (MPa)": 0.4, "Density (mol/l)": 26.941, "Volume (l/mol)": 0.037119},
-        {"Pressure (MPa)": 0.5, "Density (mol/l)": 26.946, "Volume (l/mol)": 0.037112},
-        {"Pressure (MPa)": 0.6, "Density (mol/l)": 26.951, "Volume (l/mol)": 0.037105},
-        {"Pressure (MPa)": 0.7, "Density (mol/l)": 26.956, "Volume (l/mol)": 0.037097},
-        {"Pressure (MPa)": 0.8, "Density (mol/l)": 26.961, "Volume (l/mol)": 0.03709},
-        {"Pressure (MPa)": 0.9, "Density (mol/l)": 26.966, "Volume (l/mol)": 0.037083},
-        {"Pressure (MPa)": 1, "Density (mol/l)": 26.971, "Volume (l/mol)": 0.037076},
-        {"Pressure (MPa)": 1.1, "Density (mol/l)": 26.977, "Volume (l/mol)": 0.037069},
-        {"Pressure (MPa)": 1.2, "Density (mol/l)": 26.982, "Volume (l/mol)": 0.037062},
-        {"Pressure (MPa)": 1.3, "Density (mol/l)": 26.987, "Volume (l/mol)": 0.037055},
-        {"Pressure (MPa)": 1.4, "Density (mol/l)": 26.992, "Volume (l/mol)": 0.037048},
-        {"Pressure (MPa)": 1.5, "Density (mol/l)": 26.997, "Volume (l/mol)": 0.037041}
-    ],
-
-    "107.00": [
-        {"Pressure (MPa)": 0.1, "Density (mol/l)": 26.748, "Volume (l/mol)": 0.037386},
-        {"Pressure (MPa)": 0.2, "Density (mol/l)": 26.753, "Volume (l/mol)": 0.037379},
-        {"Pressure (MPa)": 0.3, "Density (mol/l)": 26.759, "Volume (l/mol)": 0.037371},
-        {"Pressure (MPa)": 0.4, "Density (mol/l)": 26.764, "Volume (l/mol)": 0.037364},
-        {"Pressure (MPa)": 0.5, "Density (mol/l)": 26.769, "Volume (l/mol)": 0.037356},
-        {"Pressure (MPa)": 0.6, "Density (mol/l)": 26.775, "Volume (l/mol)": 0.037349},
-        {"Pressure (MPa)": 0.7, "Density (mol/l)": 26.78, "Volume (l/mol)": 0.037341},
-        {"Pressure (MPa)": 0.8, "Density (mol/l)": 26.785, "Volume (l/mol)": 0.037334},
-        {"Pressure (MPa)": 0.9, "Density (mol/l)": 26.791, "Volume (l/mol)": 0.037326},
-        {"Pressure (MPa)": 1, "Density (mol/l)": 26.796, "Volume (l/mol)": 0.037319},
-        {"Pressure (MPa)": 1.1, "Density (mol/l)": 26.801, "Volume (l/mol)": 0.037312},
-        {"Pressure (MPa)": 1.2, "Density (mol/l)": 26.807, "Volume (l/mol)": 0.037304},
-        {"Pressure (MPa)": 1.3, "Density (mol/l)": 26.812, "Volume (l/mol)": 0.037297},
-        {"Pressure (MPa)": 1.4, "Density (mol/l)": 26.817, "Volume (l/mol)": 0.03729},
-        {"Pressure (MPa)": 1.5, "Density (mol/l)": 26.822, "Volume (l/mol)": 0.037282}
-    ],
-
-    "109.00": [
-        {"Pressure (MPa)": 0.1, "Density (mol/l)": 26.569, "Volume (l/mol)": 0.037638},
-        {"Pressure (MPa)": 0.2, "Density (mol/l)": 26.574, "Volume (l/mol)": 0.03763},
-        {"Pressure (MPa)": 0.3, "Density (mol/l)": 26.58, "Volume (l/mol)": 0.037622},
-        {"Pressure (MPa)": 0.4, "Density (mol/l)": 26.585, "Volume (l/mol)": 0.037615},
-        {"Pressure (MPa)": 0.5, "Density (mol/l)": 26.591, "Volume (l/mol)": 0.037607},
-        {"Pressure (MPa)": 0.6, "Density (mol/l)": 26.597, "Volume (l/mol)": 0.037599},
-        {"Pressure (MPa)": 0.7, "Density (mol/l)": 26.602, "Volume (l/mol)": 0.037591},
-        {"Pressure (MPa)": 0.8, "Density (mol/l)": 26.608, "Volume (l/mol)": 0.037583},
-        {"Pressure (MPa)": 0.9, "Density (mol/l)": 26.613, "Volume (l/mol)": 0.037575},
-        {"Pressure (MPa)": 1, "Density (mol/l)": 26.619, "Volume (l/mol)": 0.037568},
-        {"Pressure (MPa)": 1.1, "Density (mol/l)": 26.624, "Volume (l/mol)": 0.03756},
-        {"Pressure (MPa)": 1.2, "Density (mol/l)": 26.63, "Volume (l/mol)": 0.037552},
-        {"Pressure (MPa)": 1.3, "Density (mol/l)": 26.635, "Volume (l/mol)": 0.037544},
-        {"Pressure (MPa)": 1.4, "Density (mol/l)": 26.641, "Volume (l/mol)": 0.037537},
-        {"Pressure (MPa)": 1.5, "Density (mol/l)": 26.646, "Volume (l/mol)": 0.037529}
-    ],
-
-    "111.00": [
-        {"Pressure (MPa)": 0.1, "Density (mol/l)": 26.388, "Volume (l/mol)": 0.037897},
-        {"Pressure (MPa)": 0.2, "Density (mol/l)": 26.393, "Volume (l/mol)": 0.037888},
-        {"Pressure (MPa)": 0.3, "Density (mol/l)": 26.399, "Volume (l/mol)": 0.03788},
-        {"Pressure (MPa)": 0.4, "Density (mol/l)": 26.405, "Volume (l/mol)": 0.037872},
-        {"Pressure (MPa)": 0.5, "Density (mol/l)": 26.411, "Volume (l/mol)": 0.037863},
-        {"Pressure (MPa)": 0.6, "Density (mol/l)": 26.417, "Volume (l/mol)": 0.037855},
-        {"Pressure (MPa)": 0.7, "Density (mol/l)": 26.422, "Volume (l/mol)": 0.037847},
-        {"Pressure (MPa)": 0.8, "Density (mol/l)": 26.428, "Volume (l/mol)": 0.037839},
-        {"Pressure (MPa)": 0.9, "Density (mol/l)": 26.434, "Volume (l/mol)": 0.03783},
-        {"Pressure (MPa)": 1, "Density (mol/l)": 26.44, "Volume (l/mol)": 0.037822},
-        {"Pressure (MPa)": 1.1, "Density (mol/l)": 26.445, "Volume (l/mol)": 0.037814},
-        {"Pressure (MPa)": 1.2, "Density (mol/l)": 26.451, "Volume (l/mol)": 0.037806},
-        {"Pressure (MPa)": 1.3, "Density (mol/l)": 26.457, "Volume (l/mol)": 0.037798},
-        {"Pressure (MPa)": 1.4, "Density (mol/l)": 26.462, "Volume (l/mol)": 0.03779},
-        {"Pressure (MPa)": 1.5, "Density (mol/l)": 26.468, "Volume (l/mol)": 0.037781}
-    ]
-}
@@ -19,7 +19,8 @@ class Propulsion():
         self.total_engine_mass = self.engine.mass_sea * self.engine_number
 
         # calculate mass, volume
-        mass_ox, mass_fuel, volume_ox, volume_fuel = get_propellant_mass_volume(thrust, burn_time, self.of_ratio,t_fuel,t_ox,p_ox,p_fuel)
+        mass_ox, mass_fuel, volume_ox, volume_fuel = get_propellant_mass_volume(thrust, burn_time, self.of_ratio,t_fuel,t_ox,p_ox,p_fuel,
+                                                                                engine=self.engine)
 
         # propellant volume
         self.volume_ox = volume_ox
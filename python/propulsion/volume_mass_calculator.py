@@ -1,6 +1,9 @@
+import numpy as np
+
 from python.propulsion.inputs import engine as engine
 from python.propulsion.inputs import first_stage as first_stage
 from python.propulsion.inputs import Propellant
+from python.propulsion.density import get_density_array
 
 # determines propellant mass flow rate
 def calculate_mass_flow_rate(thrust, Isp):
@@ -10,34 +13,38 @@ def calculate_mass_flow_rate(thrust, Isp):
   #print("mass flow",mass_flow)
   return mass_flow
 
-# determine oxidiser and fuel mass and volume
-def get_propellant_mass_volume(thrust, burn_time, of_ratio,t_fuel,t_ox,p_ox,p_fuel):
+# determine oxidiser and fuel mass and volume for arrays of inputs (all inputs are broadcast against each other, e.g. a
+# sweep over thrust and O/F ratio), in one vectorized pass
+def get_propellant_mass_volume_array(thrust, burn_time, of_ratio, t_fuel, t_ox, p_ox, p_fuel, engine=engine):
   # INPUTS
-  g0 = 9.80665  # sea level gravitational parameter
-  propellant = Propellant(t_ox,t_fuel,p_ox,p_fuel)
-
+  of_ratio = np.asarray(of_ratio, dtype=float)
 
-  Isp = engine.get_Isp(of_ratio)  # specific impulse
-  density_ox = propellant.density_ox  # oxidiser density for input Temperature and Pressure (calculated using thermodynamic NIST database)
-  density_fuel = propellant.density_fuel  # fuel density for input Temperature and Pressure (calculated using thermodynamic NIST database)
+  Isp = engine.get_Isp(of_ratio)  # specific impulse of the engine that is actually used
+  # oxidiser and fuel density for input Temperature and Pressure (calculated using thermodynamic NIST database)
+  density_ox = get_density_array("lox", t_ox, p_ox, Propellant.M_ox * 1000)
+  density_fuel = get_density_array("methane", t_fuel, p_fuel, Propellant.M_fuel * 1000)
 
   # mass flow rate
-  mass_flow = calculate_mass_flow_rate(thrust, Isp)
+  mass_flow = calculate_mass_flow_rate(np.asarray(thrust, dtype=float), Isp)
 
   # mass calculations
-  mass_total = mass_flow * burn_time
+  mass_total = mass_flow * np.asarray(burn_time, dtype=float)
   mass_ox = of_ratio / (1+of_ratio) * mass_total
   mass_fuel = 1 / (1+of_ratio) * mass_total
 
   # volume calculations
   volume_ox = mass_ox / density_ox
   volume_fuel = mass_fuel / density_fuel
-  volume_total = volume_ox + volume_fuel
 
-  # density calculations
-  density_ox = density_ox
-  density_fuel = density_fuel
-  density_total = mass_total/volume_total
+  return np.broadcast_arrays(mass_ox, mass_fuel, volume_ox, volume_fuel)
+
+# determine oxidiser and fuel mass and volume
+def get_propellant_mass_volume(thrust, burn_time, of_ratio,t_fuel,t_ox,p_ox,p_fuel, engine=engine):
+  mass_ox, mass_fuel, volume_ox, volume_fuel = get_propellant_mass_volume_array(thrust, burn_time, of_ratio, t_fuel,
+                                                                                t_ox, p_ox, p_fuel, engine)
+  # floats for scalar inputs
+  if mass_ox.ndim == 0:
+    return float(mass_ox), float(mass_fuel), float(volume_ox), float(volume_fuel)
 
   # return what is required for the Propulsion() class
   return mass_ox, mass_fuel, volume_ox, volume_fuel
@@ -58,6 +58,10 @@ class CBT:
       self._cylinder_aft = Cylinder(self.outer_radius, self.material, self.pressure, self.thrust, cylinder_height_aft)
 
     
+  @property
+  def components(self):
+      return [self._dome_fwd, self._cylinder_fwd, self._dome_mid, self._cylinder_aft, self._dome_aft]
+
   @property
   def mass(self)-> float:
       return (self._dome_fwd.mass + self._dome_aft.mass + self._dome_mid.mass  +
@@ -6,9 +6,37 @@ from python.structure.materials import materials as m
 from python.structure.geometry import cylindrical_shell_I
 from python.structure.Loading.axial_stress import s_axial
 from python.structure.constants import FOS_ITS
+from python.structure.Components.sized_component import SizedComponent, first_passing
 import numpy as np
 
-class Shell:
+
+def _shell_thicknesses():
+    # Plate thicknesses of the isogrid shell from 2 mm in 0.5 mm increments up to 25 mm (accumulated as the original
+    # stepping search did)
+    t, thicknesses = 0.002, []
+    while t <= 0.025:
+        thicknesses.append(t)
+        t += 0.0005
+    return np.array(thicknesses)
+
+
+SHELL_THICKNESSES = _shell_thicknesses()
+
+
+class ShellSizing:
+    def __init__(self, thickness: float, feasible: bool):
+        """
+        Result of the isogrid shell sizing.
+        :param thickness: equivalent (mass) thickness in m, NaN if infeasible
+        :param feasible: False if no plate thickness in SHELL_THICKNESSES carries the loads
+        """
+        self.thickness = thickness
+        self.feasible = feasible
+
+
+class Shell(SizedComponent):
+    sizing_inputs = ('outer_radius', 'material', 'height', 'thrust')
+
     def __init__(self,
                  outer_radius: float,
                  material: dict,
@@ -28,29 +56,43 @@ class Shell:
         self.height = height
         self.thrust = thrust
 
-        
+
 
     @property
-    def mass(self):
-      
-        s_crit=0   #Initial Critical Buckling Stress
-        t=0.002   #Inital Shell thickness - 
-        s_max = 1
-        while s_crit / s_max < FOS_ITS:
+    def feasible(self) -> bool:
+        return self.sizing.feasible
 
-            if t>0.025:
+    @property
+    def thickness(self) -> float:
+        return self.sizing.thickness
 
-                raise ValueError #Check for excessive thickness of the ITS
-            
-            s_crit, t_mass = critical_stress(t, self.outer_radius, self.material['youngs_modulus'])
+    @property
+    def mass(self):
+        #NaN if the shell is infeasible
+        return 2 * self.outer_radius * np.pi * self.height * self.sizing.thickness * self.material['density']
 
-            I = cylindrical_shell_I(self.outer_radius, t_mass) 
+    def _stress_ratio(self, t):
+        """
+        Ratio of the critical buckling stress to the maximal stress of the isogrid shell.
+        :param t: plate thickness in m
+        :return: stress ratio, equivalent (mass) thickness in m
+        """
+        s_crit, t_mass = critical_stress(t, self.outer_radius, self.material['youngs_modulus'])
 
-            #NOTE: Moment magnitude is assumed to be 2/3 of the thrust magnitude; If better modelling is available, change of this value is recommneded; 
-            s_max = (s_axial(t_mass, self.outer_radius,1.0,self.thrust) + self.thrust*(2/3) * self.outer_radius / I)
+        I = cylindrical_shell_I(self.outer_radius, t_mass)
 
-            t += 0.0005
-        
-        return 2 * self.outer_radius * np.pi * self.height * t_mass * self.material['density']
+        #NOTE: Moment magnitude is assumed to be 2/3 of the thrust magnitude; If better modelling is available, change of this value is recommneded;
+        s_max = (s_axial(t_mass, self.outer_radius,1.0,self.thrust) + self.thrust*(2/3) * self.outer_radius / I)
+        return s_crit / s_max, t_mass
 
-  
\ No newline at end of file
+    def _size(self) -> ShellSizing:
+        """
+        Sizes the isogrid shell for the thinnest plate in SHELL_THICKNESSES with a stress ratio of at least FOS_ITS, by
+        bisection (the ratio grows with the thickness).
+        :return: ShellSizing, infeasible if even the thickest plate does not suffice
+        """
+        i = first_passing(lambda i: not self._stress_ratio(SHELL_THICKNESSES[i])[0] < FOS_ITS, 0,
+                          len(SHELL_THICKNESSES) - 1)
+        if i is None:
+            return ShellSizing(np.nan, False)
+        return ShellSizing(self._stress_ratio(SHELL_THICKNESSES[i])[1], True)
@@ -48,6 +48,10 @@ class Tank:
     @property
     def cylinder(self):
         return self._cylinder
+
+    @property
+    def components(self):
+        return [self._dome_fwd, self._cylinder, self._dome_aft]
             
     @property
     def mass(self) -> float:
@@ -2,23 +2,59 @@
 Code for creating cylinder object.
 """
 import python.structure.geometry as geometry
+from python.structure.Components.sized_component import SizedComponent, first_passing
 from python.structure.Loading import buckling, pressure_loading, bending, axial_stress
 from python.structure.constants import FOSY, Mi
 import numpy as np
 
-class Cylinder:
+# Search of the cylinder thickness on the 0.5 mm manufacturing grid: "vector" checks blocks of candidate thicknesses in
+# one call of the (array) allowables, "bisection" brackets and bisects every buckling and bending constraint (they keep
+# holding once they hold, as the allowables grow with the thickness), "step" is the original search that adds 0.5 mm
+# until the constraint holds. All return the same thickness, bisection needs O(log n) instead of n evaluations of the
+# allowables and the vector search mostly a single one per constraint.
+THICKNESS_SOLVERS = ("vector", "bisection", "step")
+THICKNESS_STEP = 0.0005 # m
+THICKNESS_CANDIDATES = 32 # number of candidate thicknesses of the first block of the vector search
+MAX_THICKNESS_BENDING = 0.02 # m, the bending check raises a ValueError beyond this thickness
+
+
+def _first_passing_vector(passes, start, stop=None):
+    """
+    Finds the smallest number of grid steps n >= start for which a constraint holds, like first_passing, by checking
+    blocks of candidates (THICKNESS_CANDIDATES, then doubling) in one call each. Unlike the bisection it does not rely
+    on the constraint to keep holding.
+    :param passes: function of an array of numbers of steps, boolean array True where the constraint holds
+    :param start: number of steps to start from
+    :param stop: optional maximum number of steps
+    :return: number of steps, None if the constraint does not hold up to stop
+    """
+    size = THICKNESS_CANDIDATES
+    while stop is None or start <= stop:
+        candidates = np.arange(start, start + size if stop is None else min(start + size, stop + 1))
+        holds = passes(candidates)
+        if holds.any():
+            return int(candidates[holds.argmax()])
+        start, size = start + size, 2 * size
+    return None
+
+
+class Cylinder(SizedComponent):
+    sizing_inputs = ('outer_radius', 'material', 'pressure', 'thrust', 'height', 'solver')
+
     def __init__(self,
                  outer_radius: float,
                  material: dict,
                  pressure: float,
                  thrust: float,
-                 height:float):
+                 height:float,
+                 solver: str = "vector"):
         """
-        Cylinder object, containing all relevant parameters. 
+        Cylinder object, containing all relevant parameters.
         :param outer_radius: in m
         :param pressure: in Pa
         :param thrust: in N
         :param material: dictionary object from materials database
+        :param solver: thickness search, one of THICKNESS_SOLVERS
         """
 
         self.outer_radius = outer_radius
@@ -26,12 +62,14 @@ class Cylinder:
         self.material = material
         self.height = height
         self.thrust = thrust
-    
-        
+        assert solver in THICKNESS_SOLVERS, f"Unknown solver {solver}, choose from {THICKNESS_SOLVERS}"
+        self.solver = solver
+
+
+
 
 
 
-    
     @property
     def section_Ixx(self) -> float:
         return geometry.cylindrical_shell_I(self.outer_radius, self.thickness)
@@ -39,10 +77,13 @@ class Cylinder:
 
     @property
     def thickness(self) -> float:
+        return self.sizing
+
+    def _size(self) -> float:
 
         #NOTE: Assumption thin walled, hoop stress >> longitudinal stress; Yielding is not acceptable during operations; Torsion effect is negligable comapred to bending and axial force;
 
-        #Calculate Hoop Stress Thickness: 
+        #Calculate Hoop Stress Thickness:
         t_p= pressure_loading.t_hoop_stress(self.material['yield_stress'], self.outer_radius, FOSY, self.pressure)
         # Calculate Axial Stress Thickness:
         t_a = axial_stress.t_axial(self.material['yield_stress'], self.outer_radius, FOSY, self.thrust)
@@ -52,40 +93,99 @@ class Cylinder:
         else:
             t=t_p
 
+        if self.solver == "step":
+            return self._thickness_step(t)
+        if self.solver == "bisection":
+            return self._thickness_bisection(t)
+        return self._thickness_vector(t)
+
+    def _buckling(self, pressure: float, t: float) -> float:
+        return buckling.critical_cylinder_buckling(pressure, self.outer_radius, t, self.height, self.material['youngs_modulus'],self.material['poisson_ratio'])
+
+    def _bending(self, t: float) -> float:
+        return bending.critical_cylinder_bending(self.outer_radius, t, self.pressure, self.material['youngs_modulus'],self.material['poisson_ratio'])
+
+    def _thickness_vector(self, t_0: float) -> float:
+        """
+        Smallest thickness on the grid t_0 + n * THICKNESS_STEP that meets the buckling and bending constraints in turn,
+        checking blocks of candidate thicknesses at once, the same thickness as _thickness_step.
+        """
+        grid = lambda n: t_0 + n * THICKNESS_STEP
+
+        #Unpressurized buckling condition check for the starting thickness. Factor 1.5 - lowest possible T/W
+        n = _first_passing_vector(lambda n: ~(self._buckling(np.where(n > 0, self.pressure, 0), grid(n))/FOSY < self.thrust/1.5), 0)
+
+        #Pressuirzed buckling condition check
+        n = _first_passing_vector(lambda n: ~(self._buckling(self.pressure, grid(n))/self.thrust < FOSY), n)
+
+        #Buckling due to bending moment
+        n = _first_passing_vector(lambda n: ~(self._bending(grid(n)) / (self.thrust / 2) < FOSY), n, max(self._bending_steps(t_0), n))
+        if n is None:
+            raise ValueError
+        return round(grid(n), 4)
+
+    def _bending_steps(self, t_0: float) -> int:
+        #Number of steps to the first grid thickness beyond MAX_THICKNESS_BENDING, the last one the bending check checks
+        grid = lambda n: t_0 + n * THICKNESS_STEP
+        n_max = max(int((MAX_THICKNESS_BENDING - t_0) // THICKNESS_STEP), 0)
+        while grid(n_max) <= MAX_THICKNESS_BENDING:
+            n_max += 1
+        while n_max > 0 and grid(n_max - 1) > MAX_THICKNESS_BENDING:
+            n_max -= 1
+        return n_max
+
+    def _thickness_bisection(self, t_0: float) -> float:
+        """
+        Smallest thickness on the grid t_0 + n * THICKNESS_STEP that meets the buckling and bending constraints in turn,
+        the same thickness as _thickness_step.
+        """
+        grid = lambda n: t_0 + n * THICKNESS_STEP
+
+        #Unpressurized buckling condition check, as in the stepping search only the starting thickness is checked
+        #unpressurized. Factor 1.5 - lowest possible T/W
+        n = first_passing(lambda n: not self._buckling(self.pressure if n else 0, grid(n))/FOSY < self.thrust/1.5, 0)
+
+        #Pressuirzed buckling condition check
+        n = first_passing(lambda n: not self._buckling(self.pressure, grid(n))/self.thrust < FOSY, n)
+
+        #Buckling due to bending moment
+        n = first_passing(lambda n: not self._bending(grid(n)) / (self.thrust / 2) < FOSY, n, max(self._bending_steps(t_0), n))
+        if n is None:
+            raise ValueError
+        return round(grid(n), 4)
+
+    def _thickness_step(self, t: float) -> float:
+
         #Unpressurized buckling condition check
-        N_buckling_stat = buckling.critical_cylinder_buckling(0, self.outer_radius,  t, self.height, self.material['youngs_modulus'],self.material['poisson_ratio'])
+        N_buckling_stat = self._buckling(0, t)
 
-        #Factor 1.5 - lowest possible T/W 
+        #Factor 1.5 - lowest possible T/W
         while N_buckling_stat/FOSY < self.thrust/1.5:
-            t+=0.0005
-            N_buckling_stat = buckling.critical_cylinder_buckling(self.pressure, self.outer_radius,t, self.height, self.material['youngs_modulus'],self.material['poisson_ratio'])
+            t+=THICKNESS_STEP
+            N_buckling_stat = self._buckling(self.pressure, t)
 
         #Pressuirzed buckling condition check
-        N_buckling = buckling.critical_cylinder_buckling(self.pressure, self.outer_radius,
-                                                         t, self.height, self.material['youngs_modulus'],self.material['poisson_ratio'])
-                                                 
-    
+        N_buckling = self._buckling(self.pressure, t)
+
         while N_buckling/self.thrust < FOSY :
-            t+=0.0005
-            N_buckling = buckling.critical_cylinder_buckling(self.pressure, self.outer_radius,t, self.height, self.material['youngs_modulus'],self.material['poisson_ratio'])
-    
+            t+=THICKNESS_STEP
+            N_buckling = self._buckling(self.pressure, t)
 
         #Buckling due to bending moment
-        M_buckling = bending.critical_cylinder_bending(self.outer_radius, t, self.pressure, self.material['youngs_modulus'],self.material['poisson_ratio'])
-     
-        #NOTE: Moment magnitude is assumed to be half of the thrust magnitude; If better modelling is available, change of this value is recommneded; 
+        M_buckling = self._bending(t)
+
+        #NOTE: Moment magnitude is assumed to be half of the thrust magnitude; If better modelling is available, change of this value is recommneded;
         while M_buckling / (self.thrust / 2) < FOSY:
-            if t>0.02:
+            if t>MAX_THICKNESS_BENDING:
                 raise ValueError
-            t += 0.0005
-            M_buckling = bending.critical_cylinder_bending(self.outer_radius, t 
-            ,self.pressure, self.material['youngs_modulus'],self.material['poisson_ratio'])
+            t += THICKNESS_STEP
+            M_buckling = self._bending(t)
         return round(t, 4)
-    
+
     @property
     def area(self)->float:
         return self.height * 2 * np.pi * self.outer_radius
-    
+
     @property
     def inner_volume(self) -> float:
         return geometry.cylinder_V(self.outer_radius-self.thickness, self.height)
@@ -106,9 +206,9 @@ class Cylinder:
     @property
     def sectional_area(self) -> float:
         return geometry.cylindrical_shell_A(self.outer_radius, self.thickness)
-    
+
     @property
     def insulation(self)->float:
         return self.area*Mi
-    
-   
\ No newline at end of file
+
+
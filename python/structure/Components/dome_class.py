@@ -3,9 +3,12 @@ Code for creating dome object.
 '''
 import python.structure.geometry as geometry
 import python.structure.Loading.ellipse_stress as es
+from python.structure.Components.sized_component import SizedComponent
 import numpy as np
 
-class Dome:
+class Dome(SizedComponent):
+    sizing_inputs = ('outer_radius', 'pressure', 'material')
+
     def __init__(self,
                  outer_radius: float,
                  pressure: float,
@@ -32,6 +35,9 @@ class Dome:
    
     @property
     def thickness(self) -> float:
+         return self.sizing
+
+    def _size(self) -> float:
          t = es.t_ellipsoid(self.outer_radius, self.height, self.pressure, self.material['yield_stress'])
          return round(t, 4)
          
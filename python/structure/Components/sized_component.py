@@ -0,0 +1,71 @@
+"""
+Base class for structural components with a cached sizing, and the search of the thickness grids they are sized on.
+"""
+
+
+class SizedComponent:
+    """
+    Structural component that sizes itself (thickness search) once, on first use of the sizing, and keeps the result
+    until one of its sizing_inputs is set again. The material dictionaries are not copied, changing a value inside one
+    (rather than setting the material) does not drop the sizing of the components built with it.
+    """
+
+    # Attributes the sizing depends on
+    sizing_inputs = ()
+
+    # Number of sizing evaluations of the component
+    evaluations = 0
+
+    def __setattr__(self, name, value):
+        if name in self.sizing_inputs:
+            self.__dict__.pop('_sizing', None)
+        object.__setattr__(self, name, value)
+
+    def _size(self):
+        """
+        Sizes the component.
+        :return: sizing result, cached in sizing
+        """
+        raise NotImplementedError
+
+    @property
+    def sizing(self):
+        if '_sizing' not in self.__dict__:
+            self.evaluations += 1
+            self._sizing = self._size()
+        return self._sizing
+
+
+def first_passing(passes, start, stop=None):
+    """
+    Finds the smallest number of grid steps n >= start for which a constraint holds, given it keeps holding for more
+    steps. The bracket is found by doubling the number of steps from start (up to stop), then bisected.
+    :param passes: function of the number of steps, True if the constraint holds
+    :param start: number of steps to start from
+    :param stop: optional maximum number of steps
+    :return: number of steps, None if the constraint does not hold up to stop
+    """
+    if passes(start):
+        return start
+    if stop is not None and start >= stop:
+        return None
+
+    low, width = start, 1
+    while True:
+        high = low + width
+        if stop is not None and high >= stop:
+            high = stop
+            if not passes(high):
+                return None
+            break
+        if passes(high):
+            break
+        low, width = high, 2 * width
+
+    while high - low > 1:
+        middle = (low + high) // 2
+        if passes(middle):
+            high = middle
+        else:
+            low = middle
+    return high
@@ -11,6 +11,7 @@ import numpy as np
 def critical_cylinder_bending(r, t ,p, E, v):
     """
     Shell bending formula from NASA SP-8007
+    All parameters can be numpy arrays (broadcast against each other).
     :param p: pressure in Pa
     :param E: young's modulus in Pa
     :param r: radius in m
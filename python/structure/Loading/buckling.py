@@ -9,7 +9,7 @@ import numpy as np
 
 
 
-def _check_moderately_long(gamma: float, l: float, r: float, t: float, v: float) -> bool:
+def _check_moderately_long(gamma, l, r, t, v):
     """
     Checks if a cylinder is moderately long
     :param gamma: Knock-down factor
@@ -17,22 +17,20 @@ def _check_moderately_long(gamma: float, l: float, r: float, t: float, v: float)
     :param r: Radius
     :param t: Thickness
     :param v: Poisson's ratio
-    :return: Boolean True if moderately long, False if not
+    :return: Boolean (array) True if moderately long, False if not
     """
     # Curvature Parameter
     Z = l ** 2 / (r * t) * np.sqrt(1 - v ** 2)
 
     # Condition on moderately long tanks
-    if (gamma * Z) > np.sqrt(3) * np.pi ** 2 / 6:
-        return True
-    else:
-        return False
+    return (gamma * Z) > np.sqrt(3) * np.pi ** 2 / 6
 
 
 def critical_cylinder_buckling(p, r, t, l, E, v):
     """
     Shell buckling formula from NASA SP-8007.
     Sechler formulas from LV manual are less precise.
+    All parameters can be numpy arrays (broadcast against each other), the branches are evaluated element wise.
     :param p: pressure
     :param E: young's modulus
     :param r: radius
@@ -61,22 +59,18 @@ def critical_cylinder_buckling(p, r, t, l, E, v):
     beta = n * l / (np.pi * r * m)
 
     # Condition on long tanks
-    if _check_moderately_long(gamma, l, r, t, v):
-
-        k_x = 4 * np.sqrt(3) / np.pi ** 2 * gamma * Z
-
-    else:
-
-        k_x = m ** 2 * (1 + beta ** 2) ** 2 + 12 / np.pi ** 4 * (gamma * Z) ** 2 / (m ** 2 * (1 + beta ** 2) ** 2)
+    k_x = np.where(_check_moderately_long(gamma, l, r, t, v),
+                   4 * np.sqrt(3) / np.pi ** 2 * gamma * Z,
+                   m ** 2 * (1 + beta ** 2) ** 2 + 12 / np.pi ** 4 * (gamma * Z) ** 2 / (m ** 2 * (1 + beta ** 2) ** 2))
 
     # Checks if it's pressurized
-    if p == 0:
-        N_cr = k_x * np.pi ** 2 / l ** 2 * D
-    else:
-        parameter = p / E * (r / t) ** 2
-        dgamma = gamma_d(parameter)
-        N_cr= 2 * np.pi * E * t ** 2 * (gamma / np.sqrt(3 * (1 - v ** 2)) + dgamma) + p * np.pi * r**2
-
-    return N_cr
+    parameter = p / E * (r / t) ** 2
+    dgamma = gamma_d(parameter)
+    N_cr = np.where(p == 0,
+                    k_x * np.pi ** 2 / l ** 2 * D,
+                    2 * np.pi * E * t ** 2 * (gamma / np.sqrt(3 * (1 - v ** 2)) + dgamma) + p * np.pi * r**2)
+
+    # Scalar for scalar parameters
+    return N_cr[()]
 
 
@@ -5,7 +5,6 @@ Source: NASA SP-8007
 """
 
 import numpy as np
-from scipy import interpolate
 
 x = np.array([0., 0.017200346, 0.020028706, 0.0222386, 0.025895431, 0.029868032, 0.035786482, 0.039735031, 0.045830756,
               0.05236104, 0.05925531, 0.068345629, 0.078830488,
@@ -22,4 +21,19 @@ y = np.array([0.022335377, 0.024887035, 0.028600646, 0.030898179, 0.034964246, 0
               0.252746159, 0.260679802, 0.264739529,
               0.264739529, 0.268862481, 0.268862481, 0.268862481, 0.264739529, 0.260679802])
 
-gamma_d = interpolate.interp1d(x, y, fill_value='extrapolate')
\ No newline at end of file
+# Slopes of the first and last segment of the curve, outside the data it is extrapolated linearly with them
+_slope_first = (y[1] - y[0]) / (x[1] - x[0])
+_slope_last = (y[-1] - y[-2]) / (x[-1] - x[-2])
+
+
+def gamma_d(parameter):
+    """
+    Returns the knockdown factor correction for the given buckling parameter (float or numpy array), interpolated
+    linearly in the table and extrapolated linearly outside it.
+    """
+    dgamma = np.interp(parameter, x, y)
+    below, above = parameter < x[0], parameter > x[-1]
+    if np.any(below) or np.any(above):
+        dgamma = np.where(below, _slope_first * (parameter - x[0]) + y[0], dgamma)
+        dgamma = np.where(above, _slope_last * (parameter - x[-2]) + y[-2], dgamma)[()]
+    return dgamma
@@ -0,0 +1,237 @@
+'''
+Vectorized sizing of the structural components, for trades over many tanks at once (e.g. diameters and pressures).
+Every function takes numpy arrays (or floats, broadcast against each other) of the inputs of the component classes in
+Components and returns a dictionary of arrays with the same results, using the formulas of Loading in array form.
+Materials are given as indices into MATERIALS (or names of the materials database). Designs the component classes
+raise a ValueError for (thickness limits of the cylinder bending check and of the isogrid shells) are returned with
+feasible False and NaN results instead.
+
+Example (from the repository root):
+    from python.structure.batch import size_tanks
+    tanks = size_tanks(np.linspace(2, 3, 100), 3e5, 7e6, 300, 3e5, "2195")
+'''
+
+import numpy as np
+
+from python.structure import geometry
+from python.structure.Components.cylinder_class import THICKNESS_STEP, MAX_THICKNESS_BENDING
+from python.structure.Components.ITS_class import SHELL_THICKNESSES
+from python.structure.Loading import axial_stress, bending, buckling, ellipse_stress, pressure_loading
+from python.structure.Loading.isogrid_stress import critical_stress
+from python.structure.constants import FOSY, FOS_ITS, Km, Ku, Mi, g_0
+from python.structure.materials import materials
+
+MATERIALS = tuple(materials)
+
+
+def material_properties(material):
+    """
+    Returns the properties of materials as arrays.
+    :param material: index into MATERIALS or material name (array)
+    :return: dictionary of arrays of the yield stress, young's modulus, poisson's ratio and density
+    """
+    material = np.asarray(material)
+    if material.dtype.kind in 'US':
+        material = np.vectorize(MATERIALS.index, otypes=[int])(material)
+    return {name: np.array([materials[key][name] for key in MATERIALS], dtype=float)[material]
+            for name in ('yield_stress', 'youngs_modulus', 'poisson_ratio', 'density')}
+
+
+def _first_passing(passes, start, stop=None):
+    # Element wise version of sized_component.first_passing, all elements are bracketed and bisected in lockstep.
+    # Returns the number of steps and whether the constraint holds up to stop.
+    holds = passes(start)
+    low, high = np.where(holds, start - 1, start), start.copy()
+    width = np.ones_like(start)
+    searching = ~holds
+    if stop is not None:
+        stop = np.maximum(stop, start)
+        searching &= start < stop
+
+    while searching.any():
+        trial = np.where(searching, low + width, high)
+        capped = np.zeros(trial.shape, dtype=bool) if stop is None else trial >= stop
+        if stop is not None:
+            trial = np.where(capped, stop, trial)
+        found = searching & passes(trial)
+        high = np.where(found, trial, high)
+        holds |= found
+        searching &= ~found & ~capped
+        low = np.where(searching, trial, low)
+        width = np.where(searching, 2 * width, width)
+
+    bisecting = holds & (high - low > 1)
+    while bisecting.any():
+        middle = np.where(bisecting, (low + high) // 2, high)
+        middle_holds = passes(middle)
+        high = np.where(bisecting & middle_holds, middle, high)
+        low = np.where(bisecting & ~middle_holds, middle, low)
+        bisecting = holds & (high - low > 1)
+    return high, holds
+
+
+def size_domes(outer_radius, pressure, material):
+    """
+    Vectorized Dome sizing.
+    :param outer_radius: in m
+    :param pressure: in Pa
+    :param material: index into MATERIALS or material name
+    :return: dictionary of arrays of thickness, height, inner and outer volume and mass
+    """
+    outer_radius, pressure, material = np.broadcast_arrays(outer_radius, pressure, material)
+    properties = material_properties(material)
+    height = outer_radius * 0.707
+    thickness = np.round(ellipse_stress.t_ellipsoid(outer_radius, height, pressure, properties['yield_stress']), 4)
+    inner_volume = geometry.semi_ellipsoid_V(outer_radius - thickness, height)
+    outer_volume = geometry.semi_ellipsoid_V(outer_radius, height)
+    return {'thickness': thickness, 'height': height, 'inner_volume': inner_volume, 'outer_volume': outer_volume,
+            'mass': (outer_volume - inner_volume) * properties['density']}
+
+
+def size_cylinders(outer_radius, pressure, thrust, height, material):
+    """
+    Vectorized Cylinder sizing (the bisection thickness search on the 0.5 mm grid).
+    :param outer_radius: in m
+    :param pressure: in Pa
+    :param thrust: in N
+    :param height: in m
+    :param material: index into MATERIALS or material name
+    :return: dictionary of arrays of thickness, mass, insulation mass, first moment of the mass (including the 1.08
+        factor the Structure cg applies) about the aft end and whether the cylinder is feasible
+    """
+    r, p, thrust, l, material = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in
+                                                      (outer_radius, pressure, thrust, height)), material)
+    properties = material_properties(material)
+    E, v = properties['youngs_modulus'], properties['poisson_ratio']
+
+    t_0 = np.maximum(axial_stress.t_axial(properties['yield_stress'], r, FOSY, thrust),
+                     pressure_loading.t_hoop_stress(properties['yield_stress'], r, FOSY, p))
+    grid = lambda n: t_0 + n * THICKNESS_STEP
+
+    # Unpressurized buckling for the starting thickness only, see Cylinder._thickness_bisection
+    n, _ = _first_passing(lambda n: ~(buckling.critical_cylinder_buckling(np.where(n > 0, p, 0), r, grid(n), l, E, v)
+                                      / FOSY < thrust / 1.5), np.zeros(r.shape, dtype=int))
+    n, _ = _first_passing(lambda n: ~(buckling.critical_cylinder_buckling(p, r, grid(n), l, E, v) / thrust < FOSY), n)
+
+    # First grid thickness beyond MAX_THICKNESS_BENDING
+    n_max = np.maximum(((MAX_THICKNESS_BENDING - t_0) // THICKNESS_STEP).astype(int), 0)
+    while (grid(n_max) <= MAX_THICKNESS_BENDING).any():
+        n_max += grid(n_max) <= MAX_THICKNESS_BENDING
+    while ((n_max > 0) & (grid(n_max - 1) > MAX_THICKNESS_BENDING)).any():
+        n_max -= (n_max > 0) & (grid(n_max - 1) > MAX_THICKNESS_BENDING)
+    n, feasible = _first_passing(lambda n: ~(bending.critical_cylinder_bending(r, grid(n), p, E, v) / (thrust / 2)
+                                             < FOSY), n, n_max)
+
+    thickness = np.where(feasible, np.round(grid(n), 4), np.nan)
+    mass = properties['density'] * (geometry.cylinder_V(r, l) - geometry.cylinder_V(r - thickness, l))
+    return {'thickness': thickness, 'mass': mass, 'insulation': l * 2 * np.pi * r * Mi,
+            'moment': 1.08 * mass * 0.5 * l, 'feasible': feasible}
+
+
+def size_shells(outer_radius, height, thrust, material):
+    """
+    Vectorized Shell (isogrid inter tank structure and engine bay) sizing.
+    :param outer_radius: in m
+    :param height: in m
+    :param thrust: in N
+    :param material: index into MATERIALS or material name
+    :return: dictionary of arrays of equivalent thickness, mass, first moment of the mass about the aft end and whether
+        the shell is feasible
+    """
+    r, height, thrust, material = np.broadcast_arrays(outer_radius, height, thrust, material)
+    properties = material_properties(material)
+
+    # All plate thicknesses at once, one column per thickness
+    r_, thrust_ = r[..., None], thrust[..., None]
+    s_crit, t_mass = critical_stress(SHELL_THICKNESSES, r_, properties['youngs_modulus'][..., None])
+    t_mass = np.broadcast_to(t_mass, s_crit.shape)
+    I = geometry.cylindrical_shell_I(r_, t_mass)
+    s_max = axial_stress.s_axial(t_mass, r_, 1.0, thrust_) + thrust_ * (2/3) * r_ / I
+    holds = ~(s_crit / s_max < FOS_ITS)
+
+    feasible = holds.any(axis=-1)
+    t_mass = np.where(feasible, np.take_along_axis(t_mass, holds.argmax(axis=-1)[..., None], axis=-1)[..., 0], np.nan)
+    mass = 2 * r * np.pi * height * t_mass * properties['density']
+    return {'thickness': t_mass, 'mass': mass, 'moment': mass * 0.5 * height, 'feasible': feasible}
+
+
+def size_tanks(outer_radius, pressure, thrust, volume, mass_p, material):
+    """
+    Vectorized Tank sizing.
+    :param outer_radius: in m
+    :param pressure: in Pa
+    :param thrust: in N
+    :param volume: propellant volume in m^3
+    :param mass_p: propellant mass in kg
+    :param material: index into MATERIALS or material name
+    :return: dictionary of arrays of the dome and cylinder thicknesses, cylinder height, tank height and mass, the
+        first moment (as summed by Structure.cg) of the domes and cylinder about the aft end of the cylinder, the mass it
+        is summed with (moment_mass, the moment about a point z below the cylinder is moment + z * moment_mass) and
+        whether the tank is feasible
+    """
+    r, p, thrust, volume, mass_p, material = np.broadcast_arrays(outer_radius, pressure, thrust, volume, mass_p,
+                                                                 material)
+    area = np.pi * r**2
+    dome_fwd = size_domes(r, p, material)
+    dome_aft = size_domes(r, p + mass_p * g_0 * 2.0 / area, material)
+    cylinder_height = np.round((volume * Ku - dome_fwd['inner_volume'] - dome_aft['inner_volume']) / area, 3)
+    cylinder = size_cylinders(r, p, thrust, cylinder_height, material)
+
+    h_dome = dome_fwd['height']
+    return {'dome_fwd_thickness': dome_fwd['thickness'], 'dome_aft_thickness': dome_aft['thickness'],
+            'cylinder_thickness': cylinder['thickness'], 'cylinder_height': cylinder_height,
+            'height': cylinder_height + dome_fwd['height'] + dome_aft['height'],
+            'mass': (dome_fwd['mass'] + Mi * 4 * np.pi * r**2 + dome_aft['mass'] + cylinder['mass'] +
+                     cylinder['insulation']) * Km,
+            'moment': (dome_aft['mass'] * -0.67 * h_dome + cylinder['moment'] +
+                       dome_fwd['mass'] * (cylinder_height + 0.23 * h_dome)),
+            'moment_mass': dome_aft['mass'] + 1.08 * cylinder['mass'] + dome_fwd['mass'],
+            'feasible': cylinder['feasible']}
+
+
+def size_common_bulkhead_tanks(outer_radius, pressure, thrust, volume_ox, mass_ox, volume_f, mass_f, material):
+    """
+    Vectorized CBT (common bulkhead tank) sizing.
+    :param outer_radius: in m
+    :param pressure: in Pa
+    :param thrust: in N
+    :param volume_ox: in m^3
+    :param mass_ox: in kg
+    :param volume_f: in m^3
+    :param mass_f: in kg
+    :param material: index into MATERIALS or material name
+    :return: dictionary of arrays as size_tanks, with the thicknesses of the mid dome and of the forward and aft
+        cylinder
+    """
+    r, p, thrust, volume_ox, mass_ox, volume_f, mass_f, material = np.broadcast_arrays(
+        outer_radius, pressure, thrust, volume_ox, mass_ox, volume_f, mass_f, material)
+    area = np.pi * r**2
+
+    #NOTE:Assumption - heavier tank is on the bottom for ladning stability purposes.
+    ox_aft = mass_ox > mass_f
+    mass_fwd, mass_aft = np.where(ox_aft, mass_f, mass_ox), np.where(ox_aft, mass_ox, mass_f)
+    volume_fwd, volume_aft = np.where(ox_aft, volume_f, volume_ox), np.where(ox_aft, volume_ox, volume_f)
+
+    dome_fwd = size_domes(r, p, material)
+    # The factor 2.0 of the mid dome pressure is only applied with the oxidizer tank aft, as in CBT
+    dome_mid = size_domes(r, (p + mass_fwd * g_0 * 2.0 / area) * np.where(ox_aft, 2.0, 1.0), material)
+    dome_aft = size_domes(r, p + mass_aft * g_0 * 2.0 / area, material)
+    height_fwd = np.round((volume_fwd * Ku - dome_fwd['inner_volume'] - dome_mid['inner_volume']) / area, 3)
+    height_aft = np.round((volume_aft * Ku - dome_aft['inner_volume'] + dome_mid['outer_volume']) / area, 3)
+    cylinder_fwd = size_cylinders(r, p, thrust, height_fwd, material)
+    cylinder_aft = size_cylinders(r, p, thrust, height_aft, material)
+
+    h_dome = dome_aft['height']
+    return {'dome_fwd_thickness': dome_fwd['thickness'], 'dome_mid_thickness': dome_mid['thickness'],
+            'dome_aft_thickness': dome_aft['thickness'], 'cylinder_fwd_thickness': cylinder_fwd['thickness'],
+            'cylinder_aft_thickness': cylinder_aft['thickness'], 'cylinder_fwd_height': height_fwd,
+            'cylinder_aft_height': height_aft, 'height': height_aft + height_fwd,
+            'mass': (dome_fwd['mass'] + dome_aft['mass'] + dome_mid['mass'] + cylinder_aft['mass'] + cylinder_fwd['mass']
+                     + cylinder_aft['insulation'] + cylinder_fwd['insulation'] + Mi * 4 * np.pi * r**2) * Km,
+            # As in Structure.cg, the 1.08 factor is only applied to the forward cylinder
+            'moment': (dome_aft['mass'] * -0.67 * h_dome + dome_mid['mass'] * (height_aft - 0.67 * h_dome) +
+                       dome_fwd['mass'] * (height_aft + height_fwd + 0.23 * h_dome) +
+                       cylinder_aft['mass'] * 0.5 * height_aft + 1.08 * cylinder_fwd['mass'] * (0.5 * height_fwd + height_aft)),
+            'moment_mass': (dome_aft['mass'] + dome_mid['mass'] + dome_fwd['mass'] + cylinder_aft['mass'] +
+                            1.08 * cylinder_fwd['mass']),
+            'feasible': cylinder_fwd['feasible'] & cylinder_aft['feasible']}
@@ -5,7 +5,6 @@ Contains formulas for general geometric calculations.
 
 import numpy as np
 from numpy.polynomial.polynomial import Polynomial
-from scipy.integrate import trapz
 
 
 # CYLINDER ###########################################################
@@ -10,6 +10,12 @@ from python.structure.Components.landing_gear_class import LG
 from python.structure.constants import Mthruststructure
 
 
+class InfeasibleDesign(ValueError):
+    #Raised for designs without a feasible structure (see Structure.feasible)
+    def __init__(self, message="The inter tank structure or engine bay needs plates thicker than 25 mm"):
+        super().__init__(message)
+
+
 class Structure():
     def __init__(self, outer_radius,material, pressure_ox, pressure_fuel, material3):
         self.outer_radius = outer_radius
@@ -50,6 +56,7 @@ class Structure():
             self._ITS_fwd = Shell(self.outer_radius,self.material3,3+self._tank_fwd.dome_fwd.height,self.thrust)
             self._ITS_aft = Shell(self.outer_radius,self.material3,1+self._tank_aft.dome_fwd.height+self._tank_fwd.dome_aft.height,self.thrust)
             self._EB = Shell(self.outer_radius,self.material3,3+self._tank_aft.dome_aft.height,self.thrust)
+            self._components = self._tank_fwd.components + self._tank_aft.components + [self._ITS_fwd, self._ITS_aft, self._EB]
     
     
         elif type == 'shared':
@@ -57,7 +64,19 @@ class Structure():
             self._CBT = CBT(self.outer_radius, self.pressure1, self.material ,self.thrust, self.volume1, self.mass1, self.volume2, self.mass2)
             self._ITS = Shell(self.outer_radius,self.material,3+self._CBT._dome_fwd.height,self.thrust)
             self._EB = Shell(self.outer_radius,self.material,3+self._CBT._dome_aft.height,self.thrust)
+            self._components = self._CBT.components + [self._ITS, self._EB]
           
+    @property
+    def feasible(self) -> bool:
+        #False if an inter tank structure or the engine bay cannot carry the loads, their masses are NaN then
+        return all(component.feasible for component in self._components if isinstance(component, Shell))
+
+    @property
+    def sizing_evaluations(self) -> int:
+        #Number of sizing evaluations (thickness searches) of the components built by the last calc, every component is
+        #sized once however often its mass, volume or thickness is used
+        return sum(component.evaluations for component in self._components)
+
     @property
     def mass_engine_structure(self):
         return Mthruststructure
@@ -0,0 +1,189 @@
+import json
+import os
+
+import numpy as np
+
+from python.core.serialization import to_json
+from python.trajectory.cache import STATE
+from python.trajectory.history import COLUMNS
+from python.trajectory.trajectory import Trajectory
+
+# Columnar on-disk archives of trajectory histories. An archive is a folder with one raw binary file per history column
+# (optionally stored as float32 to halve the size) and a meta.json file with the setup arguments, the derived scalars and
+# the phase indices. Archives are read through numpy memory maps, so many archived runs can be opened, plotted and
+# analysed without loading their histories into RAM.
+
+META = "meta.json"
+
+# Phase index attributes and the event times they correspond to (first sample at or after the event)
+PHASE_INDICES = {
+    'coasting_start_index': 'burnout_time',
+    'apogee_index': 'apogee_time',
+    'reentry_start_index': 'reentry_burn_start_time',
+    'coasting2_start_index': 'reentry_end_time',
+    'landing_start_index': 'landing_burn_start_time',
+}
+
+
+class ArchiveWriter():
+    def __init__(self, path, dtype=np.float64, columns=COLUMNS, chunk=4096):
+        """
+        This function creates an archive that samples are streamed into. It is a sink for Trajectory.run, e.g.
+
+            with ArchiveWriter(path, dtype=np.float32) as archive:
+                trajectory.run(sink=archive, keep_history=False)
+                archive.finish(trajectory)
+
+        Args:
+            path: Folder of the archive (created if needed, existing columns are overwritten).
+            dtype: Data type the columns are stored as (np.float64 or np.float32).
+            columns: Names of the columns, in sample order.
+            chunk: Number of samples buffered in memory before they are written to disk.
+        """
+
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.columns = tuple(columns)
+        os.makedirs(path, exist_ok=True)
+        self.files = [open(os.path.join(path, name + ".bin"), 'wb') for name in self.columns]
+        self.buffer = np.empty((len(self.columns), chunk))
+        self.buffered = 0
+        self.length = 0
+
+    def __call__(self, sample):
+        self.buffer[:, self.buffered] = sample
+        self.buffered += 1
+        if self.buffered == self.buffer.shape[1]:
+            self.flush()
+
+    def extend(self, columns):
+        """
+        Writes a block of samples at once.
+
+        Args:
+            columns: Sequence with one 1D array per column, in column order, all of the same length.
+        """
+
+        self.flush()
+        for file, values in zip(self.files, columns):
+            np.asarray(values, dtype=self.dtype).tofile(file)
+        self.length += len(columns[0])
+
+    def flush(self):
+        """Writes the buffered samples to disk."""
+        for file, values in zip(self.files, self.buffer[:, :self.buffered]):
+            values.astype(self.dtype).tofile(file)
+            file.flush()
+        self.length += self.buffered
+        self.buffered = 0
+
+    def finish(self, trajectory):
+        """
+        This function writes the metadata of the archive once the trajectory has been simulated.
+
+        Args:
+            trajectory: Trajectory object whose samples were written to the archive.
+        """
+
+        self.flush()
+
+        # Phase indices refer to rows of the archive, which differ from the simulation steps if the samples were
+        # decimated, so they are recomputed from the event times (as stored, to match the rounding of float32 times)
+        times = read_column(self.path, 'times', self.dtype, self.length)
+        indices = {}
+        for name, event in PHASE_INDICES.items():
+            event_time = getattr(trajectory, event)
+            indices[name] = int(np.searchsorted(times, np.asarray(event_time, dtype=self.dtype))) if event_time else 0
+        indices['ascent_start_index'] = 0
+
+        meta = {
+            'columns': self.columns,
+            'dtype': self.dtype.name,
+            'length': self.length,
+            'setup_args': trajectory.setup_args,
+            'state': {name: getattr(trajectory, name) for name in STATE if name not in indices},
+            'indices': indices,
+        }
+        with open(os.path.join(self.path, META), 'w') as file:
+            json.dump(meta, file, indent=4, default=to_json)
+
+    def close(self):
+        self.flush()
+        for file in self.files:
+            file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_archive(trajectory, path, dtype=np.float64):
+    """
+    Archives the history of a trajectory that has been simulated with its history kept in memory.
+
+    Args:
+        trajectory: Simulated Trajectory object.
+        path: Folder of the archive.
+        dtype: Data type the columns are stored as (np.float64 or np.float32).
+    """
+
+    with ArchiveWriter(path, dtype, columns=trajectory.history.columns) as archive:
+        archive.extend([trajectory.history[name] for name in archive.columns])
+        archive.finish(trajectory)
+
+
+def read_column(path, name, dtype, length):
+    # Read-only memory map of one column (numpy cannot map empty files)
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(os.path.join(path, name + ".bin"), dtype=dtype, mode='r', shape=(length,))
+
+
+class ArchiveColumns():
+    def __init__(self, path, columns, dtype, length):
+        """
+        Lazily memory-mapped columns of an archive, used in place of the History of an archived trajectory.
+        """
+
+        self.path = path
+        self.columns = tuple(columns)
+        self.dtype = np.dtype(dtype)
+        self.size = length
+        self._maps = {}
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, name):
+        if name not in self._maps:
+            if name not in self.columns:
+                raise KeyError(name)
+            self._maps[name] = read_column(self.path, name, self.dtype, self.size)
+        return self._maps[name]
+
+    def as_dict(self):
+        """Returns a dictionary of all columns (memory maps), keyed by column name."""
+        return {name: self[name] for name in self.columns}
+
+
+class ArchivedTrajectory(Trajectory):
+    def __init__(self, path):
+        """
+        This function opens an archived trajectory. The history columns (times, pos_zs, ...) are memory maps that are
+        only read from disk when accessed, so setup_plot and analysis code work as on a simulated Trajectory.
+
+        Args:
+            path: Folder of the archive.
+        """
+
+        super().__init__()
+        with open(os.path.join(path, META)) as file:
+            meta = json.load(file)
+
+        self.path = path
+        self.setup_args = meta['setup_args']
+        self.__dict__.update(meta['state'])
+        self.__dict__.update(meta['indices'])
+        self.history = ArchiveColumns(path, meta['columns'], meta['dtype'], meta['length'])
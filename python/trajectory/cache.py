@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from python.core.serialization import to_json
+from python.trajectory.history import History
+
+# Content-addressed on-disk cache for trajectory simulation results. An entry is keyed by a hash of the arguments passed
+# to Trajectory.setup plus a hash of the source code of the trajectory simulator, so changing an input or editing the
+# simulator both lead to a fresh simulation. Entries are stored as uncompressed .npz files (history columns plus a JSON
+# blob with the derived scalars) and evicted least recently used first once the cache grows beyond its size limit.
+
+# Default location, can be overridden with the IDM_TRAJECTORY_CACHE environment variable
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "elysium_idm", "trajectories")
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+# Bump to invalidate all existing entries when the stored format changes
+FORMAT_VERSION = 1
+
+# Scalar results of Trajectory.run that are restored along with the history (everything downstream code and the plots use)
+STATE = (
+    'burntime',
+    'exit_reason',
+    'steps',
+    'counter',
+    'event_times',
+    'pos_x',
+    'pos_z',
+    'velocity_x',
+    'velocity_z',
+    'accel_x',
+    'accel_z',
+    'mass',
+    'kick_time',
+    'reentry_burn_start_time',
+    'landing_burn_start_time',
+    'burnout_time',
+    'apogee_time',
+    'reentry_end_time',
+    'ascent_start_index',
+    'coasting_start_index',
+    'apogee_index',
+    'reentry_start_index',
+    'coasting2_start_index',
+    'landing_start_index',
+)
+
+# Source files whose contents determine the simulation result
+SOURCES = (
+    os.path.join(os.path.dirname(__file__), "trajectory.py"),
+    os.path.join(os.path.dirname(__file__), "history.py"),
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "aerodynamics", "atmosphere.py"),
+)
+
+_code_version = None
+
+
+def code_version():
+    """Returns a hash of the trajectory simulator source code (computed once per process)."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256(str(FORMAT_VERSION).encode())
+        for path in SOURCES:
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+class TrajectoryCache():
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        This function initializes the cache.
+
+        Args:
+            directory: Folder the entries are stored in (default: IDM_TRAJECTORY_CACHE or ~/.cache/elysium_idm).
+            max_bytes: Total size of the entries above which the least recently used ones are evicted.
+        """
+
+        self.directory = directory or os.environ.get("IDM_TRAJECTORY_CACHE", DEFAULT_DIRECTORY)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, setup_args):
+        """
+        Returns the cache key of a simulation.
+
+        Args:
+            setup_args: Dictionary of the arguments passed to Trajectory.setup.
+
+        Returns:
+            Hexadecimal sha256 digest of the arguments and the simulator code version.
+        """
+
+        # Floats are written with repr, which round-trips exactly, so only identical inputs share a key
+        arguments = json.dumps(setup_args, sort_keys=True, default=to_json)
+        return hashlib.sha256((code_version() + arguments).encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def load(self, trajectory):
+        """
+        Restores the results of a previous run of an identically set up trajectory.
+
+        Args:
+            trajectory: Trajectory object on which setup has been called.
+
+        Returns:
+            True if the results were found and restored, False otherwise.
+        """
+
+        path = self.path(self.key(trajectory.setup_args))
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                state = json.loads(str(entry['__state__']))
+                columns = [entry[name] for name in entry.files if name != '__state__']
+                names = [name for name in entry.files if name != '__state__']
+        except (OSError, ValueError, KeyError):
+            # Missing or unreadable (e.g. partially written by a crashed process) entries are simply misses
+            self.misses += 1
+            return False
+
+        trajectory.history = History(len(columns[0]) if columns else 0, columns=names)
+        trajectory.history.extend(columns)
+        trajectory.__dict__.update(state)
+
+        # Mark the entry as recently used (unless another process evicted it since)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return True
+
+    def store(self, trajectory):
+        """
+        Saves the results of a trajectory run and evicts old entries if the cache is too large.
+
+        Args:
+            trajectory: Trajectory object on which setup and run have been called.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(self.key(trajectory.setup_args))
+        state = json.dumps({name: getattr(trajectory, name) for name in STATE}, default=to_json)
+
+        # Write to a temporary file first so that concurrent readers never see a partial entry
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as file:
+            np.savez(file, __state__=np.array(state), **trajectory.history.as_dict())
+        os.replace(temporary, path)
+
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in max_bytes."""
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                # Entries can be evicted by other processes sharing the cache in the meantime
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Removes all entries."""
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    os.remove(os.path.join(self.directory, name))
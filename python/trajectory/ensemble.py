@@ -0,0 +1,298 @@
+import numpy as np
+
+from python.aerodynamics import atmosphere
+from python.trajectory.trajectory import Trajectory, g_0
+
+# Ensemble version of the trajectory simulator. It simulates N rockets that differ only in their setup parameters
+# (kick angle, gravity turn altitude, re-entry burn altitude, stage masses, ...) in lockstep with the same fixed-step
+# Euler scheme as Trajectory. All state is stored in numpy arrays of length N and the flight phase logic is applied with
+# masks, so the Python overhead per step is shared by the whole ensemble. Members are retired as they reach an exit
+# condition; each member gives the same result as a separate Trajectory with the same parameters.
+
+# Setup parameters that may be given per member (scalars are broadcast to the whole ensemble)
+MEMBER_PARAMETERS = (
+    'number_of_engines_ascent',
+    'number_of_engines_landing',
+    'number_of_engines_reentry',
+    'thrust',
+    'I_sp_1',
+    'I_sp_2',
+    'kick_angle',
+    'gamma_change_time',
+    'm_first_stage_total',
+    'm_first_stage_structural_frac',
+    'm_second_stage_propellant',
+    'm_second_stage_payload',
+    'delta_V_landing',
+    'delta_V_reentry',
+    'Cd_ascent',
+    'Cd_descent',
+    'diameter',
+    'reentry_burn_alt',
+    'gravity_turn_alt',
+)
+
+# Phase indices recorded for each member, as in Trajectory
+PHASE_INDICES = ('coasting_start_index', 'apogee_index', 'reentry_start_index', 'coasting2_start_index',
+                 'landing_start_index')
+
+# Per member quantities that change during the simulation
+STATE = ('pos_x', 'pos_z', 'velocity_x', 'velocity_z', 'mass', 'max_pos_z', 'kick_time', 'landing_burn_start_time',
+         'reentry_burn_start_time', 'landing_flag_clear') + PHASE_INDICES
+
+# Per member constants used inside the simulation loop
+CONSTANTS = ('number_of_engines_ascent', 'number_of_engines_landing', 'number_of_engines_reentry', 'thrust',
+             'mass_flowrate', 'kick_angle', 'gamma_change_time', 'm_total', 'm_first_stage_structural',
+             'm_first_stage_propellant', 'm_prop_landing', 'm_prop_reentry', 'Cd_ascent', 'Cd_descent', 'area',
+             'reentry_burn_alt', 'gravity_turn_alt')
+
+
+class EnsembleTrajectory(Trajectory):
+    def get_density(self, h):
+        """Calculates atmospheric density for an array of altitudes.
+
+        Args:
+        h: Altitudes in meters.
+
+        Returns:
+        Atmospheric densities in kg/m^3.
+        """
+        return atmosphere.density_array(h)
+
+    def setup(self, simulation_timestep: float, simulation_time: float, landing_type: str = None, **parameters):
+        """
+        This function initializes the ensemble. It takes the same arguments as Trajectory.setup, but every parameter in
+        MEMBER_PARAMETERS may be an array with one value per ensemble member. The timestep, simulation time and
+        landing type are shared by all members.
+
+        Args:
+            simulation_timestep: Time step for the simulation (seconds).
+            simulation_time: Total simulation time (seconds).
+            landing_type: Optional string specifying the rocket type (default: None).
+            parameters: Remaining Trajectory.setup arguments, scalars or arrays of equal length.
+        """
+
+        missing = set(MEMBER_PARAMETERS) - set(parameters)
+        assert not missing, f"Missing ensemble parameters: {sorted(missing)}"
+        values = np.broadcast_arrays(*[np.asarray(parameters[name], dtype=float) for name in MEMBER_PARAMETERS])
+        p = {name: np.atleast_1d(value).astype(float) for name, value in zip(MEMBER_PARAMETERS, values)}
+        self.size = p['thrust'].size
+
+        self.landing_type = landing_type
+        self.simulation_timestep = simulation_timestep
+        self.simulation_time = simulation_time
+        self.print_rocket_info = False
+
+        # Engine configuration and properties
+        self.number_of_engines_ascent = p['number_of_engines_ascent']
+        self.number_of_engines_landing = p['number_of_engines_landing']
+        self.number_of_engines_reentry = p['number_of_engines_reentry']
+        self.thrust = p['thrust']
+        self.I_sp_1 = p['I_sp_1']
+        self.I_sp_2 = p['I_sp_2']
+        self.mass_flowrate = self.thrust / (g_0 * self.I_sp_1)
+        self.kick_angle = p['kick_angle']
+        self.gamma_change_time = p['gamma_change_time']
+
+        # Stage masses, as in Trajectory.setup
+        if self.landing_type == "Falcon 9":
+            self.m_first_stage_propellant = np.full(self.size, 395_700.0)
+            self.m_first_stage_structural = np.full(self.size, 25_600.0)
+            self.m_first_stage = np.full(self.size, 421_000.0)
+            self.m_second_stage_structural = np.full(self.size, 3.9e3)
+            self.m_second_stage_propellant = np.full(self.size, 92e3)
+            self.landing_burn_alt = 1_000
+        else:
+            self.m_first_stage = p['m_first_stage_total']
+            self.m_first_stage_structural = self.m_first_stage * p['m_first_stage_structural_frac']
+            self.m_second_stage_propellant = p['m_second_stage_propellant']
+            self.m_second_stage_structural = self.get_second_stage_structural_mass(self.m_second_stage_propellant)
+
+        self.m_prop_landing = self.get_propellant(self.I_sp_1, p['delta_V_landing'], 0)
+        self.m_prop_reentry = self.get_propellant(self.I_sp_1, p['delta_V_reentry'], self.m_prop_landing)
+        if self.landing_type != "Falcon 9":
+            self.m_first_stage_propellant = self.m_first_stage - (self.m_first_stage_structural + self.m_prop_landing + self.m_prop_reentry)
+        assert np.all(self.m_first_stage_propellant > 0), "No propellant available for ascent"
+
+        self.m_second_stage_payload = p['m_second_stage_payload']
+        self.burntime = self.m_first_stage_propellant / (self.mass_flowrate * self.number_of_engines_ascent)
+        self.m_second_stage = self.m_second_stage_structural + self.m_second_stage_propellant + self.m_second_stage_payload
+        self.m_total = self.m_first_stage + self.m_second_stage
+
+        # Aerodynamic properties and flight control parameters
+        self.Cd_ascent = p['Cd_ascent']
+        self.Cd_descent = p['Cd_descent']
+        self.area = np.pi * p['diameter'] ** 2 / 4
+        self.reentry_burn_alt = p['reentry_burn_alt']
+        self.gravity_turn_alt = p['gravity_turn_alt']
+
+        # Initial state of every member
+        self.pos_x = np.zeros(self.size)
+        self.pos_z = np.zeros(self.size)
+        self.velocity_x = np.zeros(self.size)
+        self.velocity_z = np.full(self.size, 3.0)
+        self.mass = self.m_total.copy()
+        self.max_pos_z = np.zeros(self.size)
+        self.kick_time = np.zeros(self.size)
+        self.landing_burn_start_time = np.zeros(self.size)
+        self.reentry_burn_start_time = np.zeros(self.size)
+        self.landing_flag_clear = np.ones(self.size, dtype=bool)
+        for name in PHASE_INDICES:
+            setattr(self, name, np.zeros(self.size, dtype=int))
+
+        # Simulation results per member
+        self.exit_reason = np.full(self.size, "time_limit", dtype=object)
+        self.end_time = np.zeros(self.size)
+        self.steps = np.zeros(self.size, dtype=int)
+
+    def iterate(self, t, dt, c, s):
+        """
+        This function performs a single simulation step for all active members (same logic as Trajectory.iterate).
+
+        Args:
+            t: Current simulation time (seconds).
+            dt: Simulation timestep (seconds).
+            c: Dictionary of per member constants of the active members.
+            s: Dictionary of per member state of the active members (updated in place).
+
+        Returns:
+            Boolean array, True for the members that continue the simulation.
+        """
+
+        pos_z, velocity_x, velocity_z = s['pos_z'], s['velocity_x'], s['velocity_z']
+        rho = self.get_density(pos_z)
+        before_apogee = velocity_z >= 0
+        Cd = np.where(before_apogee, c['Cd_ascent'], c['Cd_descent'])
+        drag_force = self.get_drag(rho, velocity_x, velocity_z, c['area'], Cd)
+        gamma = self.get_gamma(velocity_z, velocity_x)
+
+        # Landing logic
+        if self.landing_type == "Falcon 9":
+            landing = ~before_apogee & (pos_z < self.landing_burn_alt)
+        else:
+            impact_time = np.where(pos_z >= 0,
+                                   (np.sqrt(np.maximum(2 * g_0 * pos_z + velocity_z ** 2, 0)) + velocity_z) / g_0,
+                                   2 * velocity_z / g_0)
+            land_accel = c['number_of_engines_landing'] * c['thrust'] / (c['m_first_stage_structural'] + c['m_prop_landing'])
+            deccel_time = -velocity_z / (land_accel - g_0)
+            condition = ~before_apogee & (deccel_time > impact_time) & (pos_z < 10e3)
+            # Trajectory.iterate checks its landing flag with `is False`, which fails for numpy booleans. The burn can
+            # therefore only start on a step following one where the flag was a Python False (before apogee, or a step
+            # where the landing condition held but no burn started). This delays the start by one step and makes the
+            # burn fire every other step; it is mirrored here so that members match Trajectory exactly.
+            landing = condition & s['landing_flag_clear']
+            s['landing_flag_clear'] = before_apogee | (condition & ~landing)
+        reentering = ~before_apogee & (pos_z < c['reentry_burn_alt'])
+
+        # Burn start times
+        s['landing_burn_start_time'] = np.where(landing & (s['landing_burn_start_time'] == 0), t, s['landing_burn_start_time'])
+        s['reentry_burn_start_time'] = np.where(~landing & reentering & (s['reentry_burn_start_time'] == 0), t,
+                                                s['reentry_burn_start_time'])
+
+        # Fuel burned and available for each burn
+        ascent_fuel_burned = np.clip(c['number_of_engines_ascent'] * c['mass_flowrate'] * t, 0, c['m_first_stage_propellant'])
+        landing_fuel_burned = np.clip(c['number_of_engines_landing'] * c['mass_flowrate'] * (t - s['landing_burn_start_time']),
+                                      0, c['m_prop_landing'])
+        reentry_fuel_burned = np.clip(c['number_of_engines_reentry'] * c['mass_flowrate'] * (t - s['reentry_burn_start_time']),
+                                      0, c['m_prop_reentry'])
+        ascent_fuel_available = ascent_fuel_burned < c['m_first_stage_propellant']
+        landing_fuel_available = landing_fuel_burned < c['m_prop_landing']
+        reentry_fuel_available = reentry_fuel_burned < c['m_prop_reentry']
+        ascending = before_apogee & ascent_fuel_available
+
+        # Gravity turn
+        in_gravity_turn = pos_z >= c['gravity_turn_alt']
+        s['kick_time'] = np.where(in_gravity_turn & (s['kick_time'] == 0), t, s['kick_time'])
+        gamma = np.where(in_gravity_turn & (t <= s['kick_time'] + c['gamma_change_time']), c['kick_angle'], gamma)
+
+        # Thrust and mass for the current phase
+        burns = [ascending, landing & landing_fuel_available, reentering & reentry_fuel_available]
+        total_thrust = np.select(burns, [c['number_of_engines_ascent'] * c['thrust'],
+                                         -c['number_of_engines_landing'] * c['thrust'],
+                                         -c['number_of_engines_reentry'] * c['thrust']], 0)
+        s['mass'] = np.select(burns, [c['m_total'] - ascent_fuel_burned,
+                                      c['m_first_stage_structural'] + c['m_prop_landing'] - landing_fuel_burned,
+                                      c['m_first_stage_structural'] + c['m_prop_landing'] + c['m_prop_reentry'] - reentry_fuel_burned],
+                              s['mass'])
+
+        # Phase indices (only the first matching phase change is recorded per step, as in Trajectory.iterate)
+        unset = np.ones(before_apogee.size, dtype=bool)
+        for name, condition in (('coasting_start_index', ~ascending),
+                                ('reentry_start_index', reentering),
+                                ('coasting2_start_index', reentering & ~reentry_fuel_available),
+                                ('landing_start_index', landing)):
+            hit = unset & condition & (s[name] == 0)
+            s[name] = np.where(hit, self.counter, s[name])
+            unset &= ~hit
+
+        # Equations of motion
+        mass = s['mass']
+        accel_x = np.cos(gamma) * total_thrust / mass - np.cos(gamma) * drag_force / mass
+        accel_z = self.get_g(pos_z) + np.sin(gamma) * total_thrust / mass - np.sin(gamma) * drag_force / mass
+        s['velocity_x'] = velocity_x + accel_x * dt
+        s['velocity_z'] = velocity_z + accel_z * dt
+        s['pos_x'] = s['pos_x'] + s['velocity_x'] * dt
+        s['pos_z'] = pos_z + s['velocity_z'] * dt
+        s['max_pos_z'] = np.maximum(s['max_pos_z'], s['pos_z'])
+
+        s['apogee_index'] = np.where(~before_apogee & (s['apogee_index'] == 0), self.counter, s['apogee_index'])
+
+        # Exit conditions
+        landed = (s['velocity_z'] > -5) & (s['pos_z'] < 2e3) & ~before_apogee
+        below_ground = s['pos_z'] < -1000
+        return ~(landed | below_ground), landed
+
+    def run(self):
+        """
+        This function runs the simulation loop for the whole ensemble until every member has reached an exit condition
+        or the simulation time.
+        """
+
+        self.log(f"Starting ensemble trajectory simulation of {self.size} rockets!")
+
+        t = 0
+        self.counter = 0
+
+        # Working copies of the active members only, compacted whenever members retire
+        members = np.arange(self.size)
+        c = {name: np.asarray(getattr(self, name)) * np.ones(self.size) for name in CONSTANTS}
+        s = {name: getattr(self, name).copy() for name in STATE}
+
+        while t < self.simulation_time and members.size:
+            t += self.simulation_timestep
+            with np.errstate(invalid='ignore', divide='ignore'):
+                active, landed = self.iterate(t, self.simulation_timestep, c, s)
+
+            if not np.all(active):
+                # Store the results of the retiring members and compact the working arrays
+                retired = members[~active]
+                self._store(retired, {name: value[~active] for name, value in s.items()})
+                self.exit_reason[retired] = np.where(landed[~active], "landed", "below_ground")
+                self.end_time[retired] = t
+                self.steps[retired] = self.counter + 1
+                members = members[active]
+                c = {name: value[active] for name, value in c.items()}
+                s = {name: value[active] for name, value in s.items()}
+
+            self.counter += 1
+
+        # Members that reached the simulation time
+        self._store(members, s)
+        self.end_time[members] = t
+        self.steps[members] = self.counter
+
+        self.log("Completed ensemble trajectory simulation!")
+
+    def _store(self, members, state):
+        # Copy the working state of the given members back into the ensemble arrays
+        for name, value in state.items():
+            getattr(self, name)[members] = value
+
+    def results(self):
+        """
+        Returns a dictionary of per member result arrays (final state, apogee altitude, phase indices, exit reason).
+        """
+
+        names = ('pos_x', 'pos_z', 'velocity_x', 'velocity_z', 'mass', 'max_pos_z', 'kick_time', 'reentry_burn_start_time',
+                 'landing_burn_start_time', 'burntime', 'exit_reason', 'end_time', 'steps') + PHASE_INDICES
+        return {name: getattr(self, name) for name in names}
@@ -0,0 +1,105 @@
+import numpy as np
+
+# Columnar storage for the samples recorded by the trajectory simulator. Every column lives in one row of a single
+# preallocated 2D array, so recording a simulation step is a single slice assignment instead of one np.append (and one
+# full array copy) per recorded quantity.
+
+# Quantities recorded by Trajectory.iterate, in storage order.
+COLUMNS = (
+    'times',
+    'pos_xs',
+    'pos_zs',
+    'velocity_xs',
+    'velocity_zs',
+    'accel_xs',
+    'accel_zs',
+    'thrust_xs',
+    'thrust_zs',
+    'rhos',
+    'drags',
+    'gammas',
+    'masses',
+    'speeds',
+)
+
+
+class History():
+    def __init__(self, capacity, columns=COLUMNS, dtype=np.float64):
+        """
+        This function preallocates the storage for a trajectory history.
+
+        Args:
+            capacity: Expected number of samples (usually simulation_time / simulation_timestep). The store grows by
+                doubling if more samples are appended, so this is a hint rather than a hard limit.
+            columns: Names of the recorded quantities, in the order they are passed to append.
+            dtype: Data type of the stored samples.
+        """
+
+        self.columns = tuple(columns)
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.empty((len(self.columns), max(int(np.ceil(capacity)), 1)), dtype=dtype)
+        self.size = 0
+
+    @property
+    def capacity(self):
+        """Number of samples that fit in the store before it has to grow."""
+        return self._data.shape[1]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, name):
+        """
+        Returns a view of a single column, trimmed to the samples recorded so far.
+
+        Args:
+            name: Column name (e.g. 'times' or 'pos_zs').
+
+        Returns:
+            1D numpy array view of the column.
+        """
+
+        return self._data[self._column_index[name], :self.size]
+
+    def append(self, row):
+        """
+        Records a single sample. Amortized constant time regardless of how many samples are already stored.
+
+        Args:
+            row: Sequence with one value per column, in column order.
+        """
+
+        if self.size == self.capacity:
+            self._grow()
+        self._data[:, self.size] = row
+        self.size += 1
+
+    def extend(self, columns):
+        """
+        Records a block of samples at once.
+
+        Args:
+            columns: Sequence with one 1D array per column, in column order, all of the same length.
+        """
+
+        columns = np.asarray(columns, dtype=self._data.dtype)
+        while self.size + columns.shape[1] > self.capacity:
+            self._grow()
+        self._data[:, self.size:self.size + columns.shape[1]] = columns
+        self.size += columns.shape[1]
+
+    def _grow(self):
+        # Double the capacity so that the total copying cost stays linear in the number of samples.
+        data = np.empty((len(self.columns), max(2 * self.capacity, 1)), dtype=self._data.dtype)
+        data[:, :self.size] = self._data[:, :self.size]
+        self._data = data
+
+    def trim(self):
+        """Releases the unused preallocated capacity (call once the simulation has finished)."""
+        if self.size < self.capacity:
+            # At least one column, so that the capacity can grow again
+            self._data = self._data[:, :max(self.size, 1)].copy()
+
+    def as_dict(self):
+        """Returns a dictionary of all columns (views), keyed by column name."""
+        return {name: self[name] for name in self.columns}
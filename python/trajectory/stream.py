@@ -0,0 +1,100 @@
+import numpy as np
+
+from python.trajectory.history import COLUMNS
+
+# Decimators and sinks for streaming trajectory output (see Trajectory.stream and Trajectory.run). A sample is a tuple
+# with one value per history column (see history.COLUMNS). A decimator decides which samples are passed on to the sink,
+# a sink is any callable taking a sample (e.g. list.append, a live plot update or one of the file sinks below).
+
+
+class EveryKth():
+    def __init__(self, k):
+        """
+        Keeps every k-th sample (the first sample is always kept).
+
+        Args:
+            k: Decimation factor (1 keeps every sample).
+        """
+
+        assert k >= 1, "Decimation factor must be at least 1"
+        self.k = int(k)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+
+    def keep(self, sample):
+        keep = self.count % self.k == 0
+        self.count += 1
+        return keep
+
+
+class Curvature():
+    def __init__(self, tolerance=1e-3, columns=('pos_xs', 'pos_zs', 'velocity_xs', 'velocity_zs', 'masses'),
+                 max_gap=None):
+        """
+        Keeps a sample when the selected quantities deviate from the straight line through the last two kept samples,
+        so straight stretches of the trajectory are stored sparsely and burns, kicks and apogee densely.
+
+        Args:
+            tolerance: Allowed relative deviation from the linear extrapolation (relative to the magnitude of the
+                quantity, with a floor of 1 in its unit).
+            columns: History columns checked for deviations.
+            max_gap: Optional maximum number of consecutive samples that may be dropped.
+        """
+
+        self.tolerance = tolerance
+        self.indices = [COLUMNS.index(name) for name in columns]
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self.kept = []
+        self.gap = 0
+
+    def keep(self, sample):
+        t = sample[0]
+        x = np.array([sample[i] for i in self.indices], dtype=float)
+
+        keep = len(self.kept) < 2 or (self.max_gap is not None and self.gap >= self.max_gap)
+        if not keep:
+            (t_0, x_0), (t_1, x_1) = self.kept
+            predicted = x_1 + (x_1 - x_0) * (t - t_1) / (t_1 - t_0)
+            keep = np.any(np.abs(x - predicted) > self.tolerance * np.maximum(np.abs(x), 1))
+
+        if keep:
+            self.kept = (self.kept + [(t, x)])[-2:]
+            self.gap = 0
+        else:
+            self.gap += 1
+        return keep
+
+
+class CSVSink():
+    def __init__(self, path, columns=COLUMNS):
+        """
+        Writes the streamed samples to a CSV file as they arrive. Use as a context manager, or call close().
+
+        Args:
+            path: Path of the CSV file.
+            columns: History columns written to the file, in this order.
+        """
+
+        unknown = [name for name in columns if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown history columns {unknown}, choose from {COLUMNS}")
+        self.indices = [COLUMNS.index(name) for name in columns]
+        self.file = open(path, 'w')
+        self.file.write(",".join(columns) + "\n")
+
+    def __call__(self, sample):
+        self.file.write(",".join(repr(float(sample[i])) for i in self.indices) + "\n")
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
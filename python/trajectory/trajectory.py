@@ -1,5 +1,10 @@
+import copy
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+from python.aerodynamics import atmosphere
+from python.trajectory.history import History
+from python.trajectory.stream import EveryKth
 
 # Main class for the trajectory simulator. This class contains all the functions and variables needed to simulate the
 # ascent, reentry burn, and landing.
@@ -8,35 +13,75 @@ g_0 = 9.81 # [m / s^2]
 R_earth = 6_371e3 # [m]
 mu_earth = 3.986_004_418e14 # [m^3 / s^-2]
 
+# Events at which Trajectory.snapshot can stop, and the setup parameters that can be changed when branching from it
+SNAPSHOT_EVENTS = ("apogee", "altitude")
+DESCENT_PARAMETERS = (
+    "reentry_burn_alt",
+    "delta_V_reentry",
+    "delta_V_landing",
+    "number_of_engines_reentry",
+    "number_of_engines_landing",
+    "Cd_descent",
+)
+
+# Available integration backends: the original fixed-step Euler loop and the adaptive scipy solve_ivp methods.
+INTEGRATORS = ("euler", "RK45", "DOP853", "RK23")
+
+def _branch(snapshot, overrides):
+    # Module level so that it can be sent to worker processes by branch_many
+    return snapshot.branch(**overrides)
+
+
+def _history_column(name):
+    # Read-only attribute giving a view of one recorded column of the trajectory history.
+    return property(lambda self: self.history[name], doc=f"Recorded '{name}' samples (view into the history store).")
+
 class Trajectory():
+    # Simulation data recorded at every step, stored in a preallocated columnar History (see history.py)
+    times = _history_column('times')
+    pos_xs = _history_column('pos_xs')
+    pos_zs = _history_column('pos_zs')
+    velocity_xs = _history_column('velocity_xs')
+    velocity_zs = _history_column('velocity_zs')
+    accel_xs = _history_column('accel_xs')
+    accel_zs = _history_column('accel_zs')
+    thrust_xs = _history_column('thrust_xs')
+    thrust_zs = _history_column('thrust_zs')
+    rhos = _history_column('rhos')
+    drags = _history_column('drags')
+    gammas = _history_column('gammas')
+    masses = _history_column('masses')
+    speeds = _history_column('speeds')
+
     def __init__(self):
-        pass
+        # Hooks for the output of the simulation. log is called like print with the messages (mass breakdown, phase
+        # transitions, warnings). progress, if set, is called with the completed fraction of the simulation (every 10%)
+        # instead of logging a progress line.
+        self.log = print
+        self.progress = None
+
+        # Streaming output (see run and stream): sink receiving the decimated samples, and whether the full resolution
+        # history is kept in memory as well
+        self.sink = None
+        self.decimation = None
+        self.keep_history = True
+
+        # Optional expected duration of the flight (seconds), e.g. from a previous run, so that only the history that
+        # will be needed is preallocated
+        self.expected_time = None
 
-    # Taken from https://www.grc.nasa.gov/www/k-12/airplane/atmosmet.html
     def get_density(self, h):
         """Calculates atmospheric density at a given altitude.
 
+        Uses the tabulated standard atmosphere shared with the aerodynamics model (see aerodynamics/atmosphere.py).
+
         Args:
         h: Altitude in meters.
 
         Returns:
         Atmospheric density in kg/m^3.
         """
-        if h < 11_000:
-            # Troposphere: Use standard temperature and pressure model
-            T = 15.04 - 0.00649 * h  # Temperature in Celsius
-            p = 101.29 * ((T + 273.1) / 288.08) ** 5.256  # Pressure in Pa
-        elif h < 25_000:
-            # Stratosphere: Use constant temperature and exponential pressure model
-            T = -56.46  # Temperature in Celsius
-            p = 22.65 * np.exp(1.73 - 0.000157 * h)  # Pressure in Pa
-        else:
-            # Mesosphere and above: Use different temperature and pressure model
-            T = -131.21 + 0.00299 * h  # Temperature in Celsius
-            p = 2.488 * ((T + 273.1) / 216.6) ** -11.388  # Pressure in Pa
-
-        rho = p / (0.2869 * (T + 273.1))  # Calculate density using ideal gas law
-        return rho
+        return atmosphere.density(h)
 
     def get_drag(self, rho, velocity_x, velocity_z, A, Cd):
         """Calculates the drag force acting on the object.
@@ -268,7 +313,8 @@ class Trajectory():
         diameter: float,
         reentry_burn_alt: float,
         gravity_turn_alt: float,
-        landing_type: str = None):
+        landing_type: str = None,
+        integrator: str = "euler"):
         """
         This function initializes the rocket object with its properties and performs some mass calculations.
 
@@ -295,8 +341,16 @@ class Trajectory():
             reentry_burn_alt: Altitude for reentry burn (meters).
             gravity_turn_alt: Altitude for gravity turn maneuver (meters).
             landing_type: Optional string specifying the rocket type (default: None).
+            integrator: Integration backend used by run(). "euler" for the fixed-step explicit Euler loop, or the name
+                of an adaptive scipy solve_ivp method ("RK45", "DOP853", "RK23") for the event-driven backend.
         """
 
+        # Arguments of this call, used as the key of the on-disk trajectory cache (must stay the first statement)
+        self.setup_args = {name: value for name, value in locals().items() if name != 'self'}
+
+        assert integrator in INTEGRATORS, f"Unknown integrator {integrator}, choose from {INTEGRATORS}"
+        self.integrator = integrator
+
         # Set landing type attribute
         self.landing_type = landing_type
 
@@ -381,6 +435,9 @@ class Trajectory():
         self.kick_time = 0
         self.landing_burn_start_time = 0
         self.reentry_burn_start_time = 0
+        self.burnout_time = None
+        self.apogee_time = None
+        self.reentry_end_time = None
 
         # Initial state vector (position and velocity)
         self.pos_x = 0
@@ -390,21 +447,8 @@ class Trajectory():
         self.accel_x = 0
         self.accel_z = 0
 
-        # Initialize storage arrays for simulation data (all empty initially)
-        self.times = np.array([])
-        self.pos_xs = np.array([])
-        self.pos_zs = np.array([])
-        self.velocity_xs = np.array([])
-        self.velocity_zs = np.array([])
-        self.accel_xs = np.array([])
-        self.accel_zs = np.array([])
-        self.thrust_xs = np.array([])
-        self.thrust_zs = np.array([])
-        self.rhos = np.array([])
-        self.drags = np.array([])
-        self.gammas = np.array([])
-        self.masses = np.array([])
-        self.speeds = np.array([])
+        # Storage for simulation data, allocated by set_output when the simulation starts
+        self.history = History(1)
 
         # Initialize index variables for various phases of flight (for plotting color purposes) (all 0 initially)
         self.ascent_start_index = 0
@@ -422,26 +466,26 @@ class Trajectory():
         # User can decide if trajectory simulation prints value estimates
         if self.print_rocket_info:
             # Print statements for initial mass breakdown
-            print("First stage structural mass:", self.m_first_stage_structural / 1000, "t")
-            print("First stage propellant mass:", self.m_first_stage_propellant / 1000, "t")
-            print("First stage total mass:", self.m_first_stage / 1000, "t")
+            self.log("First stage structural mass:", self.m_first_stage_structural / 1000, "t")
+            self.log("First stage propellant mass:", self.m_first_stage_propellant / 1000, "t")
+            self.log("First stage total mass:", self.m_first_stage / 1000, "t")
 
-            print("Second stage structural mass:", self.m_second_stage_structural / 1000, "t")
-            print("Second stage propellant mass:", self.m_second_stage_propellant / 1000, "t")
-            print("Second stage total mass:", self.m_second_stage / 1000, "t")
+            self.log("Second stage structural mass:", self.m_second_stage_structural / 1000, "t")
+            self.log("Second stage propellant mass:", self.m_second_stage_propellant / 1000, "t")
+            self.log("Second stage total mass:", self.m_second_stage / 1000, "t")
             
-            print("Total rocket mass:", self.m_total / 1000, "t")
+            self.log("Total rocket mass:", self.m_total / 1000, "t")
             
             # Print statements for initial Delta-V, burn time, and propellant
-            print("First Stage Delta V:", self.delta_V_first_stage / 1e3, "km / s")
-            print("Second Stage Delta V:", self.delta_V_second_stage / 1e3, "km / s")
-            print("Total Delta V:", (self.delta_V_first_stage + self.delta_V_second_stage) / 1e3, "km / s")
-            print("Estimated Burntime:", self.burntime, "s")
-            print("Propellant available for ascent:", self.m_first_stage_propellant / 1e3, "t")
-            print("Propellant available for re-entry:", self.m_prop_reentry / 1e3, "t")
-            print("Propellant available for landing:", self.m_prop_landing / 1e3, "t")
-            print("Estimated First Stage TWR:", self.thrust*self.number_of_engines_ascent/(g_0*self.m_total))
-            print("Estimated Second Stage TWR:", self.second_stage_thrust * 1/(g_0*self.m_second_stage))
+            self.log("First Stage Delta V:", self.delta_V_first_stage / 1e3, "km / s")
+            self.log("Second Stage Delta V:", self.delta_V_second_stage / 1e3, "km / s")
+            self.log("Total Delta V:", (self.delta_V_first_stage + self.delta_V_second_stage) / 1e3, "km / s")
+            self.log("Estimated Burntime:", self.burntime, "s")
+            self.log("Propellant available for ascent:", self.m_first_stage_propellant / 1e3, "t")
+            self.log("Propellant available for re-entry:", self.m_prop_reentry / 1e3, "t")
+            self.log("Propellant available for landing:", self.m_prop_landing / 1e3, "t")
+            self.log("Estimated First Stage TWR:", self.thrust*self.number_of_engines_ascent/(g_0*self.m_total))
+            self.log("Estimated Second Stage TWR:", self.second_stage_thrust * 1/(g_0*self.m_second_stage))
 
     def iterate(self, t, dt):
         """
@@ -534,19 +578,21 @@ class Trajectory():
         # Print statements for tracking coasting and burning phases
         if not ascending and self.coasting_start_index == 0:
             if self.print_rocket_info:
-                print("Rocket mass at start of coast phase:", self.mass / 1000, "t")
+                self.log("Rocket mass at start of coast phase:", self.mass / 1000, "t")
             self.coasting_start_index = self.counter
+            self.burnout_time = t
         elif reentering and self.reentry_start_index == 0:
             if self.print_rocket_info:
-                print("Rocket mass at start of reentry phase:", self.mass / 1000, "t")
+                self.log("Rocket mass at start of reentry phase:", self.mass / 1000, "t")
             self.reentry_start_index = self.counter
         elif reentering and not reentry_fuel_available and self.coasting2_start_index == 0:
             if self.print_rocket_info:
-                print("Rocket mass at end of reentry phase:", self.mass / 1000, "t")
+                self.log("Rocket mass at end of reentry phase:", self.mass / 1000, "t")
             self.coasting2_start_index = self.counter
+            self.reentry_end_time = t
         elif landing and self.landing_start_index == 0:
             if self.print_rocket_info:
-                print("Rocket mass at start of landing phase:", self.mass / 1000, "t")
+                self.log("Rocket mass at start of landing phase:", self.mass / 1000, "t")
             self.landing_start_index = self.counter
 
         # Calculate thrust components in x (horizontal) and z (vertical) directions
@@ -574,20 +620,8 @@ class Trajectory():
 
         # Store simulation data in arrays for later analysis
         # Ensure these are appended before any of the potential trajectory simulation exit conditions are called. 
-        self.times = np.append(self.times, t)
-        self.pos_xs = np.append(self.pos_xs, self.pos_x)
-        self.pos_zs = np.append(self.pos_zs, self.pos_z)
-        self.velocity_xs = np.append(self.velocity_xs, self.velocity_x)
-        self.velocity_zs = np.append(self.velocity_zs, self.velocity_z)
-        self.accel_xs = np.append(self.accel_xs, self.accel_x)
-        self.accel_zs = np.append(self.accel_zs, self.accel_z)
-        self.thrust_xs = np.append(self.thrust_xs, self.thrust_x)
-        self.thrust_zs = np.append(self.thrust_zs, self.thrust_z)
-        self.rhos = np.append(self.rhos, rho)
-        self.drags = np.append(self.drags, drag_force)
-        self.gammas = np.append(self.gammas, np.rad2deg(gamma))
-        self.masses = np.append(self.masses, self.mass)
-        self.speeds = np.append(self.speeds, speed)
+        self.record((t, self.pos_x, self.pos_z, self.velocity_x, self.velocity_z, self.accel_x, self.accel_z,
+                     self.thrust_x, self.thrust_z, rho, drag_force, np.rad2deg(gamma), self.mass, speed))
 
         # Check for exceeding a maximum barge distance (removed for fully customizable IDM)
         # Set self.max_barge_distance in trajectory setup if this functionality is desired.
@@ -597,11 +631,12 @@ class Trajectory():
     
          # Identify apogee and print details
         if not before_apogee and self.apogee_index == 0:
-            print("Trajectory reached apogee!")
+            self.log("Trajectory reached apogee!")
             self.apogee_index = self.counter
-            apogee_z = self.pos_zs[self.apogee_index]
-            apogee_velocity_x = self.velocity_xs[self.apogee_index]
-            apogee_velocity_z = self.velocity_zs[self.apogee_index]
+            self.apogee_time = t
+            apogee_z = self.pos_z
+            apogee_velocity_x = self.velocity_x
+            apogee_velocity_z = self.velocity_z
             apogee_speed = self.get_speed(apogee_velocity_x, apogee_velocity_z)
 
             # Optionally add a minimum required second stage delta V condition for the rocket.
@@ -617,13 +652,15 @@ class Trajectory():
                 
         # Check for safe landing conditions based on velocity and altitude
         if self.velocity_z > -5 and self.pos_z < 2e3 and not before_apogee:
-            print("Trajectory landing burn may be unsuccessful due to uncertainties.")
+            self.log("Trajectory landing burn may be unsuccessful due to uncertainties.")
+            self.exit_reason = "landed"
             return False
         
         # Check if rocket goes below ground level
         below_ground = self.pos_z < -1000 # 1000 meters below ground chosen because large simultion time steps may "tunnel" through the ground.
         if below_ground:
-            print("Trajectory may end up below ground due to uncertainties in landing burn altitude.")
+            self.log("Trajectory may end up below ground due to uncertainties in landing burn altitude.")
+            self.exit_reason = "below_ground"
             return False
 
         # Increment counter for simulation steps
@@ -696,6 +733,9 @@ class Trajectory():
         This function generates a grid of subplots and visualizes various aspects of the rocket simulation.
         """
 
+        # Imported here so that simulations (e.g. headless batch runs) never load a plotting backend
+        import matplotlib.pyplot as plt
+
         # Define colors and linestyles for different flight phases (ascent, coasting, etc.)
         self.ascent_color = 'red'
         self.coasting_color = 'blue'
@@ -760,51 +800,568 @@ class Trajectory():
 
         return fig
 
-    def run(self):
+    def run(self, cache=None, sink=None, decimation=None, keep_history=True):
+        """
+        This function runs the trajectory simulation with the integrator selected in setup.
+
+        Args:
+            cache: Optional TrajectoryCache. If an identically set up trajectory was simulated before, its results are
+                loaded from the cache instead of being simulated again; otherwise the new results are stored in it.
+                Only used when the full history is kept and nothing is streamed.
+            sink: Optional callable receiving the samples (tuples in history.COLUMNS order) as they are simulated.
+            decimation: Decimator selecting the samples passed to the sink (see stream.py, default: every sample).
+            keep_history: Whether the full resolution history is kept in memory. Set to False for long fine-timestep
+                runs that are streamed to a sink (the history arrays and plots are then unavailable).
         """
-        This function runs the main simulation loop for the rocket trajectory.
+
+        self.set_output(sink, decimation, keep_history)
+        if sink is not None or not keep_history:
+            cache = None
+
+        if cache is not None and cache.load(self):
+            self.log("Loaded trajectory simulation results from cache.")
+            return
+
+        if self.integrator == "euler":
+            self.run_euler()
+        else:
+            self.run_adaptive()
+            # The adaptive backend builds the history at once from its dense output, stream it afterwards
+            if self.sink is not None:
+                for sample in zip(*(self.history[name] for name in self.history.columns)):
+                    self.record(sample, store=False)
+                self.flush()
+            if not self.keep_history:
+                self.history = History(1)
+
+        if cache is not None:
+            cache.store(self)
+
+    def set_output(self, sink=None, decimation=None, keep_history=True):
+        """
+        This function selects where the simulated samples go (see run).
+        """
+
+        self.sink = sink
+        self.decimation = decimation if decimation is not None else EveryKth(1)
+        self.decimation.reset()
+        self.keep_history = keep_history
+        self.last_sample = None
+        self.last_sample_sent = True
+
+        # Storage for simulation data, preallocated for the expected number of steps (grows if needed)
+        duration = self.simulation_time
+        if self.expected_time is not None:
+            duration = min(duration, 1.1 * self.expected_time)
+        self.history = History(duration / self.simulation_timestep + 1 if keep_history else 1)
+
+    def record(self, sample, store=True):
+        """
+        This function stores a simulated sample in the history and passes it on to the sink if the decimator keeps it.
+
+        Args:
+            sample: Tuple with one value per history column.
+            store: Whether to store the sample in the history (if the history is kept).
+        """
+
+        if store and self.keep_history:
+            self.history.append(sample)
+        if self.sink is not None:
+            self.last_sample = sample
+            self.last_sample_sent = self.decimation.keep(sample)
+            if self.last_sample_sent:
+                self.sink(sample)
+
+    def flush(self):
+        """
+        This function passes the final sample on to the sink if it was decimated away, so the streamed output always
+        reaches the end of the trajectory.
+        """
+
+        if self.sink is not None and not self.last_sample_sent:
+            self.sink(self.last_sample)
+            self.last_sample_sent = True
+
+    def report_progress(self, fraction):
+        """
+        This function reports the completed fraction of the simulation through the progress hook, or logs it.
+        """
+
+        if self.progress is not None:
+            self.progress(fraction)
+        else:
+            self.log("Completed {:.0%} of trajectory simulation".format(fraction))
+
+    def stream(self, decimation=None, keep_history=False):
+        """
+        This function runs the simulation with the Euler integrator as a generator, yielding the (decimated) samples
+        while they are simulated. Nothing but the current state is held in memory unless keep_history is True.
+
+        Args:
+            decimation: Decimator selecting the yielded samples (see stream.py, default: every sample).
+            keep_history: Whether the full resolution history is kept in memory as well.
+
+        Yields:
+            Samples as tuples with one value per history column (see history.COLUMNS).
+        """
+
+        assert self.integrator == "euler", "Streaming while simulating is only supported by the euler integrator"
+
+        buffer = []
+        self.set_output(buffer.append, decimation, keep_history)
+        self.start_euler()
+
+        running = True
+        while running and self.t < self.simulation_time:
+            running = self.step_euler()
+            yield from buffer
+            buffer.clear()
+
+        self.finish_euler()
+        yield from buffer
+
+    def run_euler(self):
+        """
+        This function runs the main simulation loop for the rocket trajectory using the fixed-step Euler integrator.
+        """
+
+        self.start_euler()
+        self.resume()
+
+    def start_euler(self):
+        """
+        This function resets the state of the Euler integrator loop to the start of the simulation.
         """
 
         # Current simulation time (starts at 0)
-        t = 0
+        self.t = 0
 
-        # Flag to track simulation success (defaults to True)
-        success = True
+        # Reason the simulation ended ("landed", "below_ground" or "time_limit"), updated by the exit conditions
+        self.exit_reason = "time_limit"
 
-        # Counter for simulation steps
+        # Counter for simulation steps (counter is not incremented by the step that ends the simulation)
         self.counter = 0
+        self.steps = 0
 
         # Print starting message
-        print("Starting trajectory simulation!")
+        self.log("Starting trajectory simulation!")
+
+        # Counter for completed simulation tenths (for progress updates)
+        self.completed_tenths = 0
+
+    def step_euler(self):
+        """
+        This function advances the Euler integrator loop by a single timestep.
+
+        Returns:
+            False if the simulation reached an exit condition, True otherwise.
+        """
 
         # Calculate total number of simulation frames based on simulation time and timestep
         frames = self.simulation_time / self.simulation_timestep
 
-        # Counter for completed simulation tenths (for progress updates)
-        completed_tenths = 0
+        # Check if progress update is needed (every 10% completion)
+        if int(self.counter / frames * 100) >= 10 * self.completed_tenths:
+            self.completed_tenths += 1
+            # Print progress update (e.g., "Completed 10% of trajectory simulation")
+            self.report_progress(self.completed_tenths / 10)
 
-        # Main simulation loop that iterates until simulation time is reached
-        while t < self.simulation_time:
-            # Check if progress update is needed (every 10% completion)
-            if int(self.counter / frames * 100) >= 10 * completed_tenths:
-                completed_tenths += 1
-                # Print progress update (e.g., "Completed 10% of trajectory simulation")
-                print("Completed {:.0%} of trajectory simulation".format(completed_tenths * 10 / 100))
+        # Update simulation time by the timestep
+        self.t += self.simulation_timestep
+        self.steps += 1
 
-            # Update simulation time by the timestep
-            t += self.simulation_timestep
+        # Perform a single simulation step
+        return self.iterate(self.t, self.simulation_timestep)
 
-            # Perform a single simulation step and update success flag
-            success = self.iterate(t, self.simulation_timestep)
+    def resume(self):
+        """
+        This function runs the Euler integrator loop from the current state until the end of the simulation (used by
+        run_euler, and to finish a trajectory branched from a snapshot).
+        """
+
+        # Main simulation loop that iterates until simulation time is reached
+        while self.t < self.simulation_time:
             # Exit the loop if simulation reaches an exit condition set by the IDM user.
-            if not success:
+            if not self.step_euler():
                 break
 
+        self.finish_euler()
+
+    def finish_euler(self):
+        """
+        This function wraps up the Euler integrator loop once the simulation has ended.
+        """
+
+        # Release the unused preallocated history capacity, and pass the final sample on if it was decimated away
+        self.history.trim()
+        self.flush()
+
+        # Times of the flight events, in the same format as the adaptive backend
+        self.event_times = {
+            'kick': self.kick_time,
+            'burnout': self.burnout_time,
+            'apogee': self.apogee_time,
+            'reentry_start': self.reentry_burn_start_time,
+            'reentry_end': self.reentry_end_time,
+            'landing_start': self.landing_burn_start_time,
+            'end': self.t,
+        }
+
         # Print ending message
-        print("Completed {:.0%} of trajectory simulation".format(1))
-        
+        self.report_progress(1)
+
+    def snapshot(self, event="apogee", altitude=None):
+        """
+        This function simulates the ascent and coast up to a chosen event and returns a copy of the complete simulation
+        state at that point. Descent variants can then be branched from the snapshot without integrating the ascent
+        again. The trajectory itself is left at the event as well and can be finished with resume().
+
+        Args:
+            event: "apogee" to stop just before the first descending step, or "altitude" to stop on the way down at the
+                given altitude.
+            altitude: Altitude on the way down at which to take the snapshot (meters), for event = "altitude". It must
+                lie above the reentry burn altitude of every variant that is branched from the snapshot.
+
+        Returns:
+            Trajectory object holding the state at the event (call branch or branch_many on it).
+        """
+
+        assert self.integrator == "euler", "Snapshots are only supported by the euler integrator"
+        assert event in SNAPSHOT_EVENTS, f"Unknown snapshot event {event}, choose from {SNAPSHOT_EVENTS}"
+        assert event != "altitude" or altitude is not None, "A snapshot altitude is required for event = 'altitude'"
+
+        self.set_output()
+        self.start_euler()
+        while True:
+            # The event is checked between steps, so that the next step is the first one to see the descent
+            if self.velocity_z < 0 and (event == "apogee" or self.pos_z < altitude):
+                break
+            if self.t >= self.simulation_time or not self.step_euler():
+                raise ValueError(f"Trajectory ended before reaching the snapshot event ({event})")
+
+        if self.reentry_start_index != 0 or self.landing_start_index != 0:
+            raise ValueError("Snapshot taken after the reentry or landing burn started, choose a higher altitude")
+
+        return copy.deepcopy(self)
+
+    def branch(self, **overrides):
+        """
+        This function finishes a copy of a snapshot with changed descent parameters. The snapshot itself is unchanged,
+        so it can be branched any number of times.
+
+        The ascent is held fixed: changing delta_V_reentry or delta_V_landing changes the propellant loaded for the
+        reentry and landing burns (and so the descent mass), but not the ascent that was simulated with the original
+        propellant split.
+
+        Args:
+            overrides: New values for any of the descent parameters of setup (see DESCENT_PARAMETERS).
+
+        Returns:
+            Completed Trajectory object of the variant.
+        """
+
+        unknown = set(overrides) - set(DESCENT_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Cannot branch on {sorted(unknown)}, only on the descent parameters {DESCENT_PARAMETERS}")
+
+        variant = copy.deepcopy(self)
+        variant.setup_args = {**self.setup_args, **overrides, 'branch_time': self.t}
+
+        for name in ('reentry_burn_alt', 'number_of_engines_reentry', 'number_of_engines_landing', 'Cd_descent'):
+            if name in overrides:
+                setattr(variant, name, overrides[name])
+
+        # Propellant for landing and reentry burns, as in setup
+        if 'delta_V_landing' in overrides or 'delta_V_reentry' in overrides:
+            variant.m_prop_landing = variant.get_propellant(variant.I_sp_1, variant.setup_args['delta_V_landing'], 0)
+            variant.m_prop_reentry = variant.get_propellant(variant.I_sp_1, variant.setup_args['delta_V_reentry'],
+                                                            variant.m_prop_landing)
+
+        if variant.pos_z < variant.reentry_burn_alt:
+            raise ValueError(f"Reentry burn altitude {variant.reentry_burn_alt} m is above the snapshot altitude "
+                             f"{variant.pos_z:.0f} m, take the snapshot earlier")
+
+        variant.resume()
+        return variant
+
+    def branch_many(self, overrides, workers=None):
+        """
+        This function branches several descent variants from a snapshot, in parallel processes.
+
+        Args:
+            overrides: List of dictionaries of descent parameter overrides, one per variant (see branch).
+            workers: Number of worker processes (default: number of CPUs). 1 runs the variants in this process.
+
+        Returns:
+            List of completed Trajectory objects, in the order of overrides.
+        """
+
+        if workers == 1:
+            return [self.branch(**variant) for variant in overrides]
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_branch, [self] * len(overrides), overrides))
+
+    def get_accelerations(self, pos_z, velocity_x, velocity_z, mass, rho, thrust, Cd, kick):
+        """
+        Calculates the flight path angle, forces and accelerations acting on the rocket. Works on scalars as well as on
+        numpy arrays of states (used to reconstruct the history of the adaptive backend).
+
+        Args:
+            pos_z: Altitude (m).
+            velocity_x: Velocity in the x-direction (m/s).
+            velocity_z: Velocity in the z-direction (m/s).
+            mass: Rocket mass (kg).
+            rho: Atmospheric density (kg/m^3).
+            thrust: Total thrust along the flight path (N), negative for burns against the velocity vector.
+            Cd: Drag coefficient (unitless).
+            kick: True while the gravity turn kick angle is imposed on the flight path.
+
+        Returns:
+            Flight path angle (radians), drag force (N), thrust accelerations in x and z and total accelerations in
+            x and z (m/s^2).
+        """
+
+        drag_force = self.get_drag(rho, velocity_x, velocity_z, self.area, Cd)
+        gamma = np.where(kick, self.kick_angle, self.get_gamma(velocity_z, velocity_x))
+        thrust_x = np.cos(gamma) * thrust / mass
+        thrust_z = np.sin(gamma) * thrust / mass
+        accel_x = thrust_x - np.cos(gamma) * drag_force / mass
+        accel_z = self.get_g(pos_z) + thrust_z - np.sin(gamma) * drag_force / mass
+        return gamma, drag_force, thrust_x, thrust_z, accel_x, accel_z
+
+    def get_landing_thrust(self, pos_z, velocity_x, velocity_z, mass, rho, max_thrust, Cd):
+        """
+        Calculates the landing burn thrust of non-Falcon 9 rockets for the adaptive backend. The Euler landing flag
+        (see iterate) fires the engines at most every other step, and only while they are needed to stop the rocket
+        before it hits the ground, so the descent follows a constant deceleration to touchdown. The thrust is the one
+        that gives the vertical deceleration velocity_z^2 / (2 pos_z), at most half the thrust of the landing engines.
+        Works on scalars as well as on numpy arrays of states.
+
+        Args:
+            pos_z: Altitude (m).
+            velocity_x: Velocity in the x-direction (m/s).
+            velocity_z: Velocity in the z-direction (m/s).
+            mass: Rocket mass (kg).
+            rho: Atmospheric density (kg/m^3).
+            max_thrust: Thrust of the landing engines along the flight path (N), negative.
+            Cd: Drag coefficient (unitless).
+
+        Returns:
+            Thrust along the flight path (N), between max_thrust / 2 and 0.
+        """
+
+        drag_force = self.get_drag(rho, velocity_x, velocity_z, self.area, Cd)
+        sin_gamma = np.minimum(np.sin(self.get_gamma(velocity_z, velocity_x)), -1e-6)
+        deceleration = velocity_z ** 2 / (2 * np.maximum(pos_z, 1))
+        thrust = (deceleration - self.get_g(pos_z)) * mass / sin_gamma + drag_force
+        return np.clip(thrust, max_thrust / 2, 0)
+
+    def run_adaptive(self):
+        """
+        This function simulates the trajectory with an adaptive-step scipy solve_ivp integrator.
+
+        The flight is split into segments at every discontinuity of the equations of motion (gravity turn kick, burnout,
+        apogee, start and end of the re-entry and landing burns). Event functions locate each boundary exactly, so the
+        integrator can take large steps in between. The dense solution is sampled on the simulation timestep afterwards,
+        so the history arrays and phase indices line up with those of the Euler backend.
+
+        Differences to the Euler backend: the state is sampled at the time it is recorded for (Euler records the state
+        after the step), and the on/off landing burn of non-Falcon 9 rockets is replaced by its average thrust (see
+        get_landing_thrust).
+        """
+
+        from scipy.integrate import solve_ivp
+
+        self.log("Starting trajectory simulation!")
+
+        # Reason the simulation ended ("landed", "below_ground" or "time_limit"), updated by the exit events
+        self.exit_reason = "time_limit"
+
+        # State vector: horizontal and vertical position, horizontal and vertical velocity, mass
+        y = np.array([self.pos_x, self.pos_z, self.velocity_x, self.velocity_z, self.mass], dtype=float)
+        t = 0.0
+
+        # Times at which flight events happened, and scheduled times of the burns ending
+        events = {}
+        scheduled = {'burnout': self.burntime}
+
+        # Integrated segments: (start time, end time, dense solution, thrust, Cd, kick, controlled landing thrust)
+        segments = []
+        self.steps = 0
+
+        if y[1] >= self.gravity_turn_alt:
+            events['kick'] = t
+            scheduled['kick_end'] = t + self.gamma_change_time
+
+        # Landing burn deceleration, used by the landing start event (see iterate)
+        land_accel = self.number_of_engines_landing * self.thrust / (self.m_first_stage_structural + self.m_prop_landing)
+
+        def landing_start(t, y):
+            if self.landing_type == "Falcon 9":
+                return self.landing_burn_alt - y[1]
+            # Burn starts once the engines need longer to stop the rocket than it takes to hit the ground
+            impact_time = (np.sqrt(max(2 * g_0 * y[1] + y[3] ** 2, 0)) + y[3]) / g_0
+            deccel_time = -y[3] / (land_accel - g_0)
+            return min(deccel_time - impact_time, 10e3 - y[1])
+
+        # State events, as (name, function, direction of the zero crossing)
+        state_events = {
+            'kick': (lambda t, y: y[1] - self.gravity_turn_alt, 1),
+            'apogee': (lambda t, y: y[3], -1),
+            'reentry_start': (lambda t, y: y[1] - self.reentry_burn_alt, -1),
+            'landing_start': (landing_start, 1),
+            'landed': (lambda t, y: min(y[3] + 5, 2e3 - y[1]), 1),
+            'below_ground': (lambda t, y: y[1] + 1000, -1),
+        }
+
+        while t < self.simulation_time:
+            # Configure the flight phase of this segment
+            ascending = 'burnout' not in events and 'apogee' not in events
+            landing = 'landing_start' in events and 'landing_end' not in events
+            reentering = 'reentry_start' in events and 'reentry_end' not in events and 'landing_start' not in events
+            kick = 'kick' in events and 'kick_end' not in events
+            Cd = self.Cd_ascent if 'apogee' not in events else self.Cd_descent
+
+            if ascending:
+                engines, direction = self.number_of_engines_ascent, 1
+            elif landing:
+                engines, direction = self.number_of_engines_landing, -1
+            elif reentering:
+                engines, direction = self.number_of_engines_reentry, -1
+            else:
+                engines, direction = 0, 1
+            thrust = direction * engines * self.thrust
+            burn_rate = engines * self.mass_flowrate
+
+            # Non-Falcon 9 landing burn: thrust limited to what is needed to stop at the ground (see
+            # get_landing_thrust), the propellant is drawn at the full rate as in iterate
+            controlled = landing and self.landing_type != "Falcon 9"
+
+            def derivatives(t, y):
+                rho = self.get_density(y[1])
+                force = self.get_landing_thrust(y[1], y[2], y[3], y[4], rho, thrust, Cd) if controlled else thrust
+                _, _, _, _, accel_x, accel_z = self.get_accelerations(y[1], y[2], y[3], y[4], rho, force, Cd, kick)
+                return [y[2], y[3], accel_x, accel_z, -burn_rate]
+
+            # Active events: state events that can still happen in this phase, and the next scheduled time
+            active = ['kick', 'apogee', 'below_ground']
+            if 'apogee' in events:
+                active += ['landed']
+                if 'landing_start' not in events:
+                    active += ['landing_start']
+                    if 'reentry_start' not in events:
+                        active += ['reentry_start']
+            active = [name for name in active if name not in events]
+            functions = []
+            for name in active:
+                function, crossing = state_events[name]
+                function.terminal = True
+                function.direction = crossing
+                functions.append(function)
+            pending = {name: time for name, time in scheduled.items() if name not in events}
+            t_stop = min([self.simulation_time] + [time for time in pending.values() if time > t])
+
+            solution = solve_ivp(derivatives, (t, t_stop), y, method=self.integrator, events=functions,
+                                 dense_output=True, rtol=1e-8, atol=1e-6, max_step=10)
+            self.steps += solution.t.size - 1
+            segments.append((t, solution.t[-1], solution.sol, thrust, Cd, kick, controlled))
+            t = float(solution.t[-1])
+            y = solution.y[:, -1].copy()
+
+            # Handle the event that ended this segment
+            if solution.status == 1:
+                fired = min((times[0], name) for name, times in zip(active, solution.t_events) if times.size)[1]
+                events[fired] = t
+            else:
+                fired = None
+                for name, time in pending.items():
+                    if time <= t:
+                        events[name] = time
+
+            if fired == 'kick':
+                scheduled['kick_end'] = t + self.gamma_change_time
+            elif fired == 'apogee':
+                self.log("Trajectory reached apogee!")
+            elif fired == 'reentry_start':
+                y[4] = self.m_first_stage_structural + self.m_prop_landing + self.m_prop_reentry
+                scheduled['reentry_end'] = t + self.m_prop_reentry / (self.number_of_engines_reentry * self.mass_flowrate)
+            elif fired == 'landing_start':
+                y[4] = self.m_first_stage_structural + self.m_prop_landing
+                scheduled['landing_end'] = t + self.m_prop_landing / (self.number_of_engines_landing * self.mass_flowrate)
+            elif fired == 'landed':
+                self.log("Trajectory landing burn may be unsuccessful due to uncertainties.")
+                self.exit_reason = "landed"
+                break
+            elif fired == 'below_ground':
+                self.log("Trajectory may end up below ground due to uncertainties in landing burn altitude.")
+                self.exit_reason = "below_ground"
+                break
+
+            if self.print_rocket_info:
+                if fired is None and 'burnout' in events and events['burnout'] == t:
+                    self.log("Rocket mass at start of coast phase:", y[4] / 1000, "t")
+                elif fired == 'reentry_start':
+                    self.log("Rocket mass at start of reentry phase:", y[4] / 1000, "t")
+                elif fired is None and events.get('reentry_end') == t:
+                    self.log("Rocket mass at end of reentry phase:", y[4] / 1000, "t")
+                elif fired == 'landing_start':
+                    self.log("Rocket mass at start of landing phase:", y[4] / 1000, "t")
+
+        events['end'] = t
+        self.event_times = events
+
+        # Final state
+        self.pos_x, self.pos_z, self.velocity_x, self.velocity_z, self.mass = y
+        self.kick_time = events.get('kick', 0)
+        self.reentry_burn_start_time = events.get('reentry_start', 0)
+        self.landing_burn_start_time = events.get('landing_start', 0)
+        self.burnout_time = events.get('burnout')
+        self.apogee_time = events.get('apogee')
+        self.reentry_end_time = events.get('reentry_end')
+
+        # Sample the dense solution on the simulation timestep (plus the final time) to fill the history
+        dt = self.simulation_timestep
+        times = dt * np.arange(1, int(t / dt) + 1)
+        if times.size == 0 or times[-1] < t:
+            times = np.append(times, t)
+        segment_ends = np.array([segment[1] for segment in segments])
+        segment_index = np.minimum(np.searchsorted(segment_ends, times), len(segments) - 1)
+
+        self.history = History(times.size)
+        for i, (_, _, dense, thrust, Cd, kick, controlled) in enumerate(segments):
+            ts = times[segment_index == i]
+            if ts.size == 0:
+                continue
+            pos_x, pos_z, velocity_x, velocity_z, mass = dense(ts)
+            rho = atmosphere.density_array(pos_z)
+            if controlled:
+                thrust = self.get_landing_thrust(pos_z, velocity_x, velocity_z, mass, rho, thrust, Cd)
+            gamma, drag_force, thrust_x, thrust_z, accel_x, accel_z = self.get_accelerations(
+                pos_z, velocity_x, velocity_z, mass, rho, thrust, Cd, kick)
+            speed = self.get_speed(velocity_x, velocity_z)
+            self.history.extend(np.broadcast_arrays(ts, pos_x, pos_z, velocity_x, velocity_z, accel_x, accel_z,
+                                                    thrust_x, thrust_z, rho, drag_force, np.rad2deg(gamma), mass, speed))
+
+        # Phase indices: first recorded sample at or after the corresponding event
+        def index(*names):
+            event_times = [events[name] for name in names if name in events]
+            return int(np.searchsorted(times, min(event_times))) if event_times else 0
+
+        self.coasting_start_index = index('burnout', 'apogee')
+        self.apogee_index = index('apogee')
+        self.reentry_start_index = index('reentry_start')
+        self.coasting2_start_index = index('reentry_end')
+        self.landing_start_index = index('landing_start')
+        self.counter = len(self.history)
+
+        self.report_progress(1)
+        self.log(f"Adaptive integrator ({self.integrator}) took {self.steps} steps.")
+
 # This block of code only executes if the script is run directly (not imported as a module)
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
     # Select the trajectory to simulate (either "Elysium" or "Falcon 9")
     trajectory = "Elysium"  # Choose between "Elysium" or "Falcon 9"
@@ -1,7 +1,5 @@
 import copy
 import tkinter as tk
-from matplotlib import pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from tkinter import ttk
 
 from python.core.rocket import get_elysium_1_preset, get_falcon_9_preset
@@ -233,6 +231,9 @@ class UI():
         results_root.mainloop()
 
     def create_trajectory_plot(self):
+        # matplotlib is only loaded once plots are requested, which keeps the start of the IDM fast
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
         fig = self.rocket.trajectory.setup_plot()
         # Create a new Tkinter root window
         new_root = tk.Tk()